@@ -0,0 +1,371 @@
+"""
+Asset proxy - In-process HTTP caching proxy shared by every browser of the session
+"""
+import hashlib
+import json
+import os
+import re
+import select
+import socket
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Disk directory for cached assets, kept across runs and shared by parallel workers; unset keeps them in memory
+CACHE_DIR = os.environ.get("ASSET_PROXY_DIR")
+MAX_MEMORY_MB = float(os.environ.get("ASSET_PROXY_MAX_MB", "256"))
+UPSTREAM_TIMEOUT = float(os.environ.get("ASSET_PROXY_TIMEOUT", "30"))
+
+# Only static files are cached; pages, redirects and API answers always reach the application
+STATIC_EXTENSIONS = (
+    ".css", ".js", ".mjs", ".map", ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".ico",
+)
+# Rails digests (app-<64 hex>.css) and Vite hashes (index-Bx3k9Q_a.js) change whenever the content does
+FINGERPRINT = re.compile(r"-(?:[0-9a-f]{32,64}|[A-Za-z0-9_-]{8})\.[a-z0-9]+$")
+# How long a fingerprinted asset without its own max-age is served without asking the server
+FINGERPRINT_MAX_AGE = 365 * 24 * 3600
+
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailers", "transfer-encoding", "upgrade",
+}
+
+
+def cache_directives(headers):
+    """``Cache-Control`` as ``{directive: value or True}``"""
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else True
+    return directives
+
+
+def is_static(url):
+    return urlsplit(url).path.lower().endswith(STATIC_EXTENSIONS)
+
+
+def freshness(url, headers):
+    """Seconds a response may be served from the cache without revalidation; None if it may not be stored"""
+    directives = cache_directives(headers)
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                return max(0, int(directives[name]))
+            except ValueError:
+                break
+    if "immutable" in directives or FINGERPRINT.search(urlsplit(url).path):
+        return FINGERPRINT_MAX_AGE
+    return 0
+
+
+class CachedAsset:
+    """One stored response: status, end-to-end headers and body, fresh until ``expires``"""
+
+    def __init__(self, url, status, headers, body, expires):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires
+
+    def validators(self):
+        """Conditional request headers that let the server answer 304"""
+        result = {}
+        for header, conditional in (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since")):
+            value = self.headers.get(header)
+            if value:
+                result[conditional] = value
+        return result
+
+
+class AssetStore:
+    """Cached assets by URL: in memory (least recently used dropped past ``max_bytes``), or on disk at ``directory``"""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_MEMORY_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+
+    def get(self, url):
+        if self.directory:
+            try:
+                with open(self._path(url) + ".json") as f:
+                    meta = json.load(f)
+                with open(self._path(url) + ".body", "rb") as f:
+                    return CachedAsset(url, meta["status"], meta["headers"], f.read(), meta["expires"])
+            except (OSError, ValueError, KeyError):
+                return None
+        with self._lock:
+            asset = self._memory.get(url)
+            if asset is not None:
+                self._memory.move_to_end(url)
+            return asset
+
+    def put(self, asset):
+        if self.directory:
+            # Written under temporary names and renamed, so parallel workers never read half an asset
+            path = self._path(asset.url)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(path + ".body" + suffix, "wb") as f:
+                f.write(asset.body)
+            with open(path + ".json" + suffix, "w") as f:
+                json.dump({"status": asset.status, "headers": asset.headers, "expires": asset.expires}, f)
+            os.replace(path + ".body" + suffix, path + ".body")
+            os.replace(path + ".json" + suffix, path + ".json")
+            return
+        with self._lock:
+            old = self._memory.pop(asset.url, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._memory[asset.url] = asset
+            self._bytes += len(asset.body)
+            while self._bytes > self.max_bytes and len(self._memory) > 1:
+                _, dropped = self._memory.popitem(last=False)
+                self._bytes -= len(dropped.body)
+
+
+class ProxyStats:
+    """Static asset requests answered from the cache versus fetched from the application"""
+
+    def __init__(self):
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.passed_through = 0
+        self.tunnels = 0
+        self.bytes_saved = 0
+        self.bytes_fetched = 0
+        self._lock = threading.Lock()
+
+    def add(self, field, count=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + count)
+
+    @property
+    def cacheable(self):
+        return self.hits + self.revalidated + self.misses
+
+    @property
+    def hit_ratio(self):
+        """Share of static asset requests whose body came from the cache, revalidated ones included"""
+        return (self.hits + self.revalidated) / self.cacheable if self.cacheable else 0.0
+
+    def merge(self, path):
+        """Add the counts another process wrote to ``path``; the hit ratio follows from the sums"""
+        with open(path) as f:
+            counts = json.load(f)
+        for field in ("hits", "revalidated", "misses", "passed_through", "tunnels", "bytes_saved", "bytes_fetched"):
+            self.add(field, counts.get(field, 0))
+
+    def as_dict(self):
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "passed_through": self.passed_through,
+            "tunnels": self.tunnels,
+            "hit_ratio": self.hit_ratio,
+            "bytes_saved": self.bytes_saved,
+            "bytes_fetched": self.bytes_fetched,
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Forward proxy: GETs for static files go through the cache, everything else straight upstream"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # The proxy's statistics are the log
+
+    def do_GET(self):
+        if is_static(self.path):
+            self._cached_get()
+        else:
+            self._forward()
+
+    def do_HEAD(self):
+        self._forward()
+
+    def do_POST(self):
+        self._forward()
+
+    do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_POST
+
+    def do_CONNECT(self):
+        """Tunnel TLS untouched; HTTPS third-party assets are not cached"""
+        host, _, port = self.path.rpartition(":")
+        try:
+            upstream = socket.create_connection((host, int(port)), timeout=UPSTREAM_TIMEOUT)
+        except OSError:
+            self.send_error(502)
+            return
+        self.server.stats.add("tunnels")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, broken = select.select(sockets, [], sockets, UPSTREAM_TIMEOUT)
+                if broken or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def _request_headers(self):
+        return {name: value for name, value in self.headers.items() if name.lower() not in HOP_BY_HOP}
+
+    def _upstream(self, method, headers, body=None):
+        return self.server.session.request(
+            method, self.path, headers=headers, data=body, stream=True,
+            allow_redirects=False, timeout=UPSTREAM_TIMEOUT,
+        )
+
+    def _forward(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        try:
+            response = self._upstream(self.command, self._request_headers(), body)
+        except requests.RequestException:
+            self.send_error(502)
+            return
+        self.server.stats.add("passed_through")
+        content = b"" if self.command == "HEAD" else response.raw.read(decode_content=False)
+        self._reply(response.status_code, response.headers, content, head=self.command == "HEAD")
+
+    def _cached_get(self):
+        store, stats = self.server.store, self.server.stats
+        asset = store.get(self.path)
+        if asset is not None and asset.fresh:
+            stats.add("hits")
+            stats.add("bytes_saved", len(asset.body))
+            self._reply_asset(asset)
+            return
+
+        headers = self._request_headers()
+        if asset is not None:
+            headers.update(asset.validators())
+        try:
+            response = self._upstream("GET", headers)
+        except requests.RequestException:
+            self.send_error(502)
+            return
+
+        if asset is not None and response.status_code == 304:
+            response.close()
+            lifetime = freshness(self.path, response.headers)
+            if lifetime:
+                asset.expires = time.time() + lifetime
+                store.put(asset)
+            stats.add("revalidated")
+            stats.add("bytes_saved", len(asset.body))
+            self._reply_asset(asset)
+            return
+
+        content = response.raw.read(decode_content=False)
+        stats.add("misses")
+        stats.add("bytes_fetched", len(content))
+        lifetime = freshness(self.path, response.headers)
+        has_validator = "ETag" in response.headers or "Last-Modified" in response.headers
+        if response.status_code == 200 and lifetime is not None and (lifetime or has_validator):
+            kept = {name: value for name, value in response.headers.items() if name.lower() not in HOP_BY_HOP}
+            store.put(CachedAsset(self.path, 200, kept, content, time.time() + lifetime))
+        self._reply(response.status_code, response.headers, content)
+
+    def _reply_asset(self, asset):
+        # A browser holding the same version only needs the 304
+        etag = asset.headers.get("ETag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self._reply(304, asset.headers, b"")
+        else:
+            self._reply(asset.status, asset.headers, asset.body)
+
+    def _reply(self, status, headers, content, head=False):
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() not in HOP_BY_HOP and name.lower() != "content-length":
+                self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(content) if not head else headers.get("Content-Length", 0)))
+        self.end_headers()
+        if content and not head and status != 304:
+            self.wfile.write(content)
+
+
+class AssetProxy:
+    """Local HTTP proxy the browsers route through so every static asset is downloaded once per run.
+
+    Responses for static files (``STATIC_EXTENSIONS``) are kept when
+    ``Cache-Control`` allows storing them: fresh ones (``max-age``,
+    ``immutable`` or a fingerprinted file name) are answered without
+    contacting the application, stale ones are revalidated with their
+    ``ETag``/``Last-Modified`` and reused on a 304. Pages and every other
+    request pass straight through, HTTPS is tunnelled untouched.
+    ``stats`` counts hits and the bytes the cache saved.
+    """
+
+    def __init__(self, store=None, stats=None, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.store = store or AssetStore()
+        self.server.stats = stats if stats is not None else ProxyStats()
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+        # Forward the browser's own headers only, and never through an environment proxy
+        session.headers.clear()
+        session.trust_env = False
+        self.server.session = session
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def stats(self):
+        return self.server.stats
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="asset-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.session.close()
@@ -0,0 +1,150 @@
+"""
+Authentication cache - Sign each user in once and reuse the session cookies
+"""
+import threading
+from html.parser import HTMLParser
+
+import requests
+
+SIGN_IN_PATH = "/es/users/sign_in"
+
+# Devise is configured with authentication_keys = [:login] (email or document)
+LOGIN_FIELD = "user[login]"
+PASSWORD_FIELD = "user[password]"
+
+
+class AuthenticationError(Exception):
+    """Raised when the sign-in form does not accept the credentials"""
+
+
+class _CsrfTokenParser(HTMLParser):
+    """Pick the Rails CSRF token from a meta tag or a hidden form field"""
+
+    def __init__(self):
+        super().__init__()
+        self.token = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.token:
+            return
+        attrs = dict(attrs)
+        if tag == "meta" and attrs.get("name") == "csrf-token":
+            self.token = attrs.get("content")
+        elif tag == "input" and attrs.get("name") == "authenticity_token":
+            self.token = attrs.get("value")
+
+
+def extract_csrf_token(html):
+    """Return the authenticity token embedded in a Rails page, or None"""
+    parser = _CsrfTokenParser()
+    parser.feed(html)
+    return parser.token
+
+
+def is_sign_in_url(url):
+    """Whether a URL points at the Devise sign-in page"""
+    return "/users/sign_in" in (url or "")
+
+
+class AuthCache:
+    """Signed-in HTTP sessions shared by every test of a run.
+
+    Each user goes through the Devise sign-in form once over plain HTTP.
+    The resulting cookie jar is injected into browsers and
+    ``requests.Session`` objects on demand, and the user is signed in again
+    only when a request ends up redirected to ``/users/sign_in``.
+    """
+
+    def __init__(self, base_url, timeout=10):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.sign_ins = 0
+
+        self._sessions = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def session(self, user):
+        """Return the cached signed-in ``requests.Session`` for a user"""
+        with self._user_lock(user):
+            session = self._sessions.get(user["email"])
+            if session is None:
+                session = self._sign_in(user)
+                self._sessions[user["email"]] = session
+            return session
+
+    def invalidate(self, user):
+        """Forget a user's session so the next use signs in again"""
+        with self._user_lock(user):
+            session = self._sessions.pop(user["email"], None)
+        if session is not None:
+            session.close()
+
+    def cookies(self, user):
+        """Return the session cookies of a signed-in user"""
+        return list(self.session(user).cookies)
+
+    def apply(self, http_session, user):
+        """Copy a user's session cookies into another ``requests.Session``"""
+        for cookie in self.cookies(user):
+            http_session.cookies.set_cookie(cookie)
+        return http_session
+
+    def login(self, driver, user):
+        """Inject a user's session cookies into a browser without navigating"""
+        for cookie in self.cookies(user):
+            params = {
+                "name": cookie.name,
+                "value": cookie.value,
+                "url": self.base_url,
+                "path": cookie.path or "/",
+                "secure": bool(cookie.secure),
+                "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+            }
+            if cookie.expires:
+                params["expires"] = cookie.expires
+            driver.execute_cdp_cmd("Network.setCookie", params)
+        return True
+
+    def get(self, driver, url, user):
+        """Open a page in the browser as a user, signing in again if the session expired"""
+        self.login(driver, user)
+        driver.get(url)
+
+        if is_sign_in_url(driver.current_url) and not is_sign_in_url(url):
+            self.invalidate(user)
+            self.login(driver, user)
+            driver.get(url)
+
+    def request(self, user, method, url, **kwargs):
+        """Send an HTTP request as a user, signing in again if the session expired"""
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session(user).request(method, url, **kwargs)
+
+        if is_sign_in_url(response.url) and not is_sign_in_url(url):
+            self.invalidate(user)
+            response = self.session(user).request(method, url, **kwargs)
+        return response
+
+    def _sign_in(self, user):
+        session = requests.Session()
+        sign_in_url = f"{self.base_url}{SIGN_IN_PATH}"
+
+        page = session.get(sign_in_url, timeout=self.timeout)
+        response = session.post(sign_in_url, data={
+            "authenticity_token": extract_csrf_token(page.text) or "",
+            LOGIN_FIELD: user["email"],
+            PASSWORD_FIELD: user["password"],
+        }, timeout=self.timeout)
+        self.sign_ins += 1
+
+        if response.status_code >= 400 or is_sign_in_url(response.url):
+            session.close()
+            raise AuthenticationError(
+                f"Sign-in failed for {user['email']} (status {response.status_code})"
+            )
+        return session
+
+    def _user_lock(self, user):
+        with self._lock:
+            return self._locks.setdefault(user["email"], threading.Lock())
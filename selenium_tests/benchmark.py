@@ -0,0 +1,151 @@
+"""
+Benchmark runner - Repeated latency samples with warmup, percentiles and confidence intervals
+"""
+import json
+import math
+import os
+import random
+import statistics
+
+WARMUP = int(os.environ.get("BENCH_WARMUP", "1"))
+SAMPLES = int(os.environ.get("BENCH_SAMPLES", "5"))
+CONFIDENCE = float(os.environ.get("BENCH_CONFIDENCE", "0.95"))
+BOOTSTRAP_RESAMPLES = int(os.environ.get("BENCH_BOOTSTRAP_RESAMPLES", "1000"))
+
+# Tukey fences: samples further than this many IQRs outside the quartiles are outliers
+OUTLIER_IQR_FACTOR = 1.5
+
+
+def percentile(values, p):
+    """``p``-th percentile (0-100) with linear interpolation between ranks"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def reject_outliers(values, factor=OUTLIER_IQR_FACTOR):
+    """Split samples into ``(kept, outliers)`` using Tukey's fences"""
+    if len(values) < 4:
+        return list(values), []
+    q1, q3 = percentile(values, 25), percentile(values, 75)
+    spread = (q3 - q1) * factor
+    kept = [v for v in values if q1 - spread <= v <= q3 + spread]
+    outliers = [v for v in values if v < q1 - spread or v > q3 + spread]
+    return kept, outliers
+
+
+def bootstrap_ci(values, statistic=statistics.median, confidence=CONFIDENCE,
+                 resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    """Percentile bootstrap confidence interval of ``statistic`` over ``values``"""
+    if not values:
+        return None, None
+    if len(values) == 1:
+        return values[0], values[0]
+    rng = random.Random(seed)
+    estimates = sorted(
+        statistic(rng.choices(values, k=len(values))) for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+class BenchmarkResult:
+    """Summary statistics of one benchmarked page or endpoint, in seconds"""
+
+    def __init__(self, label, name, samples, confidence=CONFIDENCE, resamples=BOOTSTRAP_RESAMPLES):
+        self.label = label
+        self.name = name
+        self.samples = list(samples)
+        self.kept, self.outliers = reject_outliers(self.samples)
+        self.confidence = confidence
+
+        self.p50 = percentile(self.kept, 50)
+        self.p90 = percentile(self.kept, 90)
+        self.p99 = percentile(self.kept, 99)
+        self.mean = statistics.fmean(self.kept) if self.kept else None
+        self.stdev = statistics.stdev(self.kept) if len(self.kept) > 1 else 0.0
+        self.ci_low, self.ci_high = bootstrap_ci(self.kept, confidence=confidence, resamples=resamples)
+
+    def exceeds(self, budget):
+        """Whether the median is over ``budget`` with the configured confidence"""
+        return self.ci_low is not None and self.ci_low > budget
+
+    def inconclusive(self, budget):
+        """Whether the interval straddles ``budget``: too noisy to pass or fail"""
+        return self.ci_low is not None and self.ci_low <= budget < self.ci_high
+
+    def summary(self):
+        """Short human-readable line for issue descriptions"""
+        return (
+            f"p50 {self.p50:.2f}s, p90 {self.p90:.2f}s, p99 {self.p99:.2f}s, "
+            f"stdev {self.stdev:.2f}s, {self.confidence:.0%} CI of p50 "
+            f"[{self.ci_low:.2f}s, {self.ci_high:.2f}s], "
+            f"{len(self.kept)} samples, {len(self.outliers)} outliers rejected"
+        )
+
+    def as_dict(self):
+        return {
+            "test": self.label,
+            "name": self.name,
+            "samples": self.samples,
+            "outliers": self.outliers,
+            "p50": self.p50,
+            "p90": self.p90,
+            "p99": self.p99,
+            "mean": self.mean,
+            "stdev": self.stdev,
+            "ci_low": self.ci_low,
+            "ci_high": self.ci_high,
+            "confidence": self.confidence,
+        }
+
+
+class BenchmarkResults:
+    """Every benchmark run in the session"""
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, result):
+        self.results.append(result)
+
+    def merge(self, path):
+        """Fold in the results another process wrote to ``path``; the seeded bootstrap gives back the same statistics"""
+        with open(path) as f:
+            for entry in json.load(f):
+                self.add(BenchmarkResult(entry["test"], entry["name"], entry["samples"], entry["confidence"]))
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump([r.as_dict() for r in self.results], f, indent=2)
+
+
+class Benchmark:
+    """Runs a measurement repeatedly: ``warmup`` discarded runs, then ``samples`` measured ones.
+
+    ``measure`` is any callable returning a duration in seconds. Exceptions
+    it raises (timeouts, connection errors) propagate to the caller.
+    ``warmup_measure`` replaces it for the warmup runs, e.g. to keep them
+    from being recorded elsewhere.
+    """
+
+    def __init__(self, warmup=WARMUP, samples=SAMPLES, confidence=CONFIDENCE,
+                 resamples=BOOTSTRAP_RESAMPLES, results=None, label=None):
+        self.warmup = warmup
+        self.samples = max(samples, 1)
+        self.confidence = confidence
+        self.resamples = resamples
+        self.results = results if results is not None else BenchmarkResults()
+        self.label = label
+
+    def run(self, name, measure, warmup_measure=None):
+        for _ in range(self.warmup):
+            (warmup_measure or measure)()
+        samples = [measure() for _ in range(self.samples)]
+
+        result = BenchmarkResult(self.label, name, samples, self.confidence, self.resamples)
+        self.results.add(result)
+        return result
@@ -0,0 +1,271 @@
+"""
+Browser contexts - Isolated incognito-like contexts multiplexed inside one shared Chrome process
+"""
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import requests
+import websocket
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from driver_pool import IMPLICIT_WAIT, WINDOW_SIZE, DriverPool, PooledChrome
+from network_monitor import LOGGING_PREFS
+
+# host:port of a Chrome started elsewhere (the parallel runner's), instead of launching one
+CHROME_ADDRESS = os.environ.get("SELENIUM_CHROME_ADDRESS")
+CHROME_BINARY = os.environ.get("CHROME_BINARY")
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+LAUNCH_TIMEOUT = 30
+
+MB = 1024 * 1024
+
+
+class SharedChrome:
+    """One headless Chrome, launched here or attached to at ``address``, driven over its browser DevTools socket.
+
+    Every WebDriver session attaches to the same process, and each lives in
+    its own browser context (``Target.createBrowserContext``): separate
+    cookie jar, storage and cache, without another browser process.
+    """
+
+    def __init__(self, address=None, binary=CHROME_BINARY):
+        self.process = None
+        self.user_data_dir = None
+        self.address = address or self._launch(binary)
+        version = requests.get(f"http://{self.address}/json/version", timeout=10).json()
+        self._socket = websocket.create_connection(version["webSocketDebuggerUrl"], timeout=LAUNCH_TIMEOUT)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _launch(self, binary):
+        binary = binary or next((path for path in map(shutil.which, CHROME_NAMES) if path), None)
+        if binary is None:
+            raise RuntimeError(f"No Chrome binary found (tried {', '.join(CHROME_NAMES)}); set CHROME_BINARY")
+        self.user_data_dir = tempfile.mkdtemp(prefix="selenium-chrome-")
+        self.process = subprocess.Popen([
+            binary,
+            "--headless=new",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--lang=es",
+            f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}",
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self.user_data_dir}",
+            "about:blank",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        # Chrome writes the port it picked to DevToolsActivePort once DevTools listens
+        port_file = os.path.join(self.user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + LAUNCH_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Chrome exited with status {self.process.returncode} on start")
+            if os.path.exists(port_file):
+                with open(port_file) as f:
+                    port = f.readline().strip()
+                if port:
+                    return f"127.0.0.1:{port}"
+            time.sleep(0.05)
+        self.close()
+        raise RuntimeError(f"Chrome did not open DevTools within {LAUNCH_TIMEOUT}s")
+
+    def send(self, method, params=None):
+        """Run a browser-level DevTools command and return its result"""
+        with self._lock:
+            message_id = next(self._ids)
+            self._socket.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+            while True:
+                message = json.loads(self._socket.recv())
+                if message.get("id") == message_id:
+                    break
+        if "error" in message:
+            raise WebDriverException(f"{method}: {message['error'].get('message')}")
+        return message.get("result", {})
+
+    def create_context(self, proxy=None):
+        """A new browser context with one blank page, behind ``proxy`` if given; returns ``(context_id, target_id)``"""
+        params = {"disposeOnDetach": False}
+        if proxy:
+            params.update(proxyServer=f"http://{proxy}", proxyBypassList="<-loopback>")
+        context_id = self.send("Target.createBrowserContext", params)["browserContextId"]
+        target_id = self.send("Target.createTarget", {
+            "url": "about:blank",
+            "browserContextId": context_id,
+            "width": WINDOW_SIZE[0],
+            "height": WINDOW_SIZE[1],
+        })["targetId"]
+        return context_id, target_id
+
+    def dispose_context(self, context_id):
+        """Close every page of a context and drop its cookies, storage and cache"""
+        self.send("Target.disposeBrowserContext", {"browserContextId": context_id})
+
+    def page_targets(self, context_id):
+        targets = self.send("Target.getTargets")["targetInfos"]
+        return [t["targetId"] for t in targets if t["type"] == "page" and t.get("browserContextId") == context_id]
+
+    def rss(self):
+        """Resident memory in bytes of every process of this Chrome, or None where /proc is not available"""
+        processes = self.send("SystemInfo.getProcessInfo")["processInfo"]
+        total = 0
+        for process in processes:
+            try:
+                with open(f"/proc/{process['id']}/statm") as f:
+                    total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except (OSError, ValueError, IndexError):
+                return None
+        return total
+
+    def close(self):
+        """Close the DevTools socket, and the browser if this object launched it"""
+        if getattr(self, "_socket", None) is not None:
+            self._socket.close()
+            self._socket = None
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+        if self.user_data_dir is not None:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            self.user_data_dir = None
+
+
+class ContextChrome(PooledChrome):
+    """WebDriver session attached to a ``SharedChrome`` and confined to one browser context.
+
+    ChromeDriver names windows by DevTools target id, so the session
+    switches to its context's page on start and ``window_handles`` only
+    lists pages of its own context. ``renew`` swaps the context for a
+    fresh one, which is how the pool resets it between tests; ``quit``
+    disposes the context and leaves the shared browser running.
+    """
+
+    def __init__(self, chrome, *args, proxy=None, **kwargs):
+        self.chrome = chrome
+        self.proxy = proxy
+        self.context_id, target_id = chrome.create_context(proxy)
+        try:
+            super().__init__(*args, **kwargs)
+            self.switch_to.window(target_id)
+        except Exception:
+            chrome.dispose_context(self.context_id)
+            raise
+
+    @property
+    def window_handles(self):
+        own = set(self.chrome.page_targets(self.context_id))
+        return [handle for handle in super().window_handles if handle in own]
+
+    def renew(self):
+        """Move to a brand new context and dispose of the old one with everything it stored"""
+        old = self.context_id
+        self.context_id, target_id = self.chrome.create_context(self.proxy)
+        self.switch_to.window(target_id)
+        self.chrome.dispose_context(old)
+        self.set_window_size(*WINDOW_SIZE)
+        self.implicitly_wait(IMPLICIT_WAIT)
+
+    def memory(self):
+        """JS heap and DOM counts of the context's current page"""
+        self.execute_cdp_cmd("Performance.enable", {})
+        metrics = {m["name"]: m["value"] for m in self.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        return {
+            "js_heap_used_mb": metrics.get("JSHeapUsedSize", 0) / MB,
+            "js_heap_total_mb": metrics.get("JSHeapTotalSize", 0) / MB,
+            "nodes": int(metrics.get("Nodes", 0)),
+            "documents": int(metrics.get("Documents", 0)),
+            "frames": int(metrics.get("Frames", 0)),
+        }
+
+    def quit(self):
+        try:
+            self.chrome.dispose_context(self.context_id)
+        except Exception:
+            pass  # The browser may already be gone
+        super().quit()
+
+
+def create_context_driver(chrome, proxy=None):
+    """A ChromeDriver session attached to ``chrome`` in a context of its own, optionally behind ``proxy``"""
+    chrome_options = Options()
+    chrome_options.debugger_address = chrome.address
+    chrome_options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+
+    chromedriver_path = shutil.which("chromedriver") or "/opt/homebrew/bin/chromedriver"
+    driver = ContextChrome(chrome, service=Service(chromedriver_path), options=chrome_options, proxy=proxy)
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    return driver
+
+
+class ContextMemory:
+    """Memory of each context sampled at the end of its test, with the whole browser's footprint"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, label, driver, live_contexts):
+        try:
+            memory = driver.memory()
+            rss = driver.chrome.rss()
+        except WebDriverException:
+            return
+        self.records.append({
+            "test": label,
+            **memory,
+            "browser_rss_mb": rss / MB if rss is not None else None,
+            "live_contexts": live_contexts,
+        })
+
+    def peak_rss(self):
+        return max((r["browser_rss_mb"] for r in self.records if r["browser_rss_mb"] is not None), default=None)
+
+    def merge(self, path):
+        """Fold in the samples another process wrote to ``path``"""
+        with open(path) as f:
+            self.records.extend(json.load(f))
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.records, f, indent=2)
+
+
+class ContextPool(DriverPool):
+    """``DriverPool`` whose browsers are contexts of one shared Chrome.
+
+    ``size`` contexts can be leased at once, each a cheap ChromeDriver
+    session instead of a Chrome process. Between tests the context is
+    replaced rather than wiped, so no cookie, storage or cache entry
+    survives. ``close`` quits the sessions and the Chrome this pool
+    launched; a Chrome attached to at ``address`` keeps running.
+    """
+
+    def __init__(self, base_url, size=8, max_uses=50, address=CHROME_ADDRESS, chrome=None, proxy=None):
+        self.chrome = chrome or SharedChrome(address)
+        super().__init__(base_url, size, max_uses, factory=lambda: create_context_driver(self.chrome, proxy))
+
+    @property
+    def live(self):
+        return self._live
+
+    def reset(self, driver):
+        try:
+            driver.renew()
+            return True
+        except WebDriverException:
+            return False
+
+    def close(self):
+        super().close()
+        self.chrome.close()
@@ -2,17 +2,48 @@
 Pytest configuration and fixtures for Selenium tests
 """
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-import shutil
+from asset_proxy import AssetProxy, ProxyStats
+from browser_contexts import ContextMemory, ContextPool
+from driver_pool import DriverPool, create_chrome_driver
+from issue_log import IssueLog, worker_id, write_issues_report
+from link_checker import LinkChecker, LinkCheckStats
+from loadgen import LoadResults
+from auth_session import AuthCache, AuthenticationError
+from benchmark import Benchmark, BenchmarkResults
+from network_monitor import NetworkMonitor
+from parallel import DURATIONS_FILE, RUN_DIR, SHARD_FILE, DurationLog, read_shard, update_durations
+from page_fetch import BrowserFetcher, HttpFetcher
+from page_metrics import MetricsCollector, PerformanceResults
+from page_state import PageState
+from perf_budgets import BUDGETS_FILE, BrowserBudgetRecorder, BudgetBook
+from resource_blocking import ENABLED as RESOURCE_BLOCKING, BlockingProfile, BlockingTimings, profile_for
+from summaries import (
+    asset_proxy_summary, benchmark_summary, blocking_summary, budget_summary, context_memory_summary,
+    load_summary, performance_summary,
+)
+from user_pool import USERS_FILE, UserPool
+from waits import Waits, WaitStats
 import json
 import os
+import time
 from datetime import datetime
+from functools import partial
 
 # Base URL for the application
 BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")
 
+# Browser pool: number of warm browsers and tests served before a browser is recycled
+POOL_SIZE = int(os.environ.get("SELENIUM_POOL_SIZE", "1"))
+MAX_TESTS_PER_BROWSER = int(os.environ.get("SELENIUM_MAX_TESTS_PER_BROWSER", "50"))
+POOL_WARM = os.environ.get("SELENIUM_POOL_WARM", "0") == "1"
+# Lease isolated contexts of one shared Chrome instead of one Chrome per pooled browser
+BROWSER_CONTEXTS = os.environ.get("SELENIUM_BROWSER_CONTEXTS", "0") == "1"
+# Route every browser through a local proxy that caches static assets for the session
+ASSET_PROXY = os.environ.get("ASSET_PROXY", "0") == "1"
+
+# How page_fetcher loads pages: "auto" honours the http marker, "http" or "browser" force a mode
+FETCH_MODE = os.environ.get("FETCH_MODE", "auto")
+
 # Test user credentials
 TEST_USER = {
     "email": "test@example.com",
@@ -24,33 +55,207 @@ ADMIN_USER = {
     "password": "password123"
 }
 
-# Store for test results and issues
-test_issues = []
+# Issues reported by this process, streamed to its own JSONL shard
+test_issues = IssueLog()
+
+# Seconds per test, folded into DURATIONS_FILE to balance the parallel runner's shards
+test_durations = DurationLog()
+
+# Per-context memory when tests share one Chrome, written to CONTEXT_MEMORY.json
+context_memory = ContextMemory()
+
+# Static assets the browsers got from the asset proxy's cache, written to ASSET_PROXY.json
+asset_proxy_stats = ProxyStats()
+
+# Test times under their resource blocking profile and with everything loaded
+blocking_timings = BlockingTimings()
+
+# Time spent in explicit waits, per condition and per test
+wait_stats = WaitStats()
+
+# Links requested versus answered from the session-wide link cache
+link_check_stats = LinkCheckStats()
+
+# Browser-measured page timings, written to PERFORMANCE_RESULTS.json
+performance_results = PerformanceResults()
+
+# Repeated latency samples and their statistics, written to BENCHMARK_RESULTS.json
+benchmark_results = BenchmarkResults()
+
+# Load test reports, written to LOAD_RESULTS.json
+load_results = LoadResults()
+
+# Per-route performance budgets every visited page is checked against
+budget_book = BudgetBook.load(BUDGETS_FILE)
+
+
+@pytest.fixture(scope="session")
+def asset_proxy():
+    """Caching proxy for static assets shared by every pooled browser, or None unless ASSET_PROXY=1"""
+    if not ASSET_PROXY:
+        yield None
+        return
+    proxy = AssetProxy(stats=asset_proxy_stats).start()
+
+    yield proxy
+
+    proxy.close()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(asset_proxy):
+    """Session-wide pool of warm Chrome WebDriver instances, or of contexts in one Chrome"""
+    proxy = asset_proxy.address if asset_proxy else None
+    if BROWSER_CONTEXTS:
+        pool = ContextPool(BASE_URL, size=POOL_SIZE, max_uses=MAX_TESTS_PER_BROWSER, proxy=proxy)
+    else:
+        pool = DriverPool(BASE_URL, size=POOL_SIZE, max_uses=MAX_TESTS_PER_BROWSER,
+                          factory=lambda: create_chrome_driver(proxy))
+    if POOL_WARM:
+        pool.warm()
+
+    yield pool
+
+    pool.close()
 
 
 @pytest.fixture(scope="function")
-def driver():
-    """Create a Chrome WebDriver instance for each test"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--lang=es")
-
-    # Use system chromedriver from Homebrew
-    chromedriver_path = shutil.which("chromedriver") or "/opt/homebrew/bin/chromedriver"
-    service = Service(chromedriver_path)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.implicitly_wait(10)
+def driver(driver_pool, request):
+    """Lease a clean Chrome WebDriver instance from the pool for each test.
+
+    The test's ``resources`` profile decides which images, media, fonts or
+    third-party requests the browser skips while the test runs.
+    """
+    driver = driver_pool.acquire()
+    profile = profile_for(request.node)
+    blocked = RESOURCE_BLOCKING and bool(profile.patterns) and profile.apply(driver)
+    start = time.monotonic()
 
     yield driver
 
-    try:
-        driver.quit()
-    except Exception:
-        pass  # Ignore errors during cleanup
+    blocking_timings.record(request.node.nodeid, profile, blocked, time.monotonic() - start)
+    if blocked:
+        BlockingProfile.clear(driver)
+    if BROWSER_CONTEXTS:
+        context_memory.record(request.node.nodeid, driver, driver_pool.live)
+    driver_pool.release(driver)
+
+
+@pytest.fixture
+def network(driver):
+    """DevTools network activity of the leased browser"""
+    return NetworkMonitor(driver)
+
+
+@pytest.fixture
+def page_state(driver, network):
+    """Source, title, URL and status of the current page, read once per document"""
+    return PageState(driver, network)
+
+
+@pytest.fixture
+def waits(driver, network, page_state, perf_budgets, request):
+    """Event-driven waits for the leased browser, timed per test"""
+    waits = Waits(driver, network, stats=wait_stats, label=request.node.nodeid, page_state=page_state)
+    implicit_before = getattr(driver, "implicit_wait_seconds", 0.0)
+
+    # Check every page the test loads against its performance budget
+    recorder = BrowserBudgetRecorder(perf_budgets, driver, network, label=request.node.nodeid)
+    recorder.install()
+    waits.on_page_loaded.append(recorder.visit)
+
+    yield waits
+
+    recorder.uninstall()
+    waits.record_implicit_wait(getattr(driver, "implicit_wait_seconds", 0.0) - implicit_before)
+
+
+@pytest.fixture
+def page_metrics(driver, waits, request):
+    """Measure page loads with Navigation Timing, paint, LCP, CLS and long tasks"""
+    collector = MetricsCollector(driver, waits, performance_results, label=request.node.nodeid)
+    collector.install()
+
+    yield collector
+
+    collector.uninstall()
+
+
+@pytest.fixture
+def benchmark(request):
+    """Warm up, then sample a measurement repeatedly and summarize it statistically"""
+    return Benchmark(results=benchmark_results, label=request.node.nodeid)
+
+
+@pytest.fixture
+def record_load_report(request):
+    """Keep a load report for LOAD_RESULTS.json and the terminal summary"""
+    return partial(load_results.record, request.node.nodeid)
+
+
+@pytest.fixture(scope="session")
+def perf_budgets():
+    """Performance budgets by route and locale"""
+    return budget_book
+
+
+@pytest.fixture(scope="session")
+def auth_cache():
+    """Session-wide cache of signed-in users, shared by browsers and HTTP clients"""
+    return AuthCache(BASE_URL)
+
+
+@pytest.fixture(scope="session")
+def user_pool(auth_cache):
+    """Accounts for concurrent runs: LOAD_USERS_FILE if set, otherwise just TEST_USER"""
+    if USERS_FILE:
+        return UserPool.from_file(USERS_FILE, auth_cache)
+    return UserPool([TEST_USER], auth_cache)
+
+
+@pytest.fixture
+def pooled_user(user_pool):
+    """A pooled account that no other concurrently running test holds"""
+    with user_pool.lease() as user:
+        yield user
+
+
+@pytest.fixture(scope="session")
+def http_fetcher(auth_cache, perf_budgets):
+    """Session-wide keep-alive HTTP client for browserless page checks"""
+    fetcher = HttpFetcher(BASE_URL, auth_cache, budgets=perf_budgets)
+
+    yield fetcher
+
+    fetcher.close()
+
+
+@pytest.fixture(scope="session")
+def link_checker():
+    """Session-wide concurrent link checker; each URL is requested once per run"""
+    checker = LinkChecker(stats=link_check_stats)
+
+    yield checker
+
+    checker.close()
+
+
+@pytest.fixture
+def page_fetcher(request, http_fetcher):
+    """Load pages over plain HTTP for http-marked tests, or through a browser otherwise"""
+    use_http = FETCH_MODE == "http" or (
+        FETCH_MODE == "auto" and request.node.get_closest_marker("http") is not None
+    )
+    if use_http:
+        return http_fetcher.labelled(request.node.nodeid)
+
+    # Only lease a browser when the test actually renders pages
+    return BrowserFetcher(
+        request.getfixturevalue("driver"),
+        request.getfixturevalue("waits"),
+        request.getfixturevalue("auth_cache"),
+        request.getfixturevalue("page_state"),
+    )
 
 
 @pytest.fixture
@@ -77,59 +282,110 @@ def issues_collector():
     return test_issues
 
 
+def pytest_sessionstart(session):
+    """Clear the issue shards of the previous run before any worker reports"""
+    if worker_id() is None:
+        IssueLog.reset()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep only this worker's share of the tests when started by the parallel runner"""
+    shard = read_shard()
+    if shard is None:
+        return
+    deselected = [item for item in items if item.nodeid not in shard]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in shard]
+
+
+def pytest_runtest_logreport(report):
+    test_durations.add(report.nodeid, report.duration)
+
+
+def output_path(name):
+    """``name`` next to this file; workers add their id so they never overwrite each other"""
+    worker = worker_id()
+    if worker is not None:
+        stem, ext = os.path.splitext(name)
+        name = f"{stem}.{worker}{ext}"
+    return os.path.join(os.path.dirname(__file__), name)
+
+
 def pytest_sessionfinish(session, exitstatus):
     """Generate issues report after all tests complete"""
-    if test_issues:
-        report_path = os.path.join(os.path.dirname(__file__), "ISSUES_REPORT.md")
-        with open(report_path, "w") as f:
-            f.write("# PlebisHub Application Issues Report\n\n")
-            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"**Total Issues Found:** {len(test_issues)}\n\n")
-            f.write("---\n\n")
-
-            # Group by severity
-            critical = [i for i in test_issues if i.get("severity") == "CRITICAL"]
-            high = [i for i in test_issues if i.get("severity") == "HIGH"]
-            medium = [i for i in test_issues if i.get("severity") == "MEDIUM"]
-            low = [i for i in test_issues if i.get("severity") == "LOW"]
-
-            if critical:
-                f.write("## CRITICAL Issues\n\n")
-                for issue in critical:
-                    write_issue(f, issue)
-
-            if high:
-                f.write("## HIGH Priority Issues\n\n")
-                for issue in high:
-                    write_issue(f, issue)
-
-            if medium:
-                f.write("## MEDIUM Priority Issues\n\n")
-                for issue in medium:
-                    write_issue(f, issue)
-
-            if low:
-                f.write("## LOW Priority Issues\n\n")
-                for issue in low:
-                    write_issue(f, issue)
-
-
-def write_issue(f, issue):
-    """Write a single issue to the report"""
-    f.write(f"### {issue.get('title', 'Unknown Issue')}\n\n")
-    f.write(f"- **Page:** {issue.get('page', 'N/A')}\n")
-    f.write(f"- **URL:** {issue.get('url', 'N/A')}\n")
-    f.write(f"- **Type:** {issue.get('type', 'N/A')}\n")
-    f.write(f"- **Description:** {issue.get('description', 'N/A')}\n")
-    if issue.get("error_message"):
-        f.write(f"- **Error Message:** `{issue.get('error_message')}`\n")
-    if issue.get("expected"):
-        f.write(f"- **Expected:** {issue.get('expected')}\n")
-    if issue.get("actual"):
-        f.write(f"- **Actual:** {issue.get('actual')}\n")
-    if issue.get("screenshot"):
-        f.write(f"- **Screenshot:** {issue.get('screenshot')}\n")
-    f.write("\n")
+    if performance_results.records:
+        performance_results.write(output_path("PERFORMANCE_RESULTS.json"))
+    if benchmark_results.results:
+        benchmark_results.write(output_path("BENCHMARK_RESULTS.json"))
+    if budget_book.evaluations:
+        budget_book.write(output_path("BUDGET_REPORT.json"))
+    if load_results.records:
+        load_results.write(output_path("LOAD_RESULTS.json"))
+    if context_memory.records:
+        context_memory.write(output_path("CONTEXT_MEMORY.json"))
+    if blocking_timings.recorded:
+        blocking_timings.write(output_path("BLOCKING_TIMINGS.json") if worker_id() is not None else None)
+    if asset_proxy_stats.cacheable or asset_proxy_stats.passed_through:
+        asset_proxy_stats.write(output_path("ASSET_PROXY.json"))
+
+    test_issues.close()
+    if worker_id() is not None:
+        # The parallel runner folds shard timings in itself; xdist relays them to its controller
+        if SHARD_FILE and test_durations.durations:
+            test_durations.write(os.path.join(RUN_DIR, f"durations-{worker_id()}.json"))
+        return
+
+    if test_durations.durations:
+        update_durations(DURATIONS_FILE, test_durations.durations)
+
+    # The controller merges every worker's shard into one report
+    issues = IssueLog.merge()
+    if issues:
+        write_issues_report(os.path.join(os.path.dirname(__file__), "ISSUES_REPORT.md"), issues)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Show where the suite spent its time waiting"""
+    performance_summary(terminalreporter, performance_results)
+    benchmark_summary(terminalreporter, benchmark_results)
+    budget_summary(terminalreporter, budget_book)
+    load_summary(terminalreporter, load_results)
+    context_memory_summary(terminalreporter, context_memory)
+
+    if blocking_timings.recorded:
+        blocking_summary(terminalreporter, blocking_timings)
+    asset_proxy_summary(terminalreporter, asset_proxy_stats)
+
+    if link_check_stats.checked:
+        terminalreporter.write_sep("-", "link checks")
+        terminalreporter.write_line(
+            f"{link_check_stats.checked} URLs requested in {link_check_stats.seconds:.2f}s, "
+            f"{link_check_stats.cache_hits} links answered from the cache"
+        )
+
+    if not wait_stats.records:
+        return
+
+    terminalreporter.write_sep("-", "wait time")
+    for condition, entry in sorted(wait_stats.by_condition().items(), key=lambda item: -item[1]["seconds"]):
+        terminalreporter.write_line(
+            f"{condition:<16} {entry['count']:>5} waits {entry['seconds']:>8.2f}s total "
+            f"{entry['max']:>6.2f}s max {entry['timeouts']:>3} timeouts"
+        )
+
+    slowest = sorted(wait_stats.by_label().items(), key=lambda item: -item[1])[:10]
+    terminalreporter.write_line("")
+    terminalreporter.write_line("Tests with the most wait time:")
+    for label, seconds in slowest:
+        terminalreporter.write_line(f"  {seconds:>8.2f}s  {label}")
+
+    implicit = wait_stats.by_label(condition="implicit_wait")
+    if implicit:
+        terminalreporter.write_line("")
+        terminalreporter.write_line("Time burned in implicit waits (lookups that found nothing):")
+        for label, seconds in sorted(implicit.items(), key=lambda item: -item[1]):
+            terminalreporter.write_line(f"  {seconds:>8.2f}s  {label}")
 
 
 def report_issue(issues_list, severity, title, page, url, issue_type, description,
@@ -148,3 +404,16 @@ def report_issue(issues_list, severity, title, page, url, issue_type, descriptio
         "screenshot": screenshot,
         "timestamp": datetime.now().isoformat()
     })
+
+
+def fetch_signed_in(page_fetcher, url, user, issues_list, page):
+    """Fetch ``url`` as ``user``; a rejected login is reported as an issue and returns None"""
+    try:
+        return page_fetcher.fetch(url, user=user)
+    except AuthenticationError as e:
+        report_issue(
+            issues_list, "HIGH", f"Login failed for {user['email']}",
+            page, url, "Authentication Error",
+            str(e)
+        )
+        return None
@@ -0,0 +1,66 @@
+"""
+DOM snapshots - Read attributes, styles and geometry of many elements in one call
+"""
+
+# Serializes every element matching a selector; arguments are the selector,
+# attribute names, computed style names, property paths and whether to read innerText
+SNAPSHOT_SCRIPT = """
+var selector = arguments[0], attributes = arguments[1], styles = arguments[2],
+    properties = arguments[3], withText = arguments[4];
+return Array.from(document.querySelectorAll(selector), function (el) {
+    var rect = el.getBoundingClientRect();
+    var computed = styles.length ? window.getComputedStyle(el) : null;
+    var item = {
+        tag: el.tagName.toLowerCase(),
+        text: withText ? (el.innerText || "").trim() : null,
+        rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+        attributes: {},
+        styles: {},
+        properties: {}
+    };
+    attributes.forEach(function (name) { item.attributes[name] = el.getAttribute(name); });
+    styles.forEach(function (name) { item.styles[name] = computed.getPropertyValue(name); });
+    properties.forEach(function (path) {
+        var value = el;
+        path.split(".").forEach(function (key) { value = value == null ? value : value[key]; });
+        item.properties[path] = value === undefined ? null : value;
+    });
+    return item;
+});
+"""
+
+
+class ElementSnapshot:
+    """Serialized state of one element at the time of the snapshot"""
+
+    def __init__(self, data):
+        self.tag = data["tag"]
+        self.text = data["text"]
+        self.rect = data["rect"]
+        self.attributes = data["attributes"]
+        self.styles = data["styles"]
+        self.properties = data["properties"]
+
+    def attr(self, name):
+        """Raw attribute value, or None if the attribute is missing"""
+        return self.attributes.get(name)
+
+    def style(self, name):
+        """Computed style value, e.g. ``rgb(0, 0, 0)`` for ``color``"""
+        return self.styles.get(name)
+
+    def prop(self, path):
+        """DOM property value, e.g. ``naturalWidth`` or ``labels.length``"""
+        return self.properties.get(path)
+
+
+def snapshot(driver, selector, attributes=(), styles=(), properties=(), text=False):
+    """Snapshot every element matching a CSS selector in one WebDriver round trip.
+
+    Only the requested attributes, computed styles and (dotted) DOM property
+    paths are read; ``text=True`` also reads each element's rendered text.
+    """
+    items = driver.execute_script(
+        SNAPSHOT_SCRIPT, selector, list(attributes), list(styles), list(properties), text
+    )
+    return [ElementSnapshot(item) for item in items or []]
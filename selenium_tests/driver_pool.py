@@ -0,0 +1,224 @@
+"""
+WebDriver pool - Keeps warm Chrome instances alive for the whole test session
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from network_monitor import LOGGING_PREFS
+
+# Defaults restored on every browser between tests. Lookups do not wait
+# implicitly: presence checks use explicit waits (see waits.py) so that
+# absence checks return immediately.
+WINDOW_SIZE = (1920, 1080)
+IMPLICIT_WAIT = float(os.environ.get("SELENIUM_IMPLICIT_WAIT", "0"))
+
+# Storage cleared for the application origin between tests
+CLEARED_STORAGE_TYPES = "local_storage,session_storage,indexeddb,websql,cache_storage,service_workers"
+
+
+class PooledChrome(webdriver.Chrome):
+    """Chrome driver that tracks its implicit wait and the time lookups spend blocked in it"""
+
+    def __init__(self, *args, **kwargs):
+        self.implicit_wait = 0
+        self.implicit_wait_seconds = 0.0
+        super().__init__(*args, **kwargs)
+
+    def implicitly_wait(self, time_to_wait):
+        super().implicitly_wait(time_to_wait)
+        self.implicit_wait = time_to_wait
+
+    def find_element(self, by=By.ID, value=None):
+        start = time.monotonic()
+        try:
+            return super().find_element(by, value)
+        except NoSuchElementException:
+            self._charge_implicit_wait(start)
+            raise
+
+    def find_elements(self, by=By.ID, value=None):
+        start = time.monotonic()
+        elements = super().find_elements(by, value)
+        if not elements:
+            self._charge_implicit_wait(start)
+        return elements
+
+    def _charge_implicit_wait(self, start):
+        # A lookup that finds nothing blocks for the whole implicit wait
+        if self.implicit_wait:
+            self.implicit_wait_seconds += time.monotonic() - start
+
+
+def proxy_arguments(proxy):
+    """Chrome flags routing every request, the loopback application included, through ``proxy`` (host:port)"""
+    return [f"--proxy-server=http://{proxy}", "--proxy-bypass-list=<-loopback>"]
+
+
+def create_chrome_driver(proxy=None):
+    """Create a headless Chrome WebDriver instance, optionally behind the ``proxy`` at host:port"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--lang=es")
+    for argument in proxy_arguments(proxy) if proxy else ():
+        chrome_options.add_argument(argument)
+    chrome_options.set_capability("goog:loggingPrefs", LOGGING_PREFS)
+
+    # Use system chromedriver from Homebrew
+    chromedriver_path = shutil.which("chromedriver") or "/opt/homebrew/bin/chromedriver"
+    service = Service(chromedriver_path)
+    driver = PooledChrome(service=service, options=chrome_options)
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    return driver
+
+
+class DriverPool:
+    """Pool of warm WebDriver instances shared by the tests of a session.
+
+    Browsers are handed out with ``acquire`` and returned with ``release``,
+    which wipes cookies, storage, extra windows, window size and implicit
+    waits so the next test starts from a clean state. A browser is quit
+    and replaced after ``max_uses`` tests, or as soon as it stops
+    responding.
+    """
+
+    def __init__(self, base_url, size=1, max_uses=50, factory=create_chrome_driver):
+        self.base_url = base_url
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.factory = factory
+
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._live = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.created = 0
+        self.recycled = 0
+        self.crashed = 0
+
+    def acquire(self, timeout=None):
+        """Return an idle browser, launching a new one while under capacity"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._launch_or_wait(timeout)
+
+            if self._is_alive(driver):
+                with self._lock:
+                    self._uses[driver] += 1
+                return driver
+
+            self.crashed += 1
+            self._discard(driver)
+
+    def warm(self):
+        """Launch browsers up to the pool size ahead of the first test"""
+        launched = []
+        while self._live < self.size:
+            launched.append(self._launch_or_wait(None))
+        for driver in launched:
+            self._idle.put(driver)
+
+    def release(self, driver):
+        """Reset a browser and return it to the pool, or retire it"""
+        with self._lock:
+            uses = self._uses.get(driver, 0)
+
+        if self._closed:
+            self._discard(driver)
+        elif uses >= self.max_uses:
+            self.recycled += 1
+            self._discard(driver)
+        elif not self.reset(driver):
+            self.crashed += 1
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    def reset(self, driver):
+        """Restore per-test browser state, returning False if the browser is unusable"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            driver.get("about:blank")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": self._origin(),
+                "storageTypes": CLEARED_STORAGE_TYPES,
+            })
+
+            driver.set_window_size(*WINDOW_SIZE)
+            driver.implicitly_wait(IMPLICIT_WAIT)
+            return True
+        except WebDriverException:
+            return False
+
+    def close(self):
+        """Quit every browser owned by the pool"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _launch_or_wait(self, timeout):
+        with self._lock:
+            can_launch = self._live < self.size
+            if can_launch:
+                self._live += 1
+
+        if not can_launch:
+            return self._idle.get(timeout=timeout)
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+
+        with self._lock:
+            self._uses[driver] = 0
+            self.created += 1
+        return driver
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            if self._uses.pop(driver, None) is not None:
+                self._live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
+    def _origin(self):
+        parts = urlsplit(self.base_url)
+        return f"{parts.scheme}://{parts.netloc}"
@@ -0,0 +1,114 @@
+"""
+Issue log - Append-only JSONL shards of reported issues, one per worker process
+"""
+import glob
+import json
+import os
+import shutil
+from datetime import datetime
+
+ISSUES_DIR = os.environ.get("ISSUES_DIR", os.path.join(os.path.dirname(__file__), ".issues"))
+
+# Severities in report order
+SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+
+def worker_id():
+    """Name of this worker process (pytest-xdist or the suite's own runner), or None in the controller"""
+    return os.environ.get("PYTEST_XDIST_WORKER") or os.environ.get("SELENIUM_WORKER")
+
+
+class IssueLog:
+    """Issues of one process, streamed to ``<directory>/issues-<worker>.jsonl``.
+
+    Every ``append`` writes one JSON line and flushes it, so nothing is held
+    in memory and nothing is lost if a worker dies; other processes write
+    their own shards, so no file is ever shared. ``merge`` reads every
+    shard of a run back, sorted for the report. ``append`` matches
+    ``list.append``, which is all ``report_issue`` needs.
+    """
+
+    def __init__(self, directory=ISSUES_DIR, worker=None):
+        self.directory = directory
+        self.worker = worker or worker_id() or "main"
+        self.path = os.path.join(directory, f"issues-{self.worker}.jsonl")
+        self.count = 0
+        self._file = None
+
+    def append(self, issue):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(issue, default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def reset(directory=ISSUES_DIR):
+        """Remove the shards of a previous run; the controller calls this before workers start"""
+        shutil.rmtree(directory, ignore_errors=True)
+
+    @staticmethod
+    def merge(directory=ISSUES_DIR):
+        """Every issue in the shards of ``directory``, by severity and then time reported"""
+        issues = []
+        for path in sorted(glob.glob(os.path.join(directory, "issues-*.jsonl"))):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        issues.append(json.loads(line))
+
+        def order(issue):
+            severity = issue.get("severity")
+            rank = SEVERITIES.index(severity) if severity in SEVERITIES else len(SEVERITIES)
+            return rank, issue.get("timestamp") or ""
+        return sorted(issues, key=order)
+
+
+def write_issue(f, issue):
+    """Write a single issue to the report"""
+    f.write(f"### {issue.get('title', 'Unknown Issue')}\n\n")
+    f.write(f"- **Page:** {issue.get('page', 'N/A')}\n")
+    f.write(f"- **URL:** {issue.get('url', 'N/A')}\n")
+    f.write(f"- **Type:** {issue.get('type', 'N/A')}\n")
+    f.write(f"- **Description:** {issue.get('description', 'N/A')}\n")
+    if issue.get("error_message"):
+        f.write(f"- **Error Message:** `{issue.get('error_message')}`\n")
+    if issue.get("expected"):
+        f.write(f"- **Expected:** {issue.get('expected')}\n")
+    if issue.get("actual"):
+        f.write(f"- **Actual:** {issue.get('actual')}\n")
+    if issue.get("screenshot"):
+        f.write(f"- **Screenshot:** {issue.get('screenshot')}\n")
+    f.write("\n")
+
+
+def write_issues_report(report_path, issues):
+    """Write ISSUES_REPORT.md grouped by severity"""
+    headings = {
+        "CRITICAL": "CRITICAL Issues",
+        "HIGH": "HIGH Priority Issues",
+        "MEDIUM": "MEDIUM Priority Issues",
+        "LOW": "LOW Priority Issues",
+    }
+    with open(report_path, "w") as f:
+        f.write("# PlebisHub Application Issues Report\n\n")
+        f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(f"**Total Issues Found:** {len(issues)}\n\n")
+        f.write("---\n\n")
+
+        for severity in SEVERITIES:
+            group = [i for i in issues if i.get("severity") == severity]
+            if group:
+                f.write(f"## {headings[severity]}\n\n")
+                for issue in group:
+                    write_issue(f, issue)
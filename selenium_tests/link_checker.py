@@ -0,0 +1,138 @@
+"""
+Link checker - Concurrent, deduplicated HTTP status checks for page links
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Total checks in flight, and how many of them may hit the same host at once
+MAX_WORKERS = int(os.environ.get("LINK_CHECK_WORKERS", "8"))
+MAX_PER_HOST = int(os.environ.get("LINK_CHECK_PER_HOST", "4"))
+
+# Servers that reject HEAD; the link is checked again with a streamed GET
+HEAD_UNSUPPORTED = (405, 501)
+
+# Collects the resolved http(s) href of every matching link in one round trip
+LINK_HREFS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0]), function (a) { return a.href; })
+    .filter(function (href) { return /^https?:/.test(href); });
+"""
+
+
+def link_hrefs(driver, selector):
+    """Absolute http(s) hrefs of the links matching ``selector``, in document order"""
+    return driver.execute_script(LINK_HREFS_SCRIPT, selector) or []
+
+
+def normalize_url(url):
+    """Cache key for a link: fragments never change the response"""
+    return urldefrag(url)[0]
+
+
+class LinkStatus:
+    """Outcome of checking one URL"""
+
+    def __init__(self, url, status=None, error=None, elapsed=0.0):
+        self.url = url
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+
+
+class LinkCheckStats:
+    """Requests sent versus links served from the cache"""
+
+    def __init__(self):
+        self.checked = 0
+        self.cache_hits = 0
+        self.seconds = 0.0
+
+
+class LinkChecker:
+    """Checks link status codes concurrently, each URL at most once per session.
+
+    Requests go through one pooled keep-alive ``requests.Session`` on a
+    bounded thread pool. At most ``per_host`` requests are in flight against
+    the same host. Results, and checks still running, are cached by URL
+    without its fragment, so a header link shared by every page is only
+    requested the first time it is seen.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host=MAX_PER_HOST, timeout=10, stats=None):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.stats = stats if stats is not None else LinkCheckStats()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="link-check")
+        self._futures = {}
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def check(self, url):
+        """Status of a single URL"""
+        return self.check_all([url])[url]
+
+    def check_all(self, urls):
+        """Check every URL concurrently, returning a ``{url: LinkStatus}`` dict"""
+        futures = {}
+        for url in urls:
+            if url not in futures:
+                futures[url] = self._submit(normalize_url(url))
+        return {url: future.result() for url, future in futures.items()}
+
+    def broken(self, urls, min_status=400):
+        """``(url, status)`` for every URL that answered with ``min_status`` or above"""
+        results = self.check_all(urls)
+        return [
+            (url, result.status) for url, result in results.items()
+            if result.status is not None and result.status >= min_status
+        ]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def _submit(self, url):
+        with self._lock:
+            future = self._futures.get(url)
+            if future is not None:
+                self.stats.cache_hits += 1
+                return future
+            future = self._executor.submit(self._fetch, url)
+            self._futures[url] = future
+            return future
+
+    def _slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _fetch(self, url):
+        start = time.monotonic()
+        with self._slot(url):
+            try:
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code in HEAD_UNSUPPORTED:
+                    response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+                    response.close()
+                result = LinkStatus(url, status=response.status_code)
+            except requests.RequestException as e:
+                result = LinkStatus(url, error=str(e))
+        result.elapsed = time.monotonic() - start
+
+        with self._lock:
+            self.stats.checked += 1
+            self.stats.seconds += result.elapsed
+        return result
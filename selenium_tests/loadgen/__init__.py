@@ -0,0 +1,43 @@
+"""
+Load generator - asyncio HTTP load against the application's page catalogs
+"""
+from .adaptive import AdaptiveConfig, AdaptiveEngine, AdaptiveReport
+from .capacity import CapacityConfig, CapacityReport, CapacitySearch
+from .engine import LoadConfig, LoadEngine, Route, catalog_routes
+from .hdr import HdrHistogram
+from .login import LoginBenchmark, LoginConfig, LoginReport
+from .openloop import OpenLoopConfig, OpenLoopEngine, arrival_times
+from .scenario import Scenario, ScenarioConfig, ScenarioReport, ScenarioRunner, load_scenarios
+from .stats import LoadReport, LoadResults, RouteStats
+from .vote import VoteBenchmark, VoteConfig, VoteReport
+
+__all__ = [
+    "AdaptiveConfig",
+    "AdaptiveEngine",
+    "AdaptiveReport",
+    "CapacityConfig",
+    "CapacityReport",
+    "CapacitySearch",
+    "HdrHistogram",
+    "LoadConfig",
+    "LoadEngine",
+    "LoadReport",
+    "LoadResults",
+    "LoginBenchmark",
+    "LoginConfig",
+    "LoginReport",
+    "OpenLoopConfig",
+    "OpenLoopEngine",
+    "Route",
+    "RouteStats",
+    "Scenario",
+    "ScenarioConfig",
+    "ScenarioReport",
+    "ScenarioRunner",
+    "VoteBenchmark",
+    "VoteConfig",
+    "VoteReport",
+    "arrival_times",
+    "catalog_routes",
+    "load_scenarios",
+]
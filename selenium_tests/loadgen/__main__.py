@@ -0,0 +1,154 @@
+"""
+Command line entry point: python -m loadgen (run from selenium_tests/)
+"""
+import argparse
+import json
+import os
+
+from auth_session import AuthCache
+from page_catalog import CAPACITY_PAGES
+from user_pool import USERS_FILE, UserPool
+
+from .adaptive import LATENCY_TARGET_MS, MAX_CONCURRENCY, AdaptiveConfig, AdaptiveEngine
+from .capacity import (
+    MAX_RATE, P99_TARGET_MS, STAGE_DURATION, START_RATE, STEP_RATE, CapacityConfig, CapacitySearch,
+)
+from .engine import DURATION, RAMP_UP, THINK_TIME, VUS, LoadConfig, LoadEngine, Route, catalog_routes
+from .login import CONCURRENCY_LEVELS, LoginBenchmark, LoginConfig
+from .openloop import ARRIVAL, ARRIVALS, MAX_CONNECTIONS, RATE, OpenLoopConfig, OpenLoopEngine
+from .scenario import SCENARIOS_FILE, ScenarioConfig, ScenarioRunner, load_scenarios
+from .vote import ELECTION_ID, VoteBenchmark, VoteConfig
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="loadgen", description="Generate HTTP load against PlebisHub page catalogs")
+    parser.add_argument("--base-url", default=os.environ.get("BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--catalog",
+                        help="comma-separated catalogs: public, authenticated, admin "
+                             "(default: public; capacity mode defaults to the engine pages)")
+    parser.add_argument("--path", action="append",
+                        help="request this path anonymously instead of a catalog (repeatable)")
+    parser.add_argument("--mode", choices=("closed", "open", "capacity", "adaptive", "scenario", "vote", "login"),
+                        default="closed",
+                        help="closed: virtual users wait for each response; open: fixed arrival rate; "
+                             "capacity: step the rate up per route until it tips over; "
+                             "adaptive: AIMD-controlled requests in flight; "
+                             "scenario: virtual users walk the journeys of the scenario file; "
+                             "vote: signed-in voters request vote tokens for --election; "
+                             "login: sign-in throughput at each of --levels")
+    parser.add_argument("--vus", type=int, default=VUS, help="virtual users")
+    parser.add_argument("--ramp-up", type=float, default=RAMP_UP, help="seconds to start all virtual users")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds to run")
+    parser.add_argument("--think-time", type=float, default=THINK_TIME, help="pause between requests of a user")
+    parser.add_argument("--rate", type=float, default=RATE, help="open loop: requests per second")
+    parser.add_argument("--arrival", choices=ARRIVALS, default=ARRIVAL, help="open loop: arrival process")
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS,
+                        help="open loop: requests in flight at once")
+    parser.add_argument("--start-rate", type=float, default=START_RATE, help="capacity: first stage rate")
+    parser.add_argument("--step-rate", type=float, default=STEP_RATE, help="capacity: rate added per stage")
+    parser.add_argument("--max-rate", type=float, default=MAX_RATE, help="capacity: highest stage rate")
+    parser.add_argument("--stage-duration", type=float, default=STAGE_DURATION,
+                        help="capacity, login: seconds per stage")
+    parser.add_argument("--p99-target", type=float, default=P99_TARGET_MS,
+                        help="capacity: p99 (ms) a sustainable stage stays under")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="adaptive: most requests in flight")
+    parser.add_argument("--latency-target", type=float, default=LATENCY_TARGET_MS,
+                        help="adaptive: p95 (ms) above which concurrency is cut")
+    parser.add_argument("--scenarios-file", default=SCENARIOS_FILE, help="scenario: journeys file")
+    parser.add_argument("--scenario", action="append",
+                        help="scenario: run only this journey of the file (repeatable)")
+    parser.add_argument("--iterations", type=int,
+                        help="scenario: journeys per virtual user (default: until --duration)")
+    parser.add_argument("--seed", type=int, help="open loop: random seed of the arrival schedule")
+    parser.add_argument("--user", default=os.environ.get("LOAD_USER", "test@example.com:password123"),
+                        help="email:password for the authenticated catalog")
+    parser.add_argument("--levels", default=",".join(str(n) for n in CONCURRENCY_LEVELS),
+                        help="login: comma-separated concurrency levels")
+    parser.add_argument("--election", default=ELECTION_ID, help="vote: election id")
+    parser.add_argument("--users-file", default=USERS_FILE,
+                        help="scenario, vote, login: file of email:password lines (or a JSON list) of accounts")
+    parser.add_argument("--provision", type=int, metavar="N",
+                        help="scenario, vote, login: register N fresh users through the sign-up form "
+                             "of a local instance")
+    parser.add_argument("--admin", default=os.environ.get("LOAD_ADMIN", "admin@example.com:password123"),
+                        help="email:password for the admin catalog")
+    parser.add_argument("--json", help="also write the report as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def _credentials(value):
+    email, _, password = value.partition(":")
+    return {"email": email, "password": password}
+
+
+def _user_pool(args):
+    if args.provision:
+        return UserPool.provision(args.base_url, args.provision)
+    if args.users_file:
+        return UserPool.from_file(args.users_file)
+    return UserPool([_credentials(args.user)])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.mode == "scenario":
+        scenarios = load_scenarios(args.scenarios_file, args.scenario)
+        config = ScenarioConfig(vus=args.vus, ramp_up=args.ramp_up, duration=args.duration, iterations=args.iterations)
+        report = ScenarioRunner(args.base_url, scenarios, config, users=_user_pool(args).users).run()
+        _output(report, args.json)
+        return
+    if args.mode == "login":
+        config = LoginConfig(levels=[int(n) for n in args.levels.split(",")], stage_duration=args.stage_duration)
+        report = LoginBenchmark(args.base_url, _user_pool(args).users, config).run()
+        _output(report, args.json)
+        return
+    if args.mode == "vote":
+        pool = _user_pool(args)
+        config = VoteConfig(election_id=args.election, vus=args.vus, ramp_up=args.ramp_up, duration=args.duration,
+                            think_time=args.think_time)
+        report = VoteBenchmark(args.base_url, pool.take(args.vus), config).run()
+        _output(report, args.json)
+        return
+
+    if args.path:
+        routes = [Route(path) for path in args.path]
+    elif args.catalog is None and args.mode == "capacity":
+        routes = [Route(path) for path in CAPACITY_PAGES]
+    else:
+        routes = catalog_routes(
+            [name.strip() for name in (args.catalog or "public").split(",") if name.strip()],
+            user=_credentials(args.user),
+            admin=_credentials(args.admin),
+        )
+
+    auth_cache = AuthCache(args.base_url)
+    if args.mode == "capacity":
+        config = CapacityConfig(start_rate=args.start_rate, step_rate=args.step_rate, max_rate=args.max_rate,
+                                stage_duration=args.stage_duration, p99_target_ms=args.p99_target,
+                                max_connections=args.max_connections, seed=args.seed)
+        report = CapacitySearch(args.base_url, routes, config, auth_cache=auth_cache).run()
+    elif args.mode == "adaptive":
+        config = AdaptiveConfig(duration=args.duration, maximum=args.max_concurrency,
+                                latency_target_ms=args.latency_target)
+        report = AdaptiveEngine(args.base_url, routes, config, auth_cache=auth_cache).run()
+    elif args.mode == "open":
+        config = OpenLoopConfig(rate=args.rate, duration=args.duration, arrival=args.arrival,
+                                max_connections=args.max_connections, seed=args.seed)
+        report = OpenLoopEngine(args.base_url, routes, config, auth_cache=auth_cache).run()
+    else:
+        config = LoadConfig(vus=args.vus, ramp_up=args.ramp_up, duration=args.duration, think_time=args.think_time)
+        report = LoadEngine(args.base_url, routes, config, auth_cache=auth_cache).run()
+
+    _output(report, args.json)
+
+
+def _output(report, json_path):
+    print(report.format_text())
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report.as_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Adaptive engine - AIMD concurrency control for load against shared environments
+"""
+import asyncio
+import os
+import time
+
+import aiohttp
+
+from rate_limit import is_rate_limited, retry_after
+
+from .engine import DURATION, HTTP_HEADERS, REQUEST_TIMEOUT, LoadEngine
+from .hdr import HdrHistogram
+from .stats import LoadReport
+
+INITIAL_CONCURRENCY = int(os.environ.get("LOAD_ADAPTIVE_INITIAL", "1"))
+MAX_CONCURRENCY = int(os.environ.get("LOAD_ADAPTIVE_MAX", "64"))
+LATENCY_TARGET_MS = float(os.environ.get("LOAD_ADAPTIVE_P95_MS", "1000"))
+MAX_ERROR_RATE = float(os.environ.get("LOAD_ADAPTIVE_MAX_ERROR_RATE", "0.01"))
+WINDOW = float(os.environ.get("LOAD_ADAPTIVE_WINDOW", "2"))
+
+
+class AdaptiveConfig:
+    """Concurrency bounds and the targets the AIMD controller keeps each window within.
+
+    Every ``window`` seconds the in-flight limit grows by ``increase`` if
+    the window stayed within ``latency_target_ms`` (p95) and
+    ``max_error_rate``, and is multiplied by ``decrease`` otherwise.
+    """
+
+    open_loop = False
+
+    def __init__(self, duration=DURATION, initial=INITIAL_CONCURRENCY, minimum=1, maximum=MAX_CONCURRENCY,
+                 increase=1, decrease=0.5, latency_target_ms=LATENCY_TARGET_MS, max_error_rate=MAX_ERROR_RATE,
+                 window=WINDOW, timeout=REQUEST_TIMEOUT):
+        self.duration = duration
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target_ms = latency_target_ms
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.timeout = timeout
+
+    def as_dict(self):
+        return {
+            "mode": "adaptive",
+            "duration": self.duration,
+            "initial": self.initial,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "increase": self.increase,
+            "decrease": self.decrease,
+            "latency_target_ms": self.latency_target_ms,
+            "max_error_rate": self.max_error_rate,
+            "window": self.window,
+            "timeout": self.timeout,
+        }
+
+    def describe(self):
+        return f"adaptive concurrency {self.minimum}-{self.maximum} (AIMD)"
+
+
+class AimdController:
+    """Additive-increase / multiplicative-decrease limit on requests in flight.
+
+    Outcomes are collected per window; ``adjust`` closes the window and
+    moves the limit. A 429, 5xx or transport error, an error rate over
+    target or a p95 over target cuts the limit; a clean window in which
+    the limit was actually reached raises it. A 429 also pauses new
+    requests until its ``RateLimit-Reset`` (or ``Retry-After``).
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.limit = config.initial
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.history = []
+        self._changed = asyncio.Condition()
+        self._reset_window()
+
+    def _reset_window(self):
+        self.window_latency = HdrHistogram()
+        self.window_errors = 0
+        self.window_signals = set()
+        self.window_saturated = False
+
+    async def acquire(self):
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self.window_saturated = True
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+    async def release(self, outcome):
+        self.window_latency.record(outcome.latency_ms)
+        if outcome.error is not None or (outcome.status is not None and outcome.status >= 500):
+            self.window_errors += 1
+            self.window_signals.add("5xx" if outcome.error is None else outcome.error)
+        if is_rate_limited(outcome.status):
+            self.window_errors += 1
+            self.window_signals.add("429")
+            wait = retry_after(outcome.headers)
+            if wait:
+                self.paused_until = max(self.paused_until, time.monotonic() + wait)
+        async with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+    async def adjust(self, elapsed):
+        """Close the current window and apply the AIMD step; returns the history entry"""
+        count = self.window_latency.count
+        p95 = self.window_latency.value_at_percentile(95)
+        error_rate = self.window_errors / count if count else 0.0
+
+        reasons = sorted(self.window_signals)
+        if error_rate > self.config.max_error_rate and not reasons:
+            reasons.append(f"error rate {error_rate:.1%}")
+        if p95 is not None and p95 > self.config.latency_target_ms:
+            reasons.append(f"p95 {p95:.0f}ms")
+
+        limit = self.limit
+        if reasons:
+            limit = max(int(self.limit * self.config.decrease), self.config.minimum)
+        elif count and self.window_saturated:
+            limit = min(self.limit + self.config.increase, self.config.maximum)
+
+        entry = {
+            "t": round(elapsed, 3),
+            "limit": self.limit,
+            "requests": count,
+            "throughput": count / self.config.window,
+            "p95_ms": p95,
+            "error_rate": error_rate,
+            "backoff": reasons,
+            "next_limit": limit,
+        }
+        self.history.append(entry)
+        self._reset_window()
+        async with self._changed:
+            self.limit = limit
+            self._changed.notify_all()
+        return entry
+
+
+class AdaptiveReport(LoadReport):
+    """``LoadReport`` plus the controller's per-window history and the safe operating point it found"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.history = []
+
+    def safe_point(self):
+        """Clean window with the highest throughput: ``{"limit", "throughput", "p95_ms"}``, or None"""
+        clean = [entry for entry in self.history if not entry["backoff"] and entry["requests"]]
+        if not clean:
+            return None
+        best = max(clean, key=lambda entry: entry["throughput"])
+        return {"limit": best["limit"], "throughput": best["throughput"], "p95_ms": best["p95_ms"]}
+
+    def as_dict(self):
+        result = super().as_dict()
+        result["safe"] = self.safe_point()
+        result["history"] = self.history
+        return result
+
+    def format_text(self):
+        lines = [super().format_text(), "", "Concurrency history"]
+        for entry in self.history:
+            p95 = f"{entry['p95_ms']:.0f}ms" if entry["p95_ms"] is not None else "-"
+            action = f"backoff ({', '.join(entry['backoff'])})" if entry["backoff"] else ""
+            lines.append(
+                f"  {entry['t']:>7.1f}s  limit {entry['limit']:>4}  {entry['throughput']:>7.1f} req/s  "
+                f"p95 {p95:>8}  {action}"
+            )
+        safe = self.safe_point()
+        lines.append("")
+        if safe is None:
+            lines.append("No window stayed within the targets")
+        else:
+            lines.append(
+                f"Safe: {safe['throughput']:.1f} req/s at {safe['limit']} in flight (p95 {safe['p95_ms']:.0f}ms)"
+            )
+        return "\n".join(lines)
+
+
+class AdaptiveEngine(LoadEngine):
+    """Sends requests to ``routes`` (in turn) with as many in flight as ``AimdController`` allows.
+
+    Starting from ``config.initial`` requests in flight, the limit climbs
+    one step per clean window and halves as soon as the server answers 429
+    or 5xx or latency passes its target, so a shared environment such as
+    staging is never pushed far past the point where it starts to struggle.
+    The history of the limit is kept in the report, whose ``safe_point`` is
+    the highest throughput reached within the targets.
+    """
+
+    def __init__(self, base_url, routes, config=None, auth_cache=None):
+        super().__init__(base_url, routes, config or AdaptiveConfig(), auth_cache)
+        self.report = AdaptiveReport(self.config)
+
+    async def run_async(self):
+        cookies = self._sign_in()
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        controller = AimdController(self.config)
+
+        sessions = {}
+        in_flight = set()
+        self.report.started = time.monotonic()
+        deadline = self.report.started + self.config.duration
+        window = asyncio.ensure_future(self._control(controller, deadline))
+        try:
+            step = 0
+            while True:
+                await controller.acquire()
+                if time.monotonic() >= deadline:
+                    break
+                route = self.routes[step % len(self.routes)]
+                step += 1
+
+                identity = route.user["email"] if route.user is not None else None
+                if identity not in sessions:
+                    sessions[identity] = aiohttp.ClientSession(
+                        headers=HTTP_HEADERS, cookies=cookies.get(identity), timeout=timeout,
+                        connector=aiohttp.TCPConnector(limit=0),
+                    )
+                task = asyncio.ensure_future(self._send(controller, sessions[identity], route))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            self.report.finished = time.monotonic()
+        finally:
+            window.cancel()
+            for session in sessions.values():
+                await session.close()
+        self.report.history = controller.history
+        return self.report
+
+    async def _control(self, controller, deadline):
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.config.window)
+            await controller.adjust(time.monotonic() - self.report.started)
+
+    async def _send(self, controller, session, route):
+        await controller.release(await self._request(session, route))
@@ -0,0 +1,223 @@
+"""
+Capacity search - Step the open-loop rate up per route until latency or errors give way
+"""
+import os
+
+from .engine import REQUEST_TIMEOUT
+from .openloop import MAX_CONNECTIONS, OpenLoopConfig, OpenLoopEngine
+
+START_RATE = float(os.environ.get("LOAD_CAPACITY_START_RATE", "5"))
+STEP_RATE = float(os.environ.get("LOAD_CAPACITY_STEP_RATE", "5"))
+MAX_RATE = float(os.environ.get("LOAD_CAPACITY_MAX_RATE", "200"))
+STAGE_DURATION = float(os.environ.get("LOAD_CAPACITY_STAGE_DURATION", "15"))
+P99_TARGET_MS = float(os.environ.get("LOAD_CAPACITY_P99_MS", "2000"))
+MAX_ERROR_RATE = float(os.environ.get("LOAD_CAPACITY_MAX_ERROR_RATE", "0.01"))
+# A stage whose p99 grows past this multiple of the first stage's p99 is past the knee
+KNEE_FACTOR = float(os.environ.get("LOAD_CAPACITY_KNEE_FACTOR", "3"))
+# A stage that completes less than this share of the offered rate is saturated
+MIN_THROUGHPUT_RATIO = 0.9
+# Constant arrivals keep the offered load of a stage exact, so a throughput shortfall means saturation
+ARRIVAL = "constant"
+
+
+class CapacityConfig:
+    """Rate stages (requests/s) and the limits a stage must stay within to count as sustainable"""
+
+    def __init__(self, start_rate=START_RATE, step_rate=STEP_RATE, max_rate=MAX_RATE,
+                 stage_duration=STAGE_DURATION, p99_target_ms=P99_TARGET_MS, max_error_rate=MAX_ERROR_RATE,
+                 knee_factor=KNEE_FACTOR, arrival=ARRIVAL, max_connections=MAX_CONNECTIONS,
+                 timeout=REQUEST_TIMEOUT, seed=None):
+        self.start_rate = start_rate
+        self.step_rate = step_rate
+        self.max_rate = max_rate
+        self.stage_duration = stage_duration
+        self.p99_target_ms = p99_target_ms
+        self.max_error_rate = max_error_rate
+        self.knee_factor = knee_factor
+        self.arrival = arrival
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.seed = seed
+
+    def rates(self):
+        rate = self.start_rate
+        while rate <= self.max_rate:
+            yield rate
+            rate += self.step_rate
+
+    def stage_config(self, rate):
+        return OpenLoopConfig(rate=rate, duration=self.stage_duration, arrival=self.arrival,
+                              max_connections=self.max_connections, timeout=self.timeout, seed=self.seed)
+
+    def as_dict(self):
+        return {
+            "start_rate": self.start_rate,
+            "step_rate": self.step_rate,
+            "max_rate": self.max_rate,
+            "stage_duration": self.stage_duration,
+            "p99_target_ms": self.p99_target_ms,
+            "max_error_rate": self.max_error_rate,
+            "knee_factor": self.knee_factor,
+            "arrival": self.arrival,
+            "max_connections": self.max_connections,
+            "timeout": self.timeout,
+            "seed": self.seed,
+        }
+
+
+class Stage:
+    """Outcome of one route at one offered rate"""
+
+    def __init__(self, rate, stats, elapsed):
+        self.rate = rate
+        self.requests = stats.count if stats else 0
+        self.failures = stats.failures + stats.rate_limited if stats else 0
+        self.throughput = self.requests / elapsed if elapsed else 0.0
+        self.error_rate = self.failures / self.requests if self.requests else 1.0
+        self.p50 = stats.latency.value_at_percentile(50) if stats else None
+        self.p99 = stats.latency.value_at_percentile(99) if stats else None
+        self.reasons = []
+
+    @property
+    def sustainable(self):
+        return not self.reasons
+
+    def as_dict(self):
+        return {
+            "rate": self.rate,
+            "requests": self.requests,
+            "failures": self.failures,
+            "throughput": self.throughput,
+            "error_rate": self.error_rate,
+            "p50_ms": self.p50,
+            "p99_ms": self.p99,
+            "sustainable": self.sustainable,
+            "reasons": self.reasons,
+        }
+
+
+class RouteCapacity:
+    """Stages run against one route, up to and including the first one past the knee"""
+
+    def __init__(self, route):
+        self.route = route
+        self.stages = []
+
+    @property
+    def knee(self):
+        """First stage that was not sustainable, or None if every rate held"""
+        return next((stage for stage in self.stages if not stage.sustainable), None)
+
+    @property
+    def max_sustainable(self):
+        """Last sustainable stage before the knee"""
+        held = [stage for stage in self.stages if stage.sustainable]
+        return held[-1] if held else None
+
+    def as_dict(self):
+        best, knee = self.max_sustainable, self.knee
+        return {
+            "route": self.route.name,
+            "path": self.route.path,
+            "max_sustainable_rate": best.rate if best else None,
+            "max_sustainable_throughput": best.throughput if best else None,
+            "p99_at_max_ms": best.p99 if best else None,
+            "knee_rate": knee.rate if knee else None,
+            "knee_reasons": knee.reasons if knee else [],
+            "stages": [stage.as_dict() for stage in self.stages],
+        }
+
+
+class CapacityReport:
+    """Capacity of every searched route"""
+
+    def __init__(self, config):
+        self.config = config
+        self.routes = []
+
+    def as_dict(self):
+        return {
+            "mode": "capacity",
+            "config": self.config.as_dict(),
+            "routes": [capacity.as_dict() for capacity in self.routes],
+        }
+
+    def format_text(self):
+        """Per-route maximum sustainable throughput followed by each route's stages"""
+        lines = [
+            f"{'route':<36} {'max req/s':>10} {'p99':>7} {'knee':>7}  reason",
+        ]
+        for capacity in self.routes:
+            best, knee = capacity.max_sustainable, capacity.knee
+            lines.append(
+                f"{capacity.route.name[-36:]:<36} "
+                f"{best.throughput if best else 0:>10.1f} "
+                f"{best.p99 if best and best.p99 is not None else 0:>7.0f} "
+                f"{f'{knee.rate:g}' if knee else '-':>7}  "
+                f"{'; '.join(knee.reasons) if knee else f'held up to {self.config.max_rate:g} req/s'}"
+            )
+
+        for capacity in self.routes:
+            lines.append("")
+            lines.append(f"{capacity.route.name} stages")
+            for stage in capacity.stages:
+                p99 = f"{stage.p99:.0f}ms" if stage.p99 is not None else "-"
+                lines.append(
+                    f"  {stage.rate:>7g} req/s offered  {stage.throughput:>7.1f} done  p99 {p99:>8}  "
+                    f"errors {stage.error_rate:>6.1%}  {'ok' if stage.sustainable else 'KNEE'}"
+                )
+        return "\n".join(lines)
+
+
+class CapacitySearch:
+    """Finds the highest rate each route sustains.
+
+    Every route is searched on its own: open-loop stages of
+    ``config.stage_duration`` seconds start at ``start_rate`` and rise by
+    ``step_rate`` until a stage breaks one of the limits - p99 over
+    ``p99_target_ms``, error rate over ``max_error_rate``, p99 over
+    ``knee_factor`` times the first stage's p99, or completed throughput
+    below 90% of the offered rate. That stage is the knee; the throughput of
+    the stage before it is the route's maximum sustainable rate.
+    """
+
+    def __init__(self, base_url, routes, config=None, auth_cache=None):
+        self.base_url = base_url
+        self.routes = routes
+        self.config = config or CapacityConfig()
+        self.auth_cache = auth_cache
+        self.report = CapacityReport(self.config)
+
+    def run(self):
+        """Search every route in turn and return the ``CapacityReport``"""
+        for route in self.routes:
+            self.report.routes.append(self.search(route))
+        return self.report
+
+    def search(self, route):
+        capacity = RouteCapacity(route)
+        baseline_p99 = None
+        for rate in self.config.rates():
+            engine = OpenLoopEngine(self.base_url, [route], self.config.stage_config(rate), self.auth_cache)
+            report = engine.run()
+            stage = Stage(rate, report.routes.get(route.name), report.elapsed)
+            self._judge(stage, baseline_p99)
+            capacity.stages.append(stage)
+            if not stage.sustainable:
+                break
+            if baseline_p99 is None:
+                baseline_p99 = stage.p99
+        return capacity
+
+    def _judge(self, stage, baseline_p99):
+        if not stage.requests:
+            stage.reasons.append("no responses")
+            return
+        if stage.error_rate > self.config.max_error_rate:
+            stage.reasons.append(f"error rate {stage.error_rate:.1%} > {self.config.max_error_rate:.1%}")
+        if stage.p99 > self.config.p99_target_ms:
+            stage.reasons.append(f"p99 {stage.p99:.0f}ms > {self.config.p99_target_ms:.0f}ms")
+        if baseline_p99 and stage.p99 > baseline_p99 * self.config.knee_factor:
+            stage.reasons.append(f"p99 {stage.p99:.0f}ms > {self.config.knee_factor:g}x baseline {baseline_p99:.0f}ms")
+        if stage.throughput < stage.rate * MIN_THROUGHPUT_RATIO:
+            stage.reasons.append(f"completed {stage.throughput:.1f} of {stage.rate:g} req/s offered")
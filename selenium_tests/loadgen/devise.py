@@ -0,0 +1,45 @@
+"""
+Devise sign-in over aiohttp - The CSRF-protected login form, for virtual users
+"""
+import time
+
+from auth_session import LOGIN_FIELD, PASSWORD_FIELD, SIGN_IN_PATH, extract_csrf_token, is_sign_in_url
+
+
+class SignInResult:
+    """Outcome of one form sign-in: ``ok`` only if Devise let the user in"""
+
+    def __init__(self, ok, status=None, form_ms=None, submit_ms=None, error=None):
+        self.ok = ok
+        self.status = status
+        self.form_ms = form_ms
+        self.submit_ms = submit_ms
+        self.error = error
+
+
+async def sign_in(session, base_url, user):
+    """Sign ``user`` in through the Devise form; the session's cookie jar keeps the login.
+
+    Fetches the form for its CSRF token, then posts the credentials. Devise
+    answers a rejected login by rendering the form again, so the sign-in
+    only counts as successful when the response ends up off the sign-in page.
+    Transport errors propagate to the caller.
+    """
+    url = f"{base_url}{SIGN_IN_PATH}"
+    start = time.monotonic()
+    async with session.get(url) as response:
+        token = extract_csrf_token(await response.text(errors="replace"))
+    form_ms = (time.monotonic() - start) * 1000
+    if token is None:
+        return SignInResult(False, response.status, form_ms, error="no CSRF token")
+
+    start = time.monotonic()
+    async with session.post(url, data={
+        "authenticity_token": token,
+        LOGIN_FIELD: user["email"],
+        PASSWORD_FIELD: user["password"],
+    }) as response:
+        await response.read()
+        submit_ms = (time.monotonic() - start) * 1000
+        ok = response.status < 400 and not is_sign_in_url(str(response.url))
+        return SignInResult(ok, response.status, form_ms, submit_ms, error=None if ok else "rejected")
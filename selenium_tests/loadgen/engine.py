@@ -0,0 +1,173 @@
+"""
+Load engine - Closed-loop virtual users hitting application routes over asyncio
+"""
+import asyncio
+import os
+import time
+from collections import namedtuple
+
+import aiohttp
+
+from auth_session import is_sign_in_url
+from page_catalog import ADMIN_PAGES, AUTHENTICATED_PAGES, PUBLIC_PAGES
+
+from .stats import LoadReport
+
+VUS = int(os.environ.get("LOAD_VUS", "10"))
+RAMP_UP = float(os.environ.get("LOAD_RAMP_UP", "5"))
+DURATION = float(os.environ.get("LOAD_DURATION", "30"))
+THINK_TIME = float(os.environ.get("LOAD_THINK_TIME", "0"))
+REQUEST_TIMEOUT = float(os.environ.get("LOAD_REQUEST_TIMEOUT", "30"))
+
+HTTP_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es",
+}
+
+# What one request came back with; ``headers`` is None when it raised
+Outcome = namedtuple("Outcome", ["latency_ms", "status", "error", "headers"])
+
+
+class Route:
+    """One path to request, anonymously or as ``user``"""
+
+    def __init__(self, path, user=None, name=None, method="GET"):
+        self.path = path
+        self.user = user
+        self.method = method
+        self.name = name or (f"{method} {path}" if user is None else f"{method} {path} [{user['email']}]")
+
+
+def catalog_routes(catalogs, user=None, admin=None):
+    """Routes for the named page catalogs: "public", "authenticated" (as ``user``) and "admin" (as ``admin``)"""
+    routes = []
+    for catalog in catalogs:
+        if catalog == "public":
+            routes += [Route(path) for path in PUBLIC_PAGES]
+        elif catalog == "authenticated":
+            routes += [Route(path, user) for path in AUTHENTICATED_PAGES]
+        elif catalog == "admin":
+            routes += [Route(path, admin) for path in ADMIN_PAGES]
+        else:
+            raise ValueError(f"Unknown page catalog: {catalog}")
+    return routes
+
+
+class LoadConfig:
+    """Virtual users, ramp-up and duration of a run; times in seconds"""
+
+    open_loop = False
+
+    def __init__(self, vus=VUS, ramp_up=RAMP_UP, duration=DURATION, think_time=THINK_TIME,
+                 timeout=REQUEST_TIMEOUT):
+        self.vus = vus
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.think_time = think_time
+        self.timeout = timeout
+
+    def as_dict(self):
+        return {
+            "vus": self.vus,
+            "ramp_up": self.ramp_up,
+            "duration": self.duration,
+            "think_time": self.think_time,
+            "timeout": self.timeout,
+        }
+
+    def describe(self):
+        return f"{self.vus} virtual users (closed loop)"
+
+
+class LoadEngine:
+    """Runs ``config.vus`` virtual users against ``routes`` for ``config.duration`` seconds.
+
+    Virtual users start evenly spread over ``ramp_up`` and each loops over
+    the routes (starting at a different offset), sending the next request as
+    soon as the previous response body has been read, plus ``think_time``.
+    Every virtual user keeps one keep-alive connection pool per identity;
+    signed-in routes use the session cookies from ``auth_cache``, which
+    signs each user in once before the run starts.
+    """
+
+    def __init__(self, base_url, routes, config=None, auth_cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.routes = routes
+        self.config = config or LoadConfig()
+        self.auth_cache = auth_cache
+        self.report = LoadReport(self.config)
+
+    def run(self):
+        """Run the load test to completion and return its ``LoadReport``"""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        cookies = self._sign_in()
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+
+        self.report.started = time.monotonic()
+        deadline = self.report.started + self.config.duration
+        await asyncio.gather(*(
+            self._virtual_user(index, deadline, cookies, timeout) for index in range(self.config.vus)
+        ))
+        self.report.finished = time.monotonic()
+        return self.report
+
+    def _sign_in(self):
+        cookies = {}
+        for route in self.routes:
+            if route.user is None or route.user["email"] in cookies:
+                continue
+            if self.auth_cache is None:
+                raise ValueError(f"{route.name} needs a signed-in user but no auth_cache was given")
+            cookies[route.user["email"]] = {c.name: c.value for c in self.auth_cache.cookies(route.user)}
+        return cookies
+
+    async def _virtual_user(self, index, deadline, cookies, timeout):
+        if self.config.vus > 1:
+            await asyncio.sleep(self.config.ramp_up * index / self.config.vus)
+
+        sessions = {}
+        try:
+            step = index
+            while time.monotonic() < deadline:
+                route = self.routes[step % len(self.routes)]
+                step += 1
+
+                identity = route.user["email"] if route.user is not None else None
+                if identity not in sessions:
+                    sessions[identity] = aiohttp.ClientSession(
+                        headers=HTTP_HEADERS, cookies=cookies.get(identity), timeout=timeout,
+                    )
+                await self._request(sessions[identity], route)
+
+                if self.config.think_time:
+                    await asyncio.sleep(self.config.think_time)
+        finally:
+            for session in sessions.values():
+                await session.close()
+
+    async def _request(self, session, route, intended=None):
+        """Send one request and return its ``Outcome``.
+
+        Latency counts from ``intended`` (the scheduled send time) when given.
+        """
+        stats = self.report.route(route.name)
+        url = f"{self.base_url}{route.path}"
+        start = time.monotonic()
+        intended = start if intended is None else intended
+        try:
+            async with session.request(route.method, url) as response:
+                await response.read()
+                end = time.monotonic()
+                error = None
+                if route.user is not None and is_sign_in_url(str(response.url)):
+                    error = "redirected to sign in"
+                latency = (end - intended) * 1000
+                stats.record(latency, status=response.status, error=error, service_ms=(end - start) * 1000)
+                return Outcome(latency, response.status, error, response.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            end = time.monotonic()
+            latency = (end - intended) * 1000
+            stats.record(latency, error=type(e).__name__, service_ms=(end - start) * 1000)
+            return Outcome(latency, None, type(e).__name__, None)
@@ -0,0 +1,93 @@
+"""
+HDR histogram - Log-linear latency histogram with bounded relative error
+"""
+import math
+
+# Percentiles of the classic HdrHistogram percentile distribution output
+DISTRIBUTION = (50, 75, 90, 95, 99, 99.9, 99.99, 99.999, 100)
+
+
+class HdrHistogram:
+    """Latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds into log-linear buckets: every
+    power-of-two range is split into the same number of linear sub-buckets,
+    so any recorded value is reproduced within ``10 ** -significant_figures``
+    of its true value however large it is, while memory stays proportional
+    to the number of distinct buckets hit. Percentiles are exact over the
+    recorded counts, which keeps p99.9 and p99.99 meaningful where a fixed
+    bucket histogram would lump the whole tail together. Inputs and outputs
+    are milliseconds.
+    """
+
+    def __init__(self, significant_figures=3):
+        self.significant_figures = significant_figures
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._sub_bucket_half = self._sub_bucket_count >> 1
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return self._sub_bucket_count + (shift - 1) * self._sub_bucket_half + (value >> shift) - self._sub_bucket_half
+
+    def _highest_equivalent(self, index):
+        """Largest value that falls in bucket ``index``"""
+        if index < self._sub_bucket_count:
+            return index
+        shift = (index - self._sub_bucket_count) // self._sub_bucket_half + 1
+        sub = (index - self._sub_bucket_count) % self._sub_bucket_half + self._sub_bucket_half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_ms, count=1):
+        value = max(int(round(value_ms * 1000)), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count / 1000 if self.count else None
+
+    def value_at_percentile(self, p):
+        """Value (ms) at or below which ``p`` percent (0-100) of the recordings fall"""
+        if not self.count:
+            return None
+        target = max(math.ceil(self.count * p / 100), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) / 1000
+        return self.max / 1000
+
+    def distribution(self, points=DISTRIBUTION):
+        """``{percentile: value_ms}`` for the given percentiles"""
+        return {p: self.value_at_percentile(p) for p in points}
+
+    def as_dict(self, points=DISTRIBUTION):
+        return {
+            "count": self.count,
+            "min": self.min / 1000 if self.min is not None else None,
+            "mean": self.mean,
+            "max": self.max / 1000 if self.max is not None else None,
+            "percentiles": {f"p{p:g}": v for p, v in self.distribution(points).items()},
+        }
@@ -0,0 +1,219 @@
+"""
+Login benchmark - Devise sign-in throughput at increasing concurrency
+"""
+import asyncio
+import os
+import time
+from collections import Counter
+
+import aiohttp
+
+from rate_limit import is_rate_limited
+
+from .devise import sign_in
+from .engine import HTTP_HEADERS, REQUEST_TIMEOUT
+from .hdr import HdrHistogram
+
+CONCURRENCY_LEVELS = tuple(int(n) for n in os.environ.get("LOAD_LOGIN_CONCURRENCY", "1,2,4,8,16,32").split(","))
+STAGE_DURATION = float(os.environ.get("LOAD_LOGIN_STAGE_DURATION", "20"))
+# Share of attempts made with an unknown account, to measure rejected logins
+FAILED_SHARE = float(os.environ.get("LOAD_LOGIN_FAILED_SHARE", "0.2"))
+# A level within this share of the peak throughput already runs at capacity
+SATURATION_RATIO = 0.9
+
+
+class LoginConfig:
+    """Concurrency levels, seconds per level and the share of deliberately failed logins"""
+
+    open_loop = False
+
+    def __init__(self, levels=CONCURRENCY_LEVELS, stage_duration=STAGE_DURATION, failed_share=FAILED_SHARE,
+                 timeout=REQUEST_TIMEOUT):
+        self.levels = tuple(levels)
+        self.stage_duration = stage_duration
+        self.failed_share = failed_share
+        self.timeout = timeout
+
+    def as_dict(self):
+        return {
+            "levels": list(self.levels),
+            "stage_duration": self.stage_duration,
+            "failed_share": self.failed_share,
+            "timeout": self.timeout,
+        }
+
+
+class LoginStage:
+    """Sign-ins at one concurrency level.
+
+    ``succeeded`` are valid logins Devise accepted and ``rejected`` invalid
+    ones it turned down, both working as intended; everything else - a valid
+    login refused, an invalid one let in, a 5xx, a 429 or a transport
+    error - is an ``error``. ``latency`` is the credentials POST alone,
+    where the password hashing happens.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.latency = HdrHistogram()
+        self.form_latency = HdrHistogram()
+        self.succeeded = 0
+        self.rejected = 0
+        self.errors = Counter()
+        self.elapsed = 0.0
+
+    @property
+    def attempts(self):
+        return self.succeeded + self.rejected + sum(self.errors.values())
+
+    def rate(self, count):
+        return count / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def throughput(self):
+        """Logins answered as intended per second, accepted or rejected"""
+        return self.rate(self.succeeded + self.rejected)
+
+    def as_dict(self):
+        return {
+            "concurrency": self.concurrency,
+            "attempts": self.attempts,
+            "succeeded_per_s": self.rate(self.succeeded),
+            "rejected_per_s": self.rate(self.rejected),
+            "throughput": self.throughput,
+            "errors": dict(self.errors),
+            "latency_ms": self.latency.as_dict(),
+            "form_latency_ms": self.form_latency.as_dict(),
+        }
+
+
+class LoginReport:
+    """Every concurrency level of a login benchmark and where throughput stopped growing"""
+
+    def __init__(self, config):
+        self.config = config
+        self.stages = []
+
+    def peak(self):
+        return max(self.stages, key=lambda stage: stage.throughput, default=None)
+
+    def saturation(self):
+        """Lowest level already within 90% of the peak throughput.
+
+        Past it, more concurrency only queues requests behind busy Puma workers.
+        """
+        peak = self.peak()
+        if peak is None or not peak.throughput:
+            return None
+        return next(stage for stage in self.stages if stage.throughput >= peak.throughput * SATURATION_RATIO)
+
+    def as_dict(self):
+        peak, saturation = self.peak(), self.saturation()
+        return {
+            "mode": "login",
+            "config": self.config.as_dict(),
+            "peak_throughput": peak.throughput if peak else None,
+            "saturation_concurrency": saturation.concurrency if saturation else None,
+            "stages": [stage.as_dict() for stage in self.stages],
+        }
+
+    def format_text(self):
+        lines = [f"{'in flight':>9} {'ok/s':>7} {'fail/s':>7} {'errors':>7} {'p50':>7} {'p95':>7} {'p99':>7}"]
+        for stage in self.stages:
+            pct = stage.latency.distribution((50, 95, 99))
+            cells = " ".join(f"{pct[p]:>7.0f}" if pct[p] is not None else f"{'-':>7}" for p in (50, 95, 99))
+            lines.append(
+                f"{stage.concurrency:>9} {stage.rate(stage.succeeded):>7.1f} {stage.rate(stage.rejected):>7.1f} "
+                f"{sum(stage.errors.values()):>7} {cells}"
+            )
+        for stage in self.stages:
+            for reason, n in stage.errors.most_common():
+                lines.append(f"  {stage.concurrency} in flight: {reason} ({n})")
+
+        saturation = self.saturation()
+        lines.append("")
+        if saturation is None:
+            lines.append("No login was answered as intended")
+        else:
+            lines.append(
+                f"Peak {self.peak().throughput:.1f} logins/s; saturated from {saturation.concurrency} in flight "
+                f"(p95 {saturation.latency.value_at_percentile(95):.0f}ms)"
+            )
+        return "\n".join(lines)
+
+
+class LoginBenchmark:
+    """Signs in through the Devise form with a growing number of concurrent workers.
+
+    Each level of ``config.levels`` runs that many workers for
+    ``stage_duration`` seconds. A worker repeatedly clears its cookie jar,
+    fetches the form for a CSRF token and posts credentials: a valid
+    ``users`` account (round-robin), or for ``failed_share`` of attempts an
+    unknown email, so lockable real accounts are never locked. Throughput
+    that stops growing while latency climbs marks where the application
+    server's workers are saturated by password hashing.
+    """
+
+    def __init__(self, base_url, users, config=None):
+        if not users:
+            raise ValueError("The login benchmark needs at least one valid account")
+        self.base_url = base_url.rstrip("/")
+        self.users = list(users)
+        self.config = config or LoginConfig()
+        self.report = LoginReport(self.config)
+
+    def run(self):
+        """Run every concurrency level in turn and return the ``LoginReport``"""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        for concurrency in self.config.levels:
+            stage = LoginStage(concurrency)
+            start = time.monotonic()
+            deadline = start + self.config.stage_duration
+            await asyncio.gather(*(self._worker(stage, index, deadline, timeout) for index in range(concurrency)))
+            stage.elapsed = time.monotonic() - start
+            self.report.stages.append(stage)
+        return self.report
+
+    async def _worker(self, stage, index, deadline, timeout):
+        attempt = 0
+        async with aiohttp.ClientSession(
+            headers=HTTP_HEADERS, timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True),
+        ) as session:
+            while time.monotonic() < deadline:
+                # Every (1 / failed_share)-th attempt uses an unknown account
+                valid = int((attempt + 1) * self.config.failed_share) == int(attempt * self.config.failed_share)
+                if valid:
+                    user = self.users[(index + attempt) % len(self.users)]
+                else:
+                    user = {"email": f"nobody+{stage.concurrency}-{index}-{attempt}@example.com",
+                            "password": "wrong-password"}
+                attempt += 1
+                session.cookie_jar.clear()
+                await self._attempt(session, stage, user, valid)
+
+    async def _attempt(self, session, stage, user, valid):
+        try:
+            result = await sign_in(session, self.base_url, user)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stage.errors[type(e).__name__] += 1
+            return
+
+        stage.form_latency.record(result.form_ms)
+        if result.submit_ms is None:
+            stage.errors[result.error] += 1
+            return
+        stage.latency.record(result.submit_ms)
+        if is_rate_limited(result.status):
+            stage.errors["rate limited (429)"] += 1
+        elif result.status >= 500:
+            stage.errors[f"status {result.status}"] += 1
+        elif result.ok == valid:
+            if valid:
+                stage.succeeded += 1
+            else:
+                stage.rejected += 1
+        else:
+            stage.errors["valid login refused" if valid else "invalid login accepted"] += 1
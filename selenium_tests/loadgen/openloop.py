@@ -0,0 +1,127 @@
+"""
+Open-loop engine - Requests sent on a fixed arrival schedule, independent of responses
+"""
+import asyncio
+import os
+import random
+import time
+
+import aiohttp
+
+from .engine import DURATION, HTTP_HEADERS, REQUEST_TIMEOUT, LoadEngine
+
+RATE = float(os.environ.get("LOAD_RATE", "20"))
+ARRIVAL = os.environ.get("LOAD_ARRIVAL", "poisson")
+MAX_CONNECTIONS = int(os.environ.get("LOAD_MAX_CONNECTIONS", "100"))
+
+ARRIVALS = ("constant", "poisson")
+
+
+def arrival_times(rate, duration, arrival="poisson", rng=None):
+    """Offsets (seconds from the start) at which requests are due.
+
+    ``constant`` spaces requests exactly ``1 / rate`` apart; ``poisson``
+    draws exponential gaps with the same mean, giving the bursts real
+    independent users produce.
+    """
+    if arrival not in ARRIVALS:
+        raise ValueError(f"Unknown arrival process: {arrival} (expected one of {', '.join(ARRIVALS)})")
+    rng = rng or random.Random()
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate) if arrival == "poisson" else 1 / rate
+        if offset >= duration:
+            return
+        yield offset
+
+
+class OpenLoopConfig:
+    """Arrival rate (requests/s), arrival process and duration of an open-loop run.
+
+    ``max_connections`` caps the requests in flight; requests due beyond it
+    wait for a free connection, with the wait counted in their latency.
+    """
+
+    open_loop = True
+
+    def __init__(self, rate=RATE, duration=DURATION, arrival=ARRIVAL, max_connections=MAX_CONNECTIONS,
+                 timeout=REQUEST_TIMEOUT, seed=None):
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process: {arrival} (expected one of {', '.join(ARRIVALS)})")
+        self.rate = rate
+        self.duration = duration
+        self.arrival = arrival
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.seed = seed
+
+    def as_dict(self):
+        return {
+            "mode": "open",
+            "rate": self.rate,
+            "arrival": self.arrival,
+            "duration": self.duration,
+            "max_connections": self.max_connections,
+            "timeout": self.timeout,
+            "seed": self.seed,
+        }
+
+    def describe(self):
+        return f"{self.rate:g} req/s {self.arrival} arrivals (open loop)"
+
+
+class OpenLoopEngine(LoadEngine):
+    """Sends requests to ``routes`` (in turn) at the times ``arrival_times`` dictates.
+
+    Sending never waits for earlier responses, so a stalled server faces a
+    growing queue instead of a politely slower client. Each request's
+    latency is measured from its scheduled send time, not from when it
+    actually left: if the scheduler, the connection cap
+    (``max_connections``) or the server falls behind, the
+    delay shows up in the percentiles as users would experience it
+    (coordinated-omission correction). The uncorrected send-to-response
+    time is kept alongside as ``service``.
+    """
+
+    def __init__(self, base_url, routes, config=None, auth_cache=None):
+        super().__init__(base_url, routes, config or OpenLoopConfig(), auth_cache)
+
+    async def run_async(self):
+        cookies = self._sign_in()
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        rng = random.Random(self.config.seed)
+
+        slots = asyncio.Semaphore(self.config.max_connections)
+        sessions = {}
+        in_flight = set()
+        try:
+            self.report.started = time.monotonic()
+            for step, offset in enumerate(arrival_times(self.config.rate, self.config.duration,
+                                                        self.config.arrival, rng)):
+                intended = self.report.started + offset
+                delay = intended - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                route = self.routes[step % len(self.routes)]
+                identity = route.user["email"] if route.user is not None else None
+                if identity not in sessions:
+                    sessions[identity] = aiohttp.ClientSession(
+                        headers=HTTP_HEADERS, cookies=cookies.get(identity), timeout=timeout,
+                        connector=aiohttp.TCPConnector(limit=0),
+                    )
+                task = asyncio.ensure_future(self._send(slots, sessions[identity], route, intended))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            self.report.finished = time.monotonic()
+        finally:
+            for session in sessions.values():
+                await session.close()
+        return self.report
+
+    async def _send(self, slots, session, route, intended):
+        async with slots:
+            await self._request(session, route, intended)
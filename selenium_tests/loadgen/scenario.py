@@ -0,0 +1,316 @@
+"""
+Scenarios - Declarative multi-step user journeys run by many concurrent virtual users
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from collections import Counter
+
+import aiohttp
+
+from auth_session import extract_csrf_token, is_sign_in_url
+
+from .engine import DURATION, HTTP_HEADERS, RAMP_UP, REQUEST_TIMEOUT, VUS, LoadConfig
+from .stats import LoadReport
+
+SCENARIOS_FILE = os.environ.get(
+    "LOAD_SCENARIOS_FILE", os.path.join(os.path.dirname(os.path.dirname(__file__)), "load_scenarios.json")
+)
+
+# Named extractors a step's ``extract`` can refer to
+EXTRACTORS = {
+    "csrf_token": extract_csrf_token,
+}
+
+
+class ScenarioError(ValueError):
+    """Raised when a scenario file is malformed"""
+
+
+def _think_time(value):
+    """``(low, high)`` seconds from a number or a ``[low, high]`` pair"""
+    if isinstance(value, (int, float)):
+        return (float(value), float(value))
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return (float(value[0]), float(value[1]))
+    raise ScenarioError(f"think_time must be seconds or [min, max], got {value!r}")
+
+
+def _extractor(name, spec):
+    if isinstance(spec, str):
+        if spec not in EXTRACTORS:
+            raise ScenarioError(f"Unknown extractor for {name}: {spec} (expected one of {', '.join(EXTRACTORS)})")
+        return EXTRACTORS[spec]
+    if isinstance(spec, dict) and "regex" in spec:
+        pattern = re.compile(spec["regex"])
+
+        def extract(body):
+            match = pattern.search(body)
+            if match is None:
+                return None
+            return match.group(1) if pattern.groups else match.group(0)
+        return extract
+    raise ScenarioError(f"Extractor for {name} must be a name or {{\"regex\": ...}}, got {spec!r}")
+
+
+class Step:
+    """One request of a scenario.
+
+    ``path`` and ``form`` values are templates: ``{name}`` is replaced with
+    a variable extracted by an earlier step or with the virtual user's
+    ``email`` / ``password``. A step fails on a transport error, a status
+    of 400 or more (or one outside ``expect.status``), a redirect to the
+    sign-in page, a final URL containing ``expect.url_excludes`` or a
+    missing extracted value.
+    """
+
+    def __init__(self, name, path, method="GET", form=None, extract=None, expect=None, think_time=None):
+        self.name = name
+        self.path = path
+        self.method = method.upper()
+        self.form = form
+        self.extract = {var: _extractor(var, spec) for var, spec in (extract or {}).items()}
+        expect = expect or {}
+        status = expect.get("status")
+        self.expect_status = {status} if isinstance(status, int) else set(status) if status else None
+        self.url_excludes = expect.get("url_excludes")
+        self.think_time = _think_time(think_time) if think_time is not None else None
+
+    @classmethod
+    def from_dict(cls, entry):
+        try:
+            return cls(
+                entry["name"], entry["path"], entry.get("method", "GET"), entry.get("form"),
+                entry.get("extract"), entry.get("expect"), entry.get("think_time"),
+            )
+        except KeyError as e:
+            raise ScenarioError(f"Scenario step is missing {e}: {entry!r}") from None
+
+    def check(self, status, url):
+        """Why a response fails this step, or None"""
+        if self.expect_status is not None and status not in self.expect_status:
+            return f"status {status}"
+        if self.expect_status is None and status >= 400:
+            return f"status {status}"
+        if is_sign_in_url(url) and not is_sign_in_url(self.path):
+            return "redirected to sign in"
+        if self.url_excludes and self.url_excludes in url:
+            return f"ended on {self.url_excludes}"
+        return None
+
+
+class Scenario:
+    """A named journey: ordered ``steps``, the think time between them and its share (``weight``) of users"""
+
+    def __init__(self, name, steps, weight=1, think_time=0):
+        if not steps:
+            raise ScenarioError(f"Scenario {name} has no steps")
+        self.name = name
+        self.steps = steps
+        self.weight = weight
+        self.think_time = _think_time(think_time)
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(
+            entry["name"], [Step.from_dict(step) for step in entry.get("steps", [])],
+            entry.get("weight", 1), entry.get("think_time", 0),
+        )
+
+    @property
+    def needs_user(self):
+        """Whether any step refers to the virtual user's ``{email}`` or ``{password}``"""
+        templates = [step.path for step in self.steps]
+        templates += [value for step in self.steps for value in (step.form or {}).values()]
+        return any("{email}" in template or "{password}" in template for template in templates)
+
+    def pause(self, step):
+        low, high = step.think_time or self.think_time
+        return random.uniform(low, high)
+
+
+def load_scenarios(path=SCENARIOS_FILE, names=None):
+    """Scenarios of a scenario file, optionally only those in ``names``"""
+    with open(path) as f:
+        config = json.load(f)
+    scenarios = [Scenario.from_dict(entry) for entry in config.get("scenarios", [])]
+    if names:
+        unknown = set(names) - {scenario.name for scenario in scenarios}
+        if unknown:
+            raise ScenarioError(f"Unknown scenarios in {path}: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in names]
+    return scenarios
+
+
+class ScenarioConfig(LoadConfig):
+    """Virtual users, ramp-up and duration of a scenario run; ``iterations`` caps journeys per user"""
+
+    def __init__(self, vus=VUS, ramp_up=RAMP_UP, duration=DURATION, iterations=None, timeout=REQUEST_TIMEOUT):
+        super().__init__(vus=vus, ramp_up=ramp_up, duration=duration, timeout=timeout)
+        self.iterations = iterations
+
+    def as_dict(self):
+        result = super().as_dict()
+        del result["think_time"]
+        result["iterations"] = self.iterations
+        return result
+
+    def describe(self):
+        return f"{self.vus} virtual users (scenarios)"
+
+
+class ScenarioReport(LoadReport):
+    """``LoadReport`` with one route per ``scenario/step`` plus each scenario's funnel"""
+
+    def __init__(self, config, scenarios):
+        super().__init__(config)
+        self.scenarios = scenarios
+        self.started_journeys = Counter()
+        self.reached = Counter()
+        self.drop_reasons = {scenario.name: Counter() for scenario in scenarios}
+
+    def funnel(self, scenario):
+        """``[(step name, journeys that completed it, share of started journeys)]``"""
+        started = self.started_journeys[scenario.name]
+        return [
+            (step.name, self.reached[(scenario.name, step.name)],
+             self.reached[(scenario.name, step.name)] / started if started else 0.0)
+            for step in scenario.steps
+        ]
+
+    def completion_rate(self, scenario):
+        return self.funnel(scenario)[-1][2]
+
+    def as_dict(self):
+        result = super().as_dict()
+        result["funnels"] = [
+            {
+                "scenario": scenario.name,
+                "started": self.started_journeys[scenario.name],
+                "completion_rate": self.completion_rate(scenario),
+                "steps": [{"step": name, "completed": n, "rate": rate} for name, n, rate in self.funnel(scenario)],
+                "drop_reasons": dict(self.drop_reasons[scenario.name]),
+            }
+            for scenario in self.scenarios
+        ]
+        return result
+
+    def format_text(self):
+        lines = [super().format_text()]
+        for scenario in self.scenarios:
+            lines.append("")
+            lines.append(f"{scenario.name} funnel ({self.started_journeys[scenario.name]} journeys started)")
+            for name, completed, rate in self.funnel(scenario):
+                lines.append(f"  {name:<24} {completed:>7} {rate:>7.1%}")
+            for reason, n in self.drop_reasons[scenario.name].most_common():
+                lines.append(f"  dropped: {reason} ({n})")
+        return "\n".join(lines)
+
+
+class ScenarioRunner:
+    """Runs ``config.vus`` virtual users, each repeating weighted-random journeys from ``scenarios``.
+
+    Every virtual user has its own cookie jar, so sign-in steps create real
+    per-user sessions, and walks its journey step by step with the
+    scenario's think time between steps. A failed step ends the journey;
+    the report's funnel shows how many journeys got through each step.
+    Journeys that use ``{email}`` / ``{password}`` lease one of ``users``
+    (``{"email", "password"}`` dicts, e.g. a ``UserPool``'s) for their whole
+    length, so no two journeys ever run as the same account at once; with
+    fewer users than virtual users the rest wait for an account to be free.
+    """
+
+    def __init__(self, base_url, scenarios, config=None, users=None):
+        self.base_url = base_url.rstrip("/")
+        self.scenarios = scenarios
+        self.config = config or ScenarioConfig()
+        self.users = list(users or [])
+        self.report = ScenarioReport(self.config, scenarios)
+
+    def run(self):
+        """Run the scenarios to completion and return the ``ScenarioReport``"""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        self.report.started = time.monotonic()
+        deadline = self.report.started + self.config.duration
+        free_users = asyncio.Queue()
+        for user in self.users:
+            free_users.put_nowait(user)
+        await asyncio.gather(*(
+            self._virtual_user(index, deadline, timeout, free_users) for index in range(self.config.vus)
+        ))
+        self.report.finished = time.monotonic()
+        return self.report
+
+    async def _virtual_user(self, index, deadline, timeout, free_users):
+        if self.config.vus > 1:
+            await asyncio.sleep(self.config.ramp_up * index / self.config.vus)
+
+        weights = [scenario.weight for scenario in self.scenarios]
+        async with aiohttp.ClientSession(
+            headers=HTTP_HEADERS, timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True),
+        ) as session:
+            journeys = 0
+            while time.monotonic() < deadline:
+                if self.config.iterations is not None and journeys >= self.config.iterations:
+                    break
+                scenario = random.choices(self.scenarios, weights)[0]
+                if scenario.needs_user and self.users:
+                    user = await free_users.get()
+                    if time.monotonic() >= deadline:
+                        free_users.put_nowait(user)
+                        break
+                    try:
+                        await self._journey(session, scenario, user)
+                    finally:
+                        free_users.put_nowait(user)
+                else:
+                    await self._journey(session, scenario, {})
+                session.cookie_jar.clear()
+                journeys += 1
+
+    async def _journey(self, session, scenario, user):
+        """Walk one journey to its end or first failed step; a journey started before the deadline is finished"""
+        self.report.started_journeys[scenario.name] += 1
+        variables = {"email": user.get("email", ""), "password": user.get("password", "")}
+        for position, step in enumerate(scenario.steps):
+            failure = await self._step(session, scenario, step, variables)
+            if failure is not None:
+                self.report.drop_reasons[scenario.name][f"{step.name}: {failure}"] += 1
+                return
+            self.report.reached[(scenario.name, step.name)] += 1
+            if position < len(scenario.steps) - 1:
+                await asyncio.sleep(scenario.pause(step))
+
+    async def _step(self, session, scenario, step, variables):
+        """Send one step, record its latency under ``scenario/step`` and return why it failed, or None"""
+        stats = self.report.route(f"{scenario.name}/{step.name}")
+        try:
+            url = f"{self.base_url}{step.path.format_map(variables)}"
+            data = {key: value.format_map(variables) for key, value in step.form.items()} if step.form else None
+        except KeyError as e:
+            stats.record(0, error="missing variable")
+            return f"missing variable {e}"
+
+        start = time.monotonic()
+        try:
+            async with session.request(step.method, url, data=data) as response:
+                body = await response.text(errors="replace")
+                latency = (time.monotonic() - start) * 1000
+                failure = step.check(response.status, str(response.url))
+                if failure is None:
+                    for var, extract in step.extract.items():
+                        variables[var] = extract(body)
+                        if variables[var] is None:
+                            failure = f"nothing to extract for {var}"
+                # 5xx already count as failures through their status
+                stats.record(latency, status=response.status, error=failure if response.status < 500 else None)
+                return failure
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stats.record((time.monotonic() - start) * 1000, error=type(e).__name__)
+            return type(e).__name__
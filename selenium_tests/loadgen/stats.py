@@ -0,0 +1,165 @@
+"""
+Load statistics - Per-route counters, latency percentiles and histograms
+"""
+import bisect
+import json
+from collections import Counter
+
+from .hdr import HdrHistogram
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Percentiles shown per route
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class RouteStats:
+    """Outcomes of every request sent to one route.
+
+    ``latency`` holds what a user saw: in open-loop runs it is measured
+    from the time the request was scheduled to be sent, so time spent
+    queued behind a stalled server counts. ``service`` holds the time from
+    the actual send to the response, which is all a closed-loop run sees.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.latency = HdrHistogram()
+        self.service = HdrHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    @property
+    def count(self):
+        return self.latency.count
+
+    @property
+    def failures(self):
+        """Requests that raised, or answered with a 5xx"""
+        return sum(self.errors.values()) + sum(n for status, n in self.statuses.items() if status >= 500)
+
+    @property
+    def rate_limited(self):
+        """Requests the application's rate limiter turned away (429)"""
+        return self.statuses[429]
+
+    def record(self, latency_ms, status=None, error=None, service_ms=None):
+        self.latency.record(latency_ms)
+        self.service.record(latency_ms if service_ms is None else service_ms)
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, latency_ms)] += 1
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+    def percentiles(self, points=PERCENTILES):
+        return self.latency.distribution(points)
+
+    def histogram(self):
+        """``[(label, count)]`` for every latency bucket"""
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"]
+        return list(zip(labels, self.buckets))
+
+    def as_dict(self, elapsed):
+        return {
+            "route": self.name,
+            "requests": self.count,
+            "throughput": self.count / elapsed if elapsed else 0.0,
+            "failures": self.failures,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency_ms": self.latency.as_dict(),
+            "service_ms": self.service.as_dict(),
+            "histogram": dict(self.histogram()),
+        }
+
+
+class LoadReport:
+    """Per-route statistics of one load run"""
+
+    def __init__(self, config):
+        self.config = config
+        self.routes = {}
+        self.started = None
+        self.finished = None
+
+    @property
+    def elapsed(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def route(self, name):
+        if name not in self.routes:
+            self.routes[name] = RouteStats(name)
+        return self.routes[name]
+
+    def total_requests(self):
+        return sum(stats.count for stats in self.routes.values())
+
+    def as_dict(self):
+        return {
+            "config": self.config.as_dict(),
+            "elapsed": self.elapsed,
+            "requests": self.total_requests(),
+            "throughput": self.total_requests() / self.elapsed if self.elapsed else 0.0,
+            "routes": [stats.as_dict(self.elapsed) for stats in self.routes.values()],
+        }
+
+    def format_text(self):
+        """Human-readable per-route table followed by each route's latency histogram"""
+        columns = [f"p{p:g}" for p in PERCENTILES]
+        if self.config.open_loop:
+            columns.append("svc p99")
+        lines = [
+            f"{self.total_requests()} requests in {self.elapsed:.1f}s "
+            f"({self.total_requests() / self.elapsed if self.elapsed else 0:.1f} req/s), {self.config.describe()}",
+            "",
+            f"{'route':<36} {'reqs':>7} {'req/s':>7} {'fail':>5} " + " ".join(f"{c:>7}" for c in columns),
+        ]
+        for stats in self.routes.values():
+            values = list(stats.percentiles().values())
+            if self.config.open_loop:
+                values.append(stats.service.value_at_percentile(99))
+            cells = " ".join(f"{v:>7.0f}" if v is not None else f"{'-':>7}" for v in values)
+            lines.append(
+                f"{stats.name[-36:]:<36} {stats.count:>7} {stats.count / self.elapsed if self.elapsed else 0:>7.1f} "
+                f"{stats.failures:>5} {cells}"
+            )
+
+        for stats in self.routes.values():
+            if not stats.count:
+                continue
+            lines.append("")
+            lines.append(f"{stats.name} latency histogram")
+            peak = max(stats.buckets)
+            for label, count in stats.histogram():
+                bar = "#" * round(40 * count / peak) if peak else ""
+                lines.append(f"  {label:>10} {count:>7} {bar}")
+        return "\n".join(lines)
+
+
+class LoadResults:
+    """Every load report of a pytest session, with its text table, written out at the end of the session"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, label, report):
+        self.records.append({
+            "test": label,
+            "report": type(report).__name__,
+            "text": report.format_text(),
+            **report.as_dict(),
+        })
+
+    def merge(self, path):
+        """Fold in the records another process wrote to ``path``"""
+        with open(path) as f:
+            self.records.extend(json.load(f))
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.records, f, indent=2)
@@ -0,0 +1,205 @@
+"""
+Vote flow benchmark - Election-day token issuance and checks by many signed-in users
+"""
+import asyncio
+import os
+import time
+from collections import Counter, defaultdict
+
+import aiohttp
+
+from .devise import sign_in
+from .engine import DURATION, HTTP_HEADERS, RAMP_UP, REQUEST_TIMEOUT, THINK_TIME, VUS, LoadConfig
+from .stats import LoadReport
+
+ELECTION_ID = os.environ.get("LOAD_ELECTION_ID")
+COUNTER_TOKEN = os.environ.get("LOAD_ELECTION_COUNTER_TOKEN")
+
+
+def parse_vote_token(body):
+    """``(hmac, message)`` from a create_token answer ``<hmac>/<voter_id>:AuthEvent:<election>:vote:<ts>``, or None"""
+    signature, sep, message = body.strip().partition("/")
+    if not sep or ":AuthEvent:" not in message:
+        return None
+    return signature, message
+
+
+class VoteConfig(LoadConfig):
+    """Election, virtual users and duration of a vote flow run.
+
+    ``check`` also loads the vote check page after every token, and
+    ``counter_token`` polls the public votes counter ``/votos/:election_id/:token``.
+    """
+
+    def __init__(self, election_id=ELECTION_ID, vus=VUS, ramp_up=RAMP_UP, duration=DURATION, think_time=THINK_TIME,
+                 check=True, counter_token=COUNTER_TOKEN, locale="es", timeout=REQUEST_TIMEOUT):
+        if not election_id:
+            raise ValueError("The vote flow benchmark needs an election id (LOAD_ELECTION_ID)")
+        super().__init__(vus=vus, ramp_up=ramp_up, duration=duration, think_time=think_time, timeout=timeout)
+        self.election_id = election_id
+        self.check = check
+        self.counter_token = counter_token
+        self.locale = locale
+
+    def as_dict(self):
+        result = super().as_dict()
+        result.update({"election_id": self.election_id, "check": self.check,
+                       "counter": self.counter_token is not None, "locale": self.locale})
+        return result
+
+    def describe(self):
+        return f"{self.vus} signed-in voters on election {self.election_id}"
+
+
+class VoteReport(LoadReport):
+    """``LoadReport`` plus token issuance counts and voter ids handed to more than one account"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.tokens = 0
+        self.rejected = Counter()
+        self.sign_in_failures = Counter()
+        self.voters = defaultdict(set)
+
+    def duplicates(self):
+        """``{voter_id: accounts}`` for voter ids issued to several accounts"""
+        return {voter: emails for voter, emails in self.voters.items() if len(emails) > 1}
+
+    def token_requests(self):
+        stats = self.routes.get("create_token")
+        return stats.count if stats else 0
+
+    def token_throughput(self):
+        return self.tokens / self.elapsed if self.elapsed else 0.0
+
+    def error_rate(self):
+        requests = self.token_requests()
+        return (requests - self.tokens) / requests if requests else 0.0
+
+    def duplicate_rate(self):
+        return len(self.duplicates()) / len(self.voters) if self.voters else 0.0
+
+    def as_dict(self):
+        result = super().as_dict()
+        result["votes"] = {
+            "tokens_issued": self.tokens,
+            "token_requests": self.token_requests(),
+            "token_throughput": self.token_throughput(),
+            "error_rate": self.error_rate(),
+            "rejected": dict(self.rejected),
+            "voters": len(self.voters),
+            "duplicate_voter_ids": {voter: sorted(emails) for voter, emails in self.duplicates().items()},
+            "duplicate_rate": self.duplicate_rate(),
+            "sign_in_failures": dict(self.sign_in_failures),
+        }
+        return result
+
+    def format_text(self):
+        lines = [
+            super().format_text(),
+            "",
+            f"Tokens issued: {self.tokens} of {self.token_requests()} requests "
+            f"({self.token_throughput():.1f} tokens/s, {self.error_rate():.1%} errors)",
+            f"Voter ids: {len(self.voters)}, issued to several accounts: {len(self.duplicates())} "
+            f"({self.duplicate_rate():.1%})",
+        ]
+        for reason, n in self.rejected.most_common():
+            lines.append(f"  rejected: {reason} ({n})")
+        for reason, n in self.sign_in_failures.most_common():
+            lines.append(f"  sign-in failed: {reason} ({n})")
+        return "\n".join(lines)
+
+
+class VoteBenchmark:
+    """Drives the vote token flow of one election with one signed-in account per virtual user.
+
+    Each virtual user signs in through the Devise form with its own cookie
+    jar, then until ``duration`` runs out requests a vote token
+    (``/vote/create_token/:election_id``), optionally loads the check page
+    (``/vote/check/:election_id``) and the public counter, pausing
+    ``think_time`` between rounds. A token counts as issued when the
+    answer is a 200 carrying a signed ``voter_id:AuthEvent:...`` message;
+    voter ids seen for more than one account are reported as duplicates.
+    ``users`` must hold at least ``vus`` accounts allowed to vote.
+    """
+
+    def __init__(self, base_url, users, config=None):
+        self.base_url = base_url.rstrip("/")
+        self.config = config or VoteConfig()
+        if len(users) < self.config.vus:
+            raise ValueError(f"{self.config.vus} virtual users need as many accounts, got {len(users)}")
+        self.users = list(users)
+        self.report = VoteReport(self.config)
+
+    def run(self):
+        """Run the benchmark to completion and return the ``VoteReport``"""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        timeout = aiohttp.ClientTimeout(total=self.config.timeout)
+        self.report.started = time.monotonic()
+        deadline = self.report.started + self.config.duration
+        await asyncio.gather(*(
+            self._voter(index, self.users[index], deadline, timeout) for index in range(self.config.vus)
+        ))
+        self.report.finished = time.monotonic()
+        return self.report
+
+    def _path(self, template):
+        return f"/{self.config.locale}{template.format(election=self.config.election_id)}"
+
+    async def _voter(self, index, user, deadline, timeout):
+        if self.config.vus > 1:
+            await asyncio.sleep(self.config.ramp_up * index / self.config.vus)
+
+        async with aiohttp.ClientSession(
+            headers=HTTP_HEADERS, timeout=timeout, cookie_jar=aiohttp.CookieJar(unsafe=True),
+        ) as session:
+            try:
+                result = await sign_in(session, self.base_url, user)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.report.sign_in_failures[type(e).__name__] += 1
+                return
+            if not result.ok:
+                self.report.sign_in_failures[result.error] += 1
+                return
+
+            while time.monotonic() < deadline:
+                body = await self._get(session, "create_token", self._path("/vote/create_token/{election}"))
+                self._record_token(user, body)
+                if self.config.check:
+                    await self._get(session, "check", self._path("/vote/check/{election}"))
+                if self.config.counter_token:
+                    await self._get(session, "votes_count",
+                                    self._path(f"/votos/{{election}}/{self.config.counter_token}"))
+                if self.config.think_time:
+                    await asyncio.sleep(self.config.think_time)
+
+    def _record_token(self, user, body):
+        if body is None:
+            return
+        status, text = body
+        if status != 200:
+            # create_token answers 410 Gone when the user may not vote or the election is closed
+            self.report.rejected[f"status {status}"] += 1
+            return
+        token = parse_vote_token(text)
+        if token is None:
+            self.report.rejected["malformed token"] += 1
+            return
+        self.report.tokens += 1
+        voter_id = token[1].split(":", 1)[0]
+        self.report.voters[voter_id].add(user["email"])
+
+    async def _get(self, session, name, path):
+        """GET ``path`` recording its latency as route ``name``; ``(status, body)`` or None on a transport error"""
+        stats = self.report.route(name)
+        start = time.monotonic()
+        try:
+            async with session.get(f"{self.base_url}{path}") as response:
+                text = await response.text(errors="replace")
+                stats.record((time.monotonic() - start) * 1000, status=response.status)
+                return response.status, text
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stats.record((time.monotonic() - start) * 1000, error=type(e).__name__)
+            return None
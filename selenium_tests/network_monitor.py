@@ -0,0 +1,199 @@
+"""
+Network monitor - Follows browser network activity through DevTools events
+"""
+import json
+import time
+from urllib.parse import urldefrag
+
+from selenium.common.exceptions import WebDriverException
+
+# Chrome logging preferences that expose DevTools events through get_log("performance")
+LOGGING_PREFS = {"performance": "ALL", "browser": "ALL"}
+
+
+def _runtime_ms(headers):
+    for name, value in headers.items():
+        if name.lower() == "x-runtime":
+            try:
+                return float(value) * 1000
+            except ValueError:
+                return None
+    return None
+
+
+class DocumentResponse:
+    """Main-document response of one navigation, including any redirects it followed"""
+
+    def __init__(self, request_id, url, started):
+        self.request_id = request_id
+        self.url = url
+        self.final_url = url
+        self.status = None
+        self.redirects = []
+        self.timing = {}
+        self.encoded_bytes = None
+        self.runtime = None
+        self.error = None
+        self.started = started
+        self.finished = None
+
+        # Every request the document issued, itself included, and their encoded size
+        self.requests = 0
+        self.transfer_bytes = 0
+
+    @property
+    def ttfb(self):
+        """Milliseconds from the final request's start to its response headers"""
+        return self.timing.get("receiveHeadersEnd")
+
+    @property
+    def server_time(self):
+        """Milliseconds spent on the server: X-Runtime when sent, else the wait for response headers"""
+        if self.runtime is not None:
+            return self.runtime
+        if "receiveHeadersEnd" not in self.timing or "sendEnd" not in self.timing:
+            return None
+        return self.timing["receiveHeadersEnd"] - self.timing["sendEnd"]
+
+    @property
+    def duration(self):
+        """Milliseconds from the first request, redirects included, to the end of the body"""
+        if self.finished is None:
+            return None
+        return (self.finished - self.started) * 1000
+
+    def matches(self, url):
+        return urldefrag(self.final_url)[0] == urldefrag(url)[0]
+
+
+class NetworkMonitor:
+    """Tracks in-flight requests from the DevTools events in Chrome's performance log.
+
+    The performance log is drained on every ``poll``, so each browser lease
+    should use a single monitor. Entries produced before the monitor was
+    created are discarded.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.in_flight = {}
+        self.last_activity = time.monotonic()
+        self.available = True
+        self.documents = []
+
+        self._documents_by_request = {}
+        self._documents_by_loader = {}
+        self._request_documents = {}
+        self._main_frame_id = self._window_handle()
+        self._read_log()
+
+    def poll(self):
+        """Consume pending DevTools events, returning how many were read"""
+        events = self._read_log()
+        for event in events:
+            self._handle(event.get("method", ""), event.get("params", {}))
+        return len(events)
+
+    def is_idle(self, quiet_period=0.5, max_in_flight=0):
+        """Whether the page has had at most ``max_in_flight`` open requests for ``quiet_period`` seconds"""
+        self.poll()
+        if not self.available:
+            return True
+        if len(self.in_flight) > max_in_flight:
+            return False
+        return time.monotonic() - self.last_activity >= quiet_period
+
+    def reset(self):
+        """Forget requests seen so far, e.g. before starting a new navigation"""
+        self.poll()
+        self.in_flight.clear()
+
+    def last_document(self, url=None):
+        """The latest main-document response, optionally only if it ended at ``url``"""
+        self.poll()
+        if not self.documents:
+            return None
+        document = self.documents[-1]
+        if url is not None and not document.matches(url):
+            return None
+        return document
+
+    def _handle(self, method, params):
+        if not method.startswith("Network."):
+            return
+
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            url = params.get("request", {}).get("url", "")
+            if url.startswith("data:"):
+                return
+            self.in_flight[request_id] = url
+            self._track_document(request_id, url, params)
+            self._track_request(request_id, params)
+        elif method == "Network.responseReceived":
+            document = self._documents_by_request.get(request_id)
+            if document is not None:
+                response = params.get("response", {})
+                document.status = response.get("status")
+                document.timing = response.get("timing") or {}
+                document.runtime = _runtime_ms(response.get("headers") or {})
+            return
+        elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+            self.in_flight.pop(request_id, None)
+            owner = self._request_documents.pop(request_id, None)
+            if owner is not None:
+                owner.transfer_bytes += params.get("encodedDataLength") or 0
+            document = self._documents_by_request.pop(request_id, None)
+            if document is not None:
+                document.finished = params.get("timestamp")
+                document.encoded_bytes = params.get("encodedDataLength")
+                document.error = params.get("errorText")
+        elif method != "Network.dataReceived":
+            return
+        self.last_activity = time.monotonic()
+
+    def _track_document(self, request_id, url, params):
+        # A top-level navigation is a Document request whose loader is itself, in the window's frame
+        if params.get("type") != "Document" or params.get("loaderId") != request_id:
+            return
+        if self._main_frame_id is not None and params.get("frameId") != self._main_frame_id:
+            return
+
+        document = self._documents_by_request.get(request_id)
+        redirect = params.get("redirectResponse")
+        if document is not None and redirect is not None:
+            # Same request id, new URL: the previous hop answered with a redirect
+            document.redirects.append((document.final_url, redirect.get("status")))
+            document.final_url = url
+            return
+
+        document = DocumentResponse(request_id, url, params.get("timestamp"))
+        self._documents_by_request[request_id] = document
+        self._documents_by_loader[request_id] = document
+        self.documents.append(document)
+
+    def _track_request(self, request_id, params):
+        # Subresources carry the loader id of the document that requested them
+        document = self._documents_by_loader.get(params.get("loaderId"))
+        if document is None or request_id in self._request_documents:
+            return
+        document.requests += 1
+        self._request_documents[request_id] = document
+
+    def _window_handle(self):
+        # ChromeDriver window handles are DevTools target ids, which equal the top frame's id
+        try:
+            return self.driver.current_window_handle
+        except WebDriverException:
+            return None
+
+    def _read_log(self):
+        if not self.available:
+            return []
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException:
+            # Performance logging is not enabled for this browser
+            self.available = False
+            return []
+        return [json.loads(entry["message"])["message"] for entry in entries]
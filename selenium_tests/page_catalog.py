@@ -0,0 +1,44 @@
+"""
+Page catalog - Application paths shared by the page checks and the load generator
+"""
+
+# Pages reachable without signing in (the ones test_public_pages.py visits)
+PUBLIC_PAGES = [
+    "/health",
+    "/es",
+    "/ca",
+    "/eu",
+    "/es/colabora",
+    "/es/colabora/puntual",
+    "/es/microcreditos",
+    "/es/impulsa",
+    "/es/audio_captcha",
+]
+
+# Pages for a signed-in user
+AUTHENTICATED_PAGES = [
+    "/es",  # authenticated home
+    "/es/users/edit",  # profile
+    "/es/colabora",  # collaboration (authenticated)
+    "/es/microcreditos",  # microcredit (authenticated)
+    "/es/impulsa",  # impulsa (authenticated)
+    "/es/financiacion",  # funding
+    "/es/tools/militant_request",  # militant request
+]
+
+# Pages for an admin user
+ADMIN_PAGES = [
+    "/admin",
+    "/admin/users",
+    "/admin/collaborations",
+    "/admin/microcredits",
+]
+
+# Public engine pages (and the health check) whose capacity is searched before campaigns
+CAPACITY_PAGES = [
+    "/es/colabora",
+    "/es/microcreditos",
+    "/es/impulsa",
+    "/propuestas",
+    "/health",
+]
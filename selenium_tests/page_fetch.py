@@ -0,0 +1,129 @@
+"""
+Page fetchers - Load a page over plain HTTP or through the browser
+"""
+import copy
+import html
+import re
+import time
+
+import requests
+
+from auth_session import is_sign_in_url
+
+# Markers the Rails error pages put in the body when the status code is unknown
+SERVER_ERROR_MARKERS = ("500", "Internal Server Error")
+FORBIDDEN_MARKERS = ("403", "Forbidden")
+
+HTTP_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es",
+}
+
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def is_server_error(status, text):
+    """Judge by the real status code, falling back to the error page markers when it is unknown"""
+    if status is not None:
+        return status >= 500
+    return any(marker in text for marker in SERVER_ERROR_MARKERS)
+
+
+def is_forbidden(status, text):
+    if status is not None:
+        return status == 403
+    return any(marker in text for marker in FORBIDDEN_MARKERS)
+
+
+class PageResult:
+    """Status, final URL and body of a loaded page"""
+
+    def __init__(self, url, final_url, status, text, title, elapsed, mode):
+        self.url = url
+        self.final_url = final_url
+        self.status = status
+        self.text = text
+        self.title = title
+        self.elapsed = elapsed
+        self.mode = mode
+
+    @property
+    def server_error(self):
+        return is_server_error(self.status, self.text)
+
+    @property
+    def forbidden(self):
+        return is_forbidden(self.status, self.text)
+
+    @property
+    def redirected_to_sign_in(self):
+        return is_sign_in_url(self.final_url) and not is_sign_in_url(self.url)
+
+
+class HttpFetcher:
+    """Fetch pages without a browser through pooled keep-alive sessions.
+
+    Anonymous pages share one ``requests.Session`` whose cookies are
+    cleared before every request; signed-in pages use the user's session
+    from the ``AuthCache``. ``label`` names the test in budget evaluations.
+    """
+
+    mode = "http"
+
+    def __init__(self, base_url, auth_cache, timeout=10, budgets=None, label=None):
+        self.base_url = base_url
+        self.auth_cache = auth_cache
+        self.timeout = timeout
+        self.budgets = budgets
+        self.label = label
+
+        self.session = requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+
+    def fetch(self, url, user=None):
+        start = time.monotonic()
+        if user is None:
+            self.session.cookies.clear()
+            response = self.session.get(url, timeout=self.timeout)
+        else:
+            response = self.auth_cache.request(user, "GET", url, headers=HTTP_HEADERS)
+        elapsed = time.monotonic() - start
+        if self.budgets is not None:
+            self.budgets.record_http(url, response, elapsed, label=self.label)
+
+        match = TITLE_PATTERN.search(response.text)
+        title = html.unescape(match.group(1).strip()) if match else ""
+        return PageResult(url, response.url, response.status_code, response.text, title, elapsed, self.mode)
+
+    def labelled(self, label):
+        """A fetcher sharing this one's sessions whose budget evaluations are labelled ``label``"""
+        fetcher = copy.copy(self)
+        fetcher.label = label
+        return fetcher
+
+    def close(self):
+        self.session.close()
+
+
+class BrowserFetcher:
+    """Fetch pages through a leased browser, for checks that need JavaScript"""
+
+    mode = "browser"
+
+    def __init__(self, driver, waits, auth_cache, page_state):
+        self.driver = driver
+        self.waits = waits
+        self.auth_cache = auth_cache
+        self.page_state = page_state
+
+    def fetch(self, url, user=None):
+        start = time.monotonic()
+        if user is None:
+            self.driver.get(url)
+        else:
+            self.auth_cache.get(self.driver, url, user)
+        self.waits.settle()
+        elapsed = time.monotonic() - start
+
+        page = self.page_state.current()
+        return PageResult(url, page.final_url, page.status, page.text, page.title, elapsed, self.mode)
@@ -0,0 +1,180 @@
+"""
+Page metrics - Navigation Timing, paint, LCP, CLS and long tasks measured in the browser
+"""
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+# Installed before any page script runs; buffers the entries that cannot be read after the fact
+OBSERVER_SCRIPT = """
+(function () {
+    if (window.__pageMetrics) { return; }
+    var metrics = window.__pageMetrics = {lcp: null, cls: 0, longTasks: 0, longTaskTime: 0, blockingTime: 0};
+    var windowValue = 0, windowStart = 0, lastShift = 0;
+
+    function observe(type, callback) {
+        try {
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); })
+                .observe({type: type, buffered: true});
+        } catch (e) {}
+    }
+
+    observe("largest-contentful-paint", function (entry) { metrics.lcp = entry.startTime; });
+
+    // CLS is the largest session window: shifts less than 1s apart, at most 5s long
+    observe("layout-shift", function (entry) {
+        if (entry.hadRecentInput) { return; }
+        if (windowValue && entry.startTime - lastShift < 1000 && entry.startTime - windowStart < 5000) {
+            windowValue += entry.value;
+        } else {
+            windowValue = entry.value;
+            windowStart = entry.startTime;
+        }
+        lastShift = entry.startTime;
+        metrics.cls = Math.max(metrics.cls, windowValue);
+    });
+
+    observe("longtask", function (entry) {
+        metrics.longTasks += 1;
+        metrics.longTaskTime += entry.duration;
+        metrics.blockingTime += Math.max(0, entry.duration - 50);
+    });
+})();
+"""
+
+READ_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType("navigation")[0];
+var fcp = performance.getEntriesByName("first-contentful-paint")[0];
+var observed = window.__pageMetrics;
+function since(value) { return nav && value > 0 ? value : null; }
+return {
+    url: document.URL,
+    ttfb: since(nav && nav.responseStart),
+    dom_content_loaded: since(nav && nav.domContentLoadedEventEnd),
+    load: since(nav && nav.loadEventEnd),
+    fcp: fcp ? fcp.startTime : null,
+    lcp: observed ? observed.lcp : null,
+    cls: observed ? observed.cls : null,
+    long_tasks: observed ? observed.longTasks : null,
+    total_blocking_time: observed ? observed.blockingTime : null,
+    transfer_size: nav ? nav.transferSize : null
+};
+"""
+
+
+def install_observer(driver):
+    """Run the observer script in every new document, returning its DevTools id or None"""
+    try:
+        response = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT})
+    except WebDriverException:
+        return None
+    return response.get("identifier")
+
+
+def uninstall_observer(driver, script_id):
+    if script_id is None:
+        return
+    try:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+    except WebDriverException:
+        pass
+
+
+class PageMetrics:
+    """Timings of one page load, in milliseconds from navigation start"""
+
+    FIELDS = (
+        "url", "ttfb", "dom_content_loaded", "load", "fcp", "lcp",
+        "cls", "long_tasks", "total_blocking_time", "transfer_size",
+    )
+
+    def __init__(self, data):
+        for field in self.FIELDS:
+            setattr(self, field, data.get(field))
+
+    @property
+    def load_seconds(self):
+        return self.load / 1000 if self.load is not None else None
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def summary(self):
+        """Short human-readable line for issue descriptions"""
+        parts = []
+        for label, field in (("TTFB", "ttfb"), ("DCL", "dom_content_loaded"), ("load", "load"),
+                             ("FCP", "fcp"), ("LCP", "lcp")):
+            value = getattr(self, field)
+            if value is not None:
+                parts.append(f"{label} {value:.0f}ms")
+        if self.cls is not None:
+            parts.append(f"CLS {self.cls:.3f}")
+        return ", ".join(parts)
+
+
+class PerformanceResults:
+    """Metrics recorded by every test, written out at the end of the session"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, label, metrics):
+        self.records.append({"test": label, **metrics.as_dict()})
+
+    def merge(self, path):
+        """Fold in the records another process wrote to ``path``"""
+        with open(path) as f:
+            self.records.extend(json.load(f))
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.records, f, indent=2)
+
+
+class LoadNotMeasured(Exception):
+    """Raised when a page's load event never finished, so there is no load time to report"""
+
+
+class MetricsCollector:
+    """Measures page loads in a leased browser.
+
+    ``install`` registers the PerformanceObserver script for every new
+    document through DevTools, so LCP, layout shifts and long tasks are
+    buffered from the start of each navigation. Without DevTools, LCP, CLS
+    and long tasks are reported as None.
+    """
+
+    def __init__(self, driver, waits, results=None, label=None):
+        self.driver = driver
+        self.waits = waits
+        self.results = results if results is not None else PerformanceResults()
+        self.label = label
+        self._script_id = None
+
+    def install(self):
+        self._script_id = install_observer(self.driver)
+        return self._script_id is not None
+
+    def uninstall(self):
+        uninstall_observer(self.driver, self._script_id)
+        self._script_id = None
+
+    def navigate(self, url, record=True):
+        """Load ``url`` and measure it; ``record=False`` keeps warmup loads out of the results"""
+        self.driver.get(url)
+        return self.measure(record)
+
+    def measure(self, record=True):
+        """Metrics of the current page once its load event has finished"""
+        self.waits.load_complete()
+        metrics = PageMetrics(self.driver.execute_script(READ_METRICS_SCRIPT))
+        if record:
+            self.results.record(self.label, metrics)
+        return metrics
+
+    def load_seconds(self, url, record=True):
+        """Seconds from navigation start to the end of the load event; raises ``LoadNotMeasured`` if it never ended"""
+        seconds = self.navigate(url, record).load_seconds
+        if seconds is None:
+            raise LoadNotMeasured(f"The load event of {url} did not finish, so its load time was not measured")
+        return seconds
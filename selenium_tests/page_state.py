@@ -0,0 +1,115 @@
+"""
+Page state - Source, title, URL and status of the current page, read once per document
+"""
+from page_fetch import PageResult, is_forbidden, is_server_error
+
+# Identifies the document currently loaded: a reload gets a new timeOrigin even on the same URL
+DOCUMENT_MARKER_SCRIPT = "return [document.URL, performance.timeOrigin];"
+
+# URL, title and Navigation Timing status in a single round trip
+DOCUMENT_INFO_SCRIPT = """
+var nav = performance.getEntriesByType("navigation")[0];
+return {
+    marker: [document.URL, performance.timeOrigin],
+    url: document.URL,
+    title: document.title,
+    status: nav && nav.responseStatus ? nav.responseStatus : null
+};
+"""
+
+PAGE_SOURCE_SCRIPT = "return document.documentElement ? document.documentElement.outerHTML : '';"
+
+
+class PageState:
+    """Cached view of the browser's current page.
+
+    URL, title and status are read once per document and the page source
+    only when a check needs it. The status comes from the DevTools response
+    the ``network`` monitor recorded for the document (falling back to the
+    Navigation Timing API), so status checks never transfer the page body.
+
+    Every access first checks the document's URL and time origin with a
+    tiny script, so a navigation, reload or redirect invalidates the cache
+    automatically; ``Waits.submit`` invalidates it too, since a submit can
+    rewrite the page in place. Call ``invalidate`` after changing the DOM by
+    other means.
+    """
+
+    def __init__(self, driver, network=None):
+        self.driver = driver
+        self.network = network
+        self._info = None
+        self._text = None
+        self._lower_text = None
+
+    def invalidate(self):
+        self._info = None
+        self._text = None
+        self._lower_text = None
+
+    def current(self):
+        """The current page as a ``PageResult``"""
+        return PageResult(self.url, self.url, self.status, self.text, self.title, 0.0, "browser")
+
+    @property
+    def url(self):
+        return self._document_info()["url"]
+
+    @property
+    def title(self):
+        return self._document_info()["title"]
+
+    @property
+    def document(self):
+        """DevTools ``DocumentResponse`` for the current page, if the monitor saw it load"""
+        if self.network is None:
+            return None
+        return self.network.last_document(self.url)
+
+    @property
+    def status(self):
+        document = self.document
+        if document is not None and document.status is not None:
+            return document.status
+        return self._document_info()["status"]
+
+    @property
+    def redirects(self):
+        """``(url, status)`` of each redirect followed to reach the current page"""
+        document = self.document
+        return list(document.redirects) if document is not None else []
+
+    @property
+    def text(self):
+        self._document_info()
+        if self._text is None:
+            self._text = self.driver.execute_script(PAGE_SOURCE_SCRIPT)
+        return self._text
+
+    @property
+    def lower_text(self):
+        """Lower-cased page source, computed once per document"""
+        text = self.text
+        if self._lower_text is None:
+            self._lower_text = text.lower()
+        return self._lower_text
+
+    @property
+    def server_error(self):
+        status = self.status
+        return is_server_error(status, self.text if status is None else "")
+
+    @property
+    def forbidden(self):
+        status = self.status
+        return is_forbidden(status, self.text if status is None else "")
+
+    def _document_info(self):
+        if self._info is not None:
+            marker = self.driver.execute_script(DOCUMENT_MARKER_SCRIPT)
+            if marker == self._info["marker"]:
+                return self._info
+            self.invalidate()
+
+        self._info = self.driver.execute_script(DOCUMENT_INFO_SCRIPT)
+        return self._info
@@ -0,0 +1,248 @@
+"""
+Parallel runner - Shards the suite across worker processes balanced by recorded test durations
+
+    python parallel.py -n 4 [pytest arguments]
+
+Each worker is a separate pytest process with its own browser pool, or with
+``--shared-browser`` its own contexts of one Chrome the runner starts. The
+runner clears the issue shards, waits for every worker, merges their
+issues into one ISSUES_REPORT.md and their result files into one of each
+kind, prints the summary of the whole run and folds their timings back
+into DURATIONS_FILE for the next run.
+"""
+import argparse
+import glob
+import heapq
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from asset_proxy import ProxyStats
+from benchmark import BenchmarkResults
+from browser_contexts import ContextMemory, SharedChrome
+from issue_log import IssueLog, write_issues_report
+from loadgen import LoadResults
+from page_metrics import PerformanceResults
+from perf_budgets import BudgetBook
+from resource_blocking import BlockingTimings
+from summaries import (
+    asset_proxy_summary, benchmark_summary, blocking_summary, budget_summary, context_memory_summary,
+    load_summary, performance_summary,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DURATIONS_FILE = os.environ.get("SELENIUM_DURATIONS_FILE", os.path.join(HERE, "test_durations.json"))
+# Where workers leave their shard lists, timings and logs
+RUN_DIR = os.environ.get("SELENIUM_RUN_DIR", os.path.join(HERE, ".parallel"))
+# Tests this process should run, one node id per line; set by the runner for each worker
+SHARD_FILE = os.environ.get("SELENIUM_SHARD_FILE")
+WORKERS = int(os.environ.get("SELENIUM_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Seconds assumed for a test without a recorded duration when nothing has been recorded yet
+DEFAULT_DURATION = 5.0
+
+
+class DurationLog:
+    """Seconds each test spent in setup, call and teardown during this process"""
+
+    def __init__(self):
+        self.durations = {}
+
+    def add(self, nodeid, seconds):
+        self.durations[nodeid] = self.durations.get(nodeid, 0.0) + seconds
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+
+
+def read_durations(path=DURATIONS_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_durations(path, *runs):
+    """Fold the durations of ``runs`` into ``path``; tests that did not run keep their last time"""
+    durations = read_durations(path)
+    for run in runs:
+        durations.update(run)
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+    return durations
+
+
+def read_shard(path=SHARD_FILE):
+    """Node ids listed in a shard file, or None when this process is not a shard"""
+    if not path:
+        return None
+    with open(path) as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def plan_shards(nodeids, durations, workers):
+    """Split ``nodeids`` into ``workers`` lists of roughly equal expected time.
+
+    Longest tests first, each onto the least loaded worker, so a class of
+    slow tests is spread over every worker instead of filling the one its
+    file happened to land on. Tests never timed count as the median known
+    duration. Returns ``[(expected_seconds, nodeids)]``, one per worker.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    shards = [(0.0, index, []) for index in range(workers)]
+    heapq.heapify(shards)
+    for nodeid in sorted(nodeids, key=lambda n: durations.get(n, default), reverse=True):
+        load, index, tests = heapq.heappop(shards)
+        tests.append(nodeid)
+        heapq.heappush(shards, (load + durations.get(nodeid, default), index, tests))
+    return [(load, tests) for load, _, tests in sorted(shards, key=lambda shard: shard[1])]
+
+
+class Terminal:
+    """The part of pytest's TerminalReporter the summaries use, printing to stdout"""
+
+    def write_sep(self, sep, title):
+        print(f" {title} ".center(80, sep))
+
+    def write_line(self, line):
+        print(line)
+
+
+def merge_results(name, results):
+    """Fold every worker's ``name`` (``PERFORMANCE_RESULTS.gw0.json``...) into ``results`` and write it as ``name``.
+
+    The worker files are removed; returns whether there were any.
+    """
+    stem, ext = os.path.splitext(name)
+    paths = sorted(glob.glob(os.path.join(HERE, f"{stem}.gw*{ext}")))
+    for path in paths:
+        results.merge(path)
+        os.remove(path)
+    if paths:
+        results.write(os.path.join(HERE, name))
+    return bool(paths)
+
+
+def collect(pytest_args):
+    """Node ids pytest would run for ``pytest_args``"""
+    result = subprocess.run(
+        # pytest.ini's -v would turn the plain node id listing into a tree
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-o", "addopts=", *pytest_args],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    nodeids = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+    if result.returncode not in (0, 5):
+        sys.stderr.write(result.stdout + result.stderr)
+        raise SystemExit(result.returncode or 1)
+    return nodeids
+
+
+def run(pytest_args, workers=WORKERS, shared_browser=False):
+    """Run the suite in ``workers`` processes and return pytest's exit status for the whole run"""
+    nodeids = collect(pytest_args)
+    if not nodeids:
+        print("No tests collected")
+        return 5
+
+    durations = read_durations()
+    shards = [shard for shard in plan_shards(nodeids, durations, min(workers, len(nodeids))) if shard[1]]
+    IssueLog.reset()
+    for path in glob.glob(os.path.join(RUN_DIR, "*")):
+        os.remove(path)
+    os.makedirs(RUN_DIR, exist_ok=True)
+
+    chrome = SharedChrome() if shared_browser else None
+    try:
+        statuses, elapsed = _run_shards(shards, pytest_args, chrome)
+    finally:
+        if chrome is not None:
+            chrome.close()
+
+    update_durations(DURATIONS_FILE, *(
+        read_durations(path) for path in sorted(glob.glob(os.path.join(RUN_DIR, "durations-*.json")))
+    ))
+    worker_timings = glob.glob(os.path.join(HERE, "BLOCKING_TIMINGS.gw*.json"))
+    if worker_timings:
+        timings = BlockingTimings()
+        for path in worker_timings:
+            timings.merge(path)
+            os.remove(path)
+        timings.write()
+
+    terminal = Terminal()
+    performance = PerformanceResults()
+    if merge_results("PERFORMANCE_RESULTS.json", performance):
+        performance_summary(terminal, performance)
+    benchmarks = BenchmarkResults()
+    if merge_results("BENCHMARK_RESULTS.json", benchmarks):
+        benchmark_summary(terminal, benchmarks)
+    budgets = BudgetBook.load()
+    if merge_results("BUDGET_REPORT.json", budgets):
+        budget_summary(terminal, budgets)
+    loads = LoadResults()
+    if merge_results("LOAD_RESULTS.json", loads):
+        load_summary(terminal, loads)
+    memory = ContextMemory()
+    if merge_results("CONTEXT_MEMORY.json", memory):
+        context_memory_summary(terminal, memory)
+    if worker_timings:
+        blocking_summary(terminal, timings)
+    proxy = ProxyStats()
+    if merge_results("ASSET_PROXY.json", proxy):
+        asset_proxy_summary(terminal, proxy)
+
+    issues = IssueLog.merge()
+    if issues:
+        write_issues_report(os.path.join(HERE, "ISSUES_REPORT.md"), issues)
+    print(f"{len(nodeids)} tests on {len(shards)} workers in {elapsed:.0f}s, {len(issues)} issues")
+
+    # Any worker with failures fails the run; "no tests" only when every worker had none
+    failed = [status for status in statuses if status not in (0, 5)]
+    if failed:
+        return max(failed)
+    return 0 if 0 in statuses else 5
+
+
+def _run_shards(shards, pytest_args, chrome):
+    """Start one pytest process per shard and wait for all; returns their statuses and the seconds taken"""
+    processes = []
+    start = time.monotonic()
+    for index, (expected, tests) in enumerate(shards):
+        worker = f"gw{index}"
+        shard_file = os.path.join(RUN_DIR, f"shard-{worker}.txt")
+        with open(shard_file, "w") as f:
+            f.write("\n".join(tests) + "\n")
+        env = dict(os.environ, SELENIUM_WORKER=worker, SELENIUM_SHARD_FILE=shard_file)
+        if chrome is not None:
+            env.update(SELENIUM_BROWSER_CONTEXTS="1", SELENIUM_CHROME_ADDRESS=chrome.address)
+        log = open(os.path.join(RUN_DIR, f"{worker}.log"), "w")
+        print(f"{worker}: {len(tests)} tests, ~{expected:.0f}s expected, log {log.name}")
+        processes.append((worker, log, subprocess.Popen(
+            [sys.executable, "-m", "pytest", *pytest_args],
+            cwd=HERE, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )))
+
+    statuses = []
+    for worker, log, process in processes:
+        statuses.append(process.wait())
+        log.close()
+        print(f"{worker}: exit {statuses[-1]} after {time.monotonic() - start:.0f}s")
+    return statuses, time.monotonic() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--workers", type=int, default=WORKERS, help="worker processes, each with its own browser")
+    parser.add_argument("--shared-browser", action="store_true",
+                        help="run every worker in browser contexts of one Chrome instead of a Chrome each")
+    args, pytest_args = parser.parse_known_args(argv)
+    return run(pytest_args, args.workers, args.shared_browser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
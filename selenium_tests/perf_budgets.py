@@ -0,0 +1,202 @@
+"""
+Performance budgets - Per-route limits loaded from a budget file and checked on every visited page
+"""
+import json
+import os
+from fnmatch import fnmatch
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from page_metrics import install_observer, uninstall_observer
+
+BUDGETS_FILE = os.environ.get(
+    "PERF_BUDGETS_FILE", os.path.join(os.path.dirname(__file__), "performance_budgets.json")
+)
+
+# Locale prefixes the application routes under (config/routes.rb)
+LOCALES = ("es", "ca", "eu")
+
+# Metrics a budget can limit; all in milliseconds except bytes and counts
+METRICS = ("ttfb", "lcp", "transfer_bytes", "requests", "dom_nodes", "server_time", "load", "response_time")
+
+# Page-side measurements taken once the page has settled
+PAGE_MEASUREMENTS_SCRIPT = """
+var nav = performance.getEntriesByType("navigation")[0];
+var observed = window.__pageMetrics;
+return {
+    marker: [document.URL, performance.timeOrigin],
+    url: document.URL,
+    ttfb: nav && nav.responseStart > 0 ? nav.responseStart : null,
+    load: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+    lcp: observed ? observed.lcp : null,
+    dom_nodes: document.getElementsByTagName("*").length
+};
+"""
+
+
+def split_locale(path):
+    """``("es", "/colabora")`` for ``/es/colabora``; ``(None, path)`` without a locale prefix"""
+    parts = path.split("/", 2)
+    if len(parts) > 1 and parts[1] in LOCALES:
+        return parts[1], "/" + (parts[2] if len(parts) > 2 else "")
+    return None, path or "/"
+
+
+def _limits(spec):
+    # A limit is either a number (fail above it) or {"warn": x, "fail": y}
+    if isinstance(spec, dict):
+        return {"warn": spec.get("warn"), "fail": spec.get("fail")}
+    return {"warn": None, "fail": spec}
+
+
+class Budget:
+    """Limits for the routes matching one entry of the budget file"""
+
+    def __init__(self, name, routes, locales=None, limits=None):
+        self.name = name
+        self.routes = routes
+        self.locales = locales
+        self.limits = {metric: _limits(spec) for metric, spec in (limits or {}).items()}
+
+    def matches(self, locale, route):
+        if self.locales is not None and locale not in self.locales:
+            return False
+        return any(fnmatch(route, pattern) for pattern in self.routes)
+
+    def limit(self, metric, level="fail"):
+        """Limit for ``metric`` at ``level`` ("warn" or "fail"), or None if unset"""
+        return self.limits.get(metric, {}).get(level)
+
+    def check(self, metric, value):
+        """"pass", "warn" or "fail" for a measured value, None if unmeasured or unbudgeted"""
+        if value is None or metric not in self.limits:
+            return None
+        fail, warn = self.limit(metric, "fail"), self.limit(metric, "warn")
+        if fail is not None and value > fail:
+            return "fail"
+        if warn is not None and value > warn:
+            return "warn"
+        return "pass"
+
+
+class BudgetBook:
+    """Budgets from the budget file, and every evaluation made against them.
+
+    Entries are tried in file order and the first whose route pattern and
+    locale match a page wins; its limits are layered over ``defaults``.
+    Route patterns are shell-style globs on the path without its locale
+    prefix, e.g. ``/colabora*`` matches ``/es/colabora/puntual``.
+    """
+
+    def __init__(self, budgets, default):
+        self.budgets = budgets
+        self.default = default
+        self.evaluations = []
+
+    @classmethod
+    def load(cls, path=BUDGETS_FILE):
+        with open(path) as f:
+            config = json.load(f)
+        defaults = config.get("defaults", {})
+        budgets = [
+            Budget(
+                entry["name"], entry["routes"], entry.get("locales"),
+                {**defaults, **entry.get("limits", {})},
+            )
+            for entry in config.get("budgets", [])
+        ]
+        return cls(budgets, Budget("default", ["*"], limits=defaults))
+
+    def budget_for(self, url):
+        locale, route = split_locale(urlsplit(url).path)
+        for budget in self.budgets:
+            if budget.matches(locale, route):
+                return budget
+        return self.default
+
+    def evaluate(self, url, measurements, source, label=None):
+        """Check one page's measurements against its budget and keep the result"""
+        budget = self.budget_for(url)
+        results = {}
+        for metric in METRICS:
+            value = measurements.get(metric)
+            outcome = budget.check(metric, value)
+            if outcome is not None:
+                results[metric] = {"value": value, "limit": budget.limit(metric), "result": outcome}
+        evaluation = {"test": label, "url": url, "budget": budget.name, "source": source, "metrics": results}
+        self.evaluations.append(evaluation)
+        return evaluation
+
+    def record_http(self, url, response, elapsed, label=None):
+        """Evaluate a page fetched over plain HTTP"""
+        runtime = response.headers.get("X-Runtime")
+        measurements = {
+            "ttfb": response.elapsed.total_seconds() * 1000,
+            "response_time": elapsed * 1000,
+            "transfer_bytes": int(response.headers.get("Content-Length") or len(response.content)),
+            "server_time": float(runtime) * 1000 if runtime else None,
+        }
+        return self.evaluate(response.url or url, measurements, "http", label)
+
+    def failures(self):
+        return [e for e in self.evaluations if any(m["result"] == "fail" for m in e["metrics"].values())]
+
+    def matrix(self):
+        """``{budget: {metric: {"pass": n, "warn": n, "fail": n}}}`` over every evaluation"""
+        matrix = {}
+        for evaluation in self.evaluations:
+            row = matrix.setdefault(evaluation["budget"], {})
+            for metric, result in evaluation["metrics"].items():
+                cell = row.setdefault(metric, {"pass": 0, "warn": 0, "fail": 0})
+                cell[result["result"]] += 1
+        return matrix
+
+    def merge(self, path):
+        """Fold in the evaluations another process wrote to ``path``"""
+        with open(path) as f:
+            self.evaluations.extend(json.load(f)["evaluations"])
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump({"matrix": self.matrix(), "evaluations": self.evaluations}, f, indent=2)
+
+
+class BrowserBudgetRecorder:
+    """Evaluates each page a test's browser settles on, once per document.
+
+    ``install`` registers the page metrics observer so LCP is available;
+    without it LCP is simply not evaluated.
+    """
+
+    def __init__(self, book, driver, network, label=None):
+        self.book = book
+        self.driver = driver
+        self.network = network
+        self.label = label
+        self._marker = None
+        self._script_id = None
+
+    def install(self):
+        self._script_id = install_observer(self.driver)
+
+    def uninstall(self):
+        uninstall_observer(self.driver, self._script_id)
+        self._script_id = None
+
+    def visit(self):
+        try:
+            page = self.driver.execute_script(PAGE_MEASUREMENTS_SCRIPT)
+        except WebDriverException:
+            return None
+        if page["marker"] == self._marker:
+            return None
+        self._marker = page["marker"]
+
+        measurements = dict(page)
+        document = self.network.last_document(page["url"]) if self.network is not None else None
+        if document is not None:
+            measurements["server_time"] = document.server_time
+            measurements["transfer_bytes"] = document.transfer_bytes
+            measurements["requests"] = document.requests
+        return self.book.evaluate(page["url"], measurements, "browser", self.label)
@@ -0,0 +1,40 @@
+"""
+Rate limit - The application's Rack::Attack throttle signal, shared by the tests and the load generator
+"""
+import time
+
+# Status Rack::Attack's throttled_responder answers with (config/initializers/rack_attack.rb)
+RATE_LIMITED_STATUS = 429
+
+# Above this a reset value is an epoch timestamp rather than a number of seconds
+EPOCH_THRESHOLD = 10 ** 9
+
+
+def is_rate_limited(status):
+    return status == RATE_LIMITED_STATUS
+
+
+def _seconds(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(headers, now=None):
+    """Seconds a throttled response asks the client to wait, or None if it does not say.
+
+    The application sends ``RateLimit-Reset`` as the epoch time the window
+    ends; the delta-seconds form of the RateLimit header draft is accepted
+    too. ``Retry-After`` (seconds; HTTP dates are not honoured) is the
+    fallback for servers in front of it.
+    """
+    if headers is None:
+        return None
+    reset = _seconds(headers.get("RateLimit-Reset"))
+    if reset is not None:
+        if reset > EPOCH_THRESHOLD:
+            reset -= time.time() if now is None else now
+        return max(reset, 0.0)
+    wait = _seconds(headers.get("Retry-After"))
+    return max(wait, 0.0) if wait is not None else None
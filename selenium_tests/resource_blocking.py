@@ -0,0 +1,124 @@
+"""
+Resource blocking - Named profiles that keep browsers from loading images, media, fonts or third parties
+"""
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+# Set to 0 to load everything in every test, e.g. to record the baseline timings profiles are compared against
+ENABLED = os.environ.get("RESOURCE_BLOCKING", "1") == "1"
+THIRD_PARTY_HOSTS = tuple(
+    host.strip() for host in os.environ.get(
+        "BLOCKING_THIRD_PARTY_HOSTS",
+        "fonts.googleapis.com,fonts.gstatic.com,www.googletagmanager.com,www.google-analytics.com",
+    ).split(",") if host.strip()
+)
+TIMINGS_FILE = os.environ.get(
+    "BLOCKING_TIMINGS_FILE", os.path.join(os.path.dirname(__file__), "BLOCKING_TIMINGS.json")
+)
+
+
+def _extensions(*names):
+    # With and without a query string: Network.setBlockedURLs matches the whole URL
+    return tuple(pattern for name in names for pattern in (f"*.{name}", f"*.{name}?*"))
+
+
+CATEGORIES = {
+    "images": _extensions("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": _extensions("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "mov"),
+    "fonts": _extensions("woff", "woff2", "ttf", "otf", "eot"),
+    "third_party": tuple(f"*://{host}/*" for host in THIRD_PARTY_HOSTS),
+}
+
+
+class BlockingProfile:
+    """A named set of resource categories a browser does not load"""
+
+    def __init__(self, name, categories=()):
+        self.name = name
+        self.categories = tuple(categories)
+
+    @property
+    def patterns(self):
+        return [pattern for category in self.categories for pattern in CATEGORIES[category]]
+
+    def apply(self, driver):
+        """Block this profile's requests in the driver's current page target; False if DevTools is unavailable"""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def clear(driver):
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        except WebDriverException:
+            pass
+
+
+PROFILES = {
+    "full": BlockingProfile("full"),
+    "no-images": BlockingProfile("no-images", ("images", "media")),
+    "no-fonts": BlockingProfile("no-fonts", ("fonts",)),
+    "no-third-party": BlockingProfile("no-third-party", ("third_party",)),
+    "lean": BlockingProfile("lean", ("images", "media", "fonts", "third_party")),
+}
+
+
+def profile_for(node):
+    """The profile named by the closest ``resources`` marker of a test, "full" when unmarked"""
+    marker = node.get_closest_marker("resources")
+    name = marker.args[0] if marker else "full"
+    if name not in PROFILES:
+        raise ValueError(f"Unknown resource profile {name!r}; known: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+class BlockingTimings:
+    """Seconds each test took with its profile applied and with everything loaded.
+
+    Timings are kept in ``path`` across runs: a run with
+    ``RESOURCE_BLOCKING=0`` records the ``full`` side, a normal run the
+    ``blocked`` side, and ``speedups`` compares the tests timed both ways.
+    """
+
+    def __init__(self, path=TIMINGS_FILE):
+        self.path = path
+        self.timings = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.timings = json.load(f)
+        self.recorded = 0
+
+    def record(self, nodeid, profile, blocked, seconds):
+        entry = self.timings.setdefault(nodeid, {})
+        if entry.get("profile") != profile.name:
+            # Blocked timings of another profile no longer describe this test
+            entry.pop("blocked", None)
+        entry["profile"] = profile.name
+        entry["blocked" if blocked else "full"] = seconds
+        self.recorded += 1
+
+    def speedups(self):
+        """``{profile: (tests, full_seconds, blocked_seconds)}`` over tests timed both ways"""
+        result = {}
+        for entry in self.timings.values():
+            if entry.get("profile") == "full" or "full" not in entry or "blocked" not in entry:
+                continue
+            tests, full, blocked = result.get(entry["profile"], (0, 0.0, 0.0))
+            result[entry["profile"]] = (tests + 1, full + entry["full"], blocked + entry["blocked"])
+        return result
+
+    def merge(self, path):
+        """Fold in the timings another process wrote to ``path``"""
+        with open(path) as f:
+            for nodeid, entry in json.load(f).items():
+                self.timings.setdefault(nodeid, {}).update(entry)
+
+    def write(self, path=None):
+        with open(path or self.path, "w") as f:
+            json.dump(self.timings, f, indent=2, sort_keys=True)
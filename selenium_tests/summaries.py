@@ -0,0 +1,105 @@
+"""
+Summaries - Terminal tables of the session's results, shared by pytest's summary and the parallel runner
+
+Each function writes through ``terminal``, anything with pytest's
+``TerminalReporter.write_sep``/``write_line``, and writes nothing when
+there is nothing to show.
+"""
+from perf_budgets import METRICS
+
+
+def performance_summary(terminal, results):
+    if not results.records:
+        return
+    terminal.write_sep("-", "page metrics (ms)")
+    terminal.write_line(f"{'page':<40} {'TTFB':>7} {'DCL':>7} {'load':>7} {'FCP':>7} {'LCP':>7} {'CLS':>6}")
+    for record in results.records:
+        cells = [
+            f"{record[field]:>7.0f}" if record[field] is not None else f"{'-':>7}"
+            for field in ("ttfb", "dom_content_loaded", "load", "fcp", "lcp")
+        ]
+        cls = f"{record['cls']:>6.3f}" if record["cls"] is not None else f"{'-':>6}"
+        terminal.write_line(f"{record['url'][-40:]:<40} {' '.join(cells)} {cls}")
+
+
+def benchmark_summary(terminal, results):
+    if not results.results:
+        return
+    terminal.write_sep("-", "benchmarks (s)")
+    terminal.write_line(
+        f"{'name':<40} {'n':>3} {'out':>3} {'p50':>7} {'p90':>7} {'p99':>7} {'stdev':>7}  CI of p50"
+    )
+    for r in results.results:
+        terminal.write_line(
+            f"{r.name[-40:]:<40} {len(r.kept):>3} {len(r.outliers):>3} {r.p50:>7.3f} {r.p90:>7.3f} "
+            f"{r.p99:>7.3f} {r.stdev:>7.3f}  [{r.ci_low:.3f}, {r.ci_high:.3f}]"
+        )
+
+
+def budget_summary(terminal, book):
+    if not book.evaluations:
+        return
+    terminal.write_sep("-", "performance budgets (pass/warn/fail)")
+    terminal.write_line(f"{'budget':<16}" + "".join(f"{metric:>15}" for metric in METRICS))
+    for budget, row in book.matrix().items():
+        cells = []
+        for metric in METRICS:
+            cell = row.get(metric)
+            cells.append(f"{cell['pass']}/{cell['warn']}/{cell['fail']}" if cell else "-")
+        terminal.write_line(f"{budget:<16}" + "".join(f"{c:>15}" for c in cells))
+    failures = book.failures()
+    if failures:
+        terminal.write_line("")
+        terminal.write_line(f"{len(failures)} pages over budget, see BUDGET_REPORT.json")
+
+
+def load_summary(terminal, results):
+    if not results.records:
+        return
+    terminal.write_sep("-", "load tests")
+    for record in results.records:
+        terminal.write_line("")
+        terminal.write_line(record["test"])
+        for line in record["text"].splitlines():
+            terminal.write_line(f"  {line}" if line else "")
+
+
+def context_memory_summary(terminal, memory):
+    if not memory.records:
+        return
+    terminal.write_sep("-", "browser contexts (MB)")
+    terminal.write_line(f"{'test':<60} {'heap':>7} {'nodes':>7} {'browser':>8} {'contexts':>8}")
+    for record in memory.records:
+        rss = f"{record['browser_rss_mb']:>8.0f}" if record["browser_rss_mb"] is not None else f"{'-':>8}"
+        terminal.write_line(
+            f"{record['test'][-60:]:<60} {record['js_heap_used_mb']:>7.1f} {record['nodes']:>7} {rss} "
+            f"{record['live_contexts']:>8}"
+        )
+    peak = memory.peak_rss()
+    if peak is not None:
+        terminal.write_line(f"Shared Chrome peaked at {peak:.0f} MB resident")
+
+
+def blocking_summary(terminal, timings):
+    speedups = timings.speedups()
+    if not speedups:
+        return
+    terminal.write_sep("-", "resource blocking (s)")
+    terminal.write_line(f"{'profile':<16} {'tests':>5} {'full':>9} {'blocked':>9} {'speedup':>8}")
+    for name, (tests, full, blocked) in sorted(speedups.items()):
+        speedup = f"{full / blocked:>7.2f}x" if blocked else f"{'-':>8}"
+        terminal.write_line(f"{name:<16} {tests:>5} {full:>9.1f} {blocked:>9.1f} {speedup}")
+
+
+def asset_proxy_summary(terminal, stats):
+    if not stats.cacheable:
+        return
+    terminal.write_sep("-", "asset proxy")
+    terminal.write_line(
+        f"{stats.cacheable} static asset requests: {stats.hits} cache hits, {stats.revalidated} revalidated, "
+        f"{stats.misses} fetched ({stats.hit_ratio:.1%} hit ratio)"
+    )
+    terminal.write_line(
+        f"{stats.bytes_saved / 1024 / 1024:.1f} MB served from the cache, "
+        f"{stats.bytes_fetched / 1024 / 1024:.1f} MB fetched from the application"
+    )
@@ -4,27 +4,26 @@ Accessibility Tests - Basic accessibility checks
 import pytest
 from selenium.webdriver.common.by import By
 from conftest import report_issue
-import time
+from dom_snapshot import snapshot
 
 
 class TestAccessibility:
     """Test basic accessibility features"""
 
-    def test_images_have_alt_text(self, driver, base_url, issues_collector):
+    def test_images_have_alt_text(self, driver, base_url, waits, issues_collector):
         """Test that images have alt text"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            images = driver.find_elements(By.TAG_NAME, "img")
+            images = snapshot(driver, "img", attributes=["alt", "src"])
 
             images_without_alt = []
             for img in images:
-                alt = img.get_attribute("alt")
-                src = img.get_attribute("src")
+                alt = img.attr("alt")
                 if not alt or alt.strip() == "":
-                    images_without_alt.append(src)
+                    images_without_alt.append(img.attr("src"))
 
             if images_without_alt:
                 report_issue(
@@ -40,24 +39,25 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_form_labels(self, driver, base_url, issues_collector):
+    def test_form_labels(self, driver, base_url, waits, issues_collector):
         """Test that form inputs have associated labels"""
         url = f"{base_url}/es/users/sign_up"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            inputs = driver.find_elements(By.CSS_SELECTOR, "input[type='text'], input[type='email'], input[type='password'], input[type='tel'], textarea, select")
+            inputs = snapshot(
+                driver,
+                "input[type='text'], input[type='email'], input[type='password'], input[type='tel'], textarea, select",
+                attributes=["id", "aria-label", "aria-labelledby"],
+                properties=["labels.length"],
+            )
 
             unlabeled_inputs = []
             for inp in inputs:
-                input_id = inp.get_attribute("id")
+                input_id = inp.attr("id")
                 if input_id:
-                    label = driver.find_elements(By.CSS_SELECTOR, f"label[for='{input_id}']")
-                    aria_label = inp.get_attribute("aria-label")
-                    aria_labelledby = inp.get_attribute("aria-labelledby")
-
-                    if not label and not aria_label and not aria_labelledby:
+                    if not inp.prop("labels.length") and not inp.attr("aria-label") and not inp.attr("aria-labelledby"):
                         unlabeled_inputs.append(input_id)
 
             if unlabeled_inputs:
@@ -74,15 +74,15 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_heading_hierarchy(self, driver, base_url, issues_collector):
+    def test_heading_hierarchy(self, driver, base_url, waits, issues_collector):
         """Test heading hierarchy (h1, h2, h3, etc.)"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Check for h1
-            h1_tags = driver.find_elements(By.TAG_NAME, "h1")
+            h1_tags = waits.probe(By.TAG_NAME, "h1")
             if len(h1_tags) == 0:
                 report_issue(
                     issues_collector, "MEDIUM", "No h1 tag on page",
@@ -97,12 +97,9 @@ class TestAccessibility:
                 )
 
             # Check heading hierarchy
-            headings = driver.find_elements(By.CSS_SELECTOR, "h1, h2, h3, h4, h5, h6")
+            headings = snapshot(driver, "h1, h2, h3, h4, h5, h6")
             if headings:
-                levels = []
-                for h in headings:
-                    level = int(h.tag_name[1])
-                    levels.append(level)
+                levels = [int(h.tag[1]) for h in headings]
 
                 # Check for skipped levels
                 for i in range(1, len(levels)):
@@ -121,23 +118,22 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_link_text_descriptive(self, driver, base_url, issues_collector):
+    def test_link_text_descriptive(self, driver, base_url, waits, issues_collector):
         """Test that links have descriptive text"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            links = driver.find_elements(By.TAG_NAME, "a")
+            links = snapshot(driver, "a", attributes=["href"], text=True)
 
             vague_link_texts = ["click here", "here", "read more", "more", "link"]
             vague_links = []
 
             for link in links:
-                text = link.text.strip().lower()
+                text = link.text.lower()
                 if text in vague_link_texts:
-                    href = link.get_attribute("href")
-                    vague_links.append((text, href))
+                    vague_links.append((text, link.attr("href")))
 
             if vague_links:
                 report_issue(
@@ -153,23 +149,23 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_color_contrast_basic(self, driver, base_url, issues_collector):
+    def test_color_contrast_basic(self, driver, base_url, waits, issues_collector):
         """Basic check for very light text (potential contrast issues)"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # This is a basic check - full contrast testing requires specialized tools
-            elements = driver.find_elements(By.CSS_SELECTOR, "p, span, a, li, h1, h2, h3, h4")
+            elements = snapshot(driver, "p, span, a, li, h1, h2, h3, h4", styles=["color", "background-color"])
 
             light_text_count = 0
-            for elem in elements[:50]:  # Check first 50 elements
-                color = elem.value_of_css_property("color")
+            for elem in elements:
+                color = elem.style("color")
                 if color:
                     # Very basic check for near-white colors
                     if "rgba(255, 255, 255" in color or "rgb(255, 255, 255" in color:
-                        bg_color = elem.value_of_css_property("background-color")
+                        bg_color = elem.style("background-color")
                         if "rgba(255, 255, 255" in bg_color or "transparent" in bg_color:
                             light_text_count += 1
 
@@ -187,15 +183,15 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_focus_indicators(self, driver, base_url, issues_collector):
+    def test_focus_indicators(self, driver, base_url, waits, issues_collector):
         """Test that interactive elements have focus indicators"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Find focusable elements
-            focusable = driver.find_elements(By.CSS_SELECTOR, "a, button, input, select, textarea")
+            focusable = waits.probe(By.CSS_SELECTOR, "a, button, input, select, textarea")
 
             elements_without_focus = 0
             for elem in focusable[:10]:  # Test first 10 elements
@@ -227,14 +223,14 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_skip_navigation_link(self, driver, base_url, issues_collector):
+    def test_skip_navigation_link(self, driver, base_url, waits, issues_collector):
         """Test for skip navigation link"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            skip_links = driver.find_elements(By.CSS_SELECTOR, "a[href='#main'], a[href='#content'], .skip-link, .skip-nav")
+            skip_links = waits.probe(By.CSS_SELECTOR, "a[href='#main'], a[href='#content'], .skip-link, .skip-nav")
 
             if not skip_links:
                 report_issue(
@@ -250,7 +246,7 @@ class TestAccessibility:
                 str(e)
             )
 
-    def test_language_attribute(self, driver, base_url, issues_collector):
+    def test_language_attribute(self, driver, base_url, waits, issues_collector):
         """Test that HTML has language attribute"""
         test_urls = [
             (f"{base_url}/es", "es"),
@@ -260,7 +256,7 @@ class TestAccessibility:
 
         for url, expected_lang in test_urls:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
             try:
                 html = driver.find_element(By.TAG_NAME, "html")
@@ -286,15 +282,15 @@ class TestAccessibility:
                     str(e)
                 )
 
-    def test_aria_roles(self, driver, base_url, issues_collector):
+    def test_aria_roles(self, driver, base_url, waits, issues_collector):
         """Test proper use of ARIA roles"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Check for main landmark
-            main = driver.find_elements(By.CSS_SELECTOR, "main, [role='main']")
+            main = waits.probe(By.CSS_SELECTOR, "main, [role='main']")
             if not main:
                 report_issue(
                     issues_collector, "LOW", "No main landmark",
@@ -303,7 +299,7 @@ class TestAccessibility:
                 )
 
             # Check for nav landmark
-            nav = driver.find_elements(By.CSS_SELECTOR, "nav, [role='navigation']")
+            nav = waits.probe(By.CSS_SELECTOR, "nav, [role='navigation']")
             if not nav:
                 report_issue(
                     issues_collector, "LOW", "No navigation landmark",
@@ -2,50 +2,23 @@
 Admin Pages Tests - Pages requiring admin authentication
 """
 import pytest
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from conftest import report_issue
-import time
+from conftest import fetch_signed_in, report_issue
 
 
+@pytest.mark.resources("lean")
+@pytest.mark.http
 class TestAdminPages:
     """Test admin panel pages"""
 
-    def admin_login(self, driver, base_url, admin_user):
-        """Helper method to log in as admin"""
-        url = f"{base_url}/es/users/sign_in"
-        driver.get(url)
-        time.sleep(2)
-
-        try:
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "user_email"))
-            )
-            email_field.clear()
-            email_field.send_keys(admin_user["email"])
-
-            password_field = driver.find_element(By.ID, "user_password")
-            password_field.clear()
-            password_field.send_keys(admin_user["password"])
-
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
-            return True
-        except Exception:
-            return False
-
-    def test_admin_dashboard(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_dashboard(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin dashboard loads"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Dashboard")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Admin Dashboard",
                     "Admin Dashboard", url, "Server Error",
@@ -54,7 +27,7 @@ class TestAdminPages:
                 return
 
             # Check if access denied
-            if "403" in driver.page_source or "Forbidden" in driver.page_source:
+            if page.forbidden:
                 report_issue(
                     issues_collector, "HIGH", "Access Denied to Admin Dashboard",
                     "Admin Dashboard", url, "Authorization Error",
@@ -68,16 +41,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_users_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_users_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin users management page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/users"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Users")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Admin Users Page",
                     "Admin Users", url, "Server Error",
@@ -91,16 +63,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_collaborations_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_collaborations_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin collaborations page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/collaborations"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Collaborations")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Collaborations",
                     "Admin Collaborations", url, "Server Error",
@@ -114,16 +85,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_microcredits_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_microcredits_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin microcredits page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/microcredits"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Microcredits")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Microcredits",
                     "Admin Microcredits", url, "Server Error",
@@ -137,16 +107,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_votes_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_votes_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin votes page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/votes"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Votes")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Votes",
                     "Admin Votes", url, "Server Error",
@@ -160,16 +129,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_proposals_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_proposals_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin proposals page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/proposals"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Proposals")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Proposals",
                     "Admin Proposals", url, "Server Error",
@@ -183,16 +151,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_impulsa_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_impulsa_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin impulsa page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/impulsa"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Impulsa")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Impulsa",
                     "Admin Impulsa", url, "Server Error",
@@ -206,16 +173,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_census_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_census_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin census page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/census"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Census")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Census",
                     "Admin Census", url, "Server Error",
@@ -229,16 +195,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_participation_teams_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_participation_teams_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin participation teams page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/participation_teams"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Participation Teams")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Participation Teams",
                     "Admin Participation Teams", url, "Server Error",
@@ -252,16 +217,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_pages_cms(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_pages_cms(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin CMS pages management"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/pages"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin CMS Pages")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin CMS Pages",
                     "Admin CMS Pages", url, "Server Error",
@@ -275,16 +239,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_categories_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_categories_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin categories page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/categories"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Categories")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Categories",
                     "Admin Categories", url, "Server Error",
@@ -298,16 +261,15 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_admin_notices_page(self, driver, base_url, admin_user, issues_collector):
+    def test_admin_notices_page(self, base_url, admin_user, page_fetcher, issues_collector):
         """Test admin notices page"""
-        self.admin_login(driver, base_url, admin_user)
-
         url = f"{base_url}/admin/notices"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, admin_user, issues_collector, "Admin Notices")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Admin Notices",
                     "Admin Notices", url, "Server Error",
@@ -321,44 +283,24 @@ class TestAdminPages:
                 str(e)
             )
 
-    def test_non_admin_access_denied(self, driver, base_url, test_user, issues_collector):
+    def test_non_admin_access_denied(self, base_url, test_user, page_fetcher, issues_collector):
         """Test that non-admin users cannot access admin pages"""
-        # Login as regular user
-        url = f"{base_url}/es/users/sign_in"
-        driver.get(url)
-        time.sleep(2)
-
         try:
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "user_email"))
-            )
-            email_field.clear()
-            email_field.send_keys(test_user["email"])
-
-            password_field = driver.find_element(By.ID, "user_password")
-            password_field.clear()
-            password_field.send_keys(test_user["password"])
-
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
-
-            # Try to access admin
+            # Try to access admin as a regular user
             admin_url = f"{base_url}/admin"
-            driver.get(admin_url)
-            time.sleep(2)
+            page = page_fetcher.fetch(admin_url, user=test_user)
 
             # Should be denied or redirected
-            if "admin" in driver.current_url.lower() and "500" not in driver.page_source:
+            if "admin" in page.final_url.lower() and not page.server_error:
                 # Check if actually showing admin content
-                if "dashboard" in driver.page_source.lower() or "users" in driver.page_source.lower():
+                if "dashboard" in page.text.lower() or "users" in page.text.lower():
                     report_issue(
                         issues_collector, "CRITICAL", "Non-admin can access admin area",
                         "Admin Access Control", admin_url, "Security Issue",
                         "Regular user was able to access admin dashboard"
                     )
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on admin access denial",
                     "Admin Access Control", admin_url, "Server Error",
@@ -4,6 +4,7 @@ API Endpoint Tests - Test API responses and error handling
 import pytest
 import requests
 from conftest import report_issue
+from rate_limit import is_rate_limited
 import json
 
 
@@ -250,8 +251,8 @@ class TestAPIEndpoints:
                     "user[password]": "wrongpassword"
                 }, timeout=5)
 
-                if response.status_code == 429:
-                    # Rate limiting is working
+                if is_rate_limited(response.status_code):
+                    # Rate limiting is working; the load generator's adaptive mode backs off on the same signal
                     return
 
                 if response.status_code >= 500:
@@ -268,7 +269,7 @@ class TestAPIEndpoints:
         except Exception:
             pass
 
-    def test_csrf_token_presence(self, driver, base_url, issues_collector):
+    def test_csrf_token_presence(self, driver, base_url, waits, issues_collector):
         """Test that forms have CSRF tokens"""
         from selenium.webdriver.common.by import By
 
@@ -276,7 +277,7 @@ class TestAPIEndpoints:
         driver.get(url)
 
         try:
-            csrf_token = driver.find_elements(By.CSS_SELECTOR, "input[name='authenticity_token'], meta[name='csrf-token']")
+            csrf_token = waits.selector(By.CSS_SELECTOR, "input[name='authenticity_token'], meta[name='csrf-token']")
 
             if not csrf_token:
                 report_issue(
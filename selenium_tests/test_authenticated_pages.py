@@ -2,51 +2,22 @@
 Authenticated Pages Tests - Pages requiring user login
 """
 import pytest
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from conftest import report_issue
-import time
+from conftest import fetch_signed_in, report_issue
 
 
+@pytest.mark.http
 class TestAuthenticatedPages:
     """Test pages that require authentication"""
 
-    def login(self, driver, base_url, user):
-        """Helper method to log in a user"""
-        url = f"{base_url}/es/users/sign_in"
-        driver.get(url)
-        time.sleep(2)
-
-        try:
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "user_email"))
-            )
-            email_field.clear()
-            email_field.send_keys(user["email"])
-
-            password_field = driver.find_element(By.ID, "user_password")
-            password_field.clear()
-            password_field.send_keys(user["password"])
-
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
-            return True
-        except Exception:
-            return False
-
-    def test_user_profile_page(self, driver, base_url, test_user, issues_collector):
+    def test_user_profile_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test user profile page loads after login"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/users/edit"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "User Profile")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on User Profile Page",
                     "User Profile", url, "Server Error",
@@ -55,7 +26,7 @@ class TestAuthenticatedPages:
                 return
 
             # Check for profile form elements
-            if "sign_in" in driver.current_url:
+            if page.redirected_to_sign_in:
                 report_issue(
                     issues_collector, "HIGH", "Redirected to login from profile",
                     "User Profile", url, "Authentication Error",
@@ -69,15 +40,17 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_user_dashboard(self, driver, base_url, test_user, issues_collector):
+    def test_user_dashboard(self, base_url, test_user, page_fetcher, issues_collector):
         """Test user dashboard/home after login"""
-        self.login(driver, base_url, test_user)
-        time.sleep(2)
+        url = f"{base_url}/es"
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Dashboard")
+        if page is None:
+            return
 
         try:
-            current_url = driver.current_url
+            current_url = page.final_url
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Dashboard",
                     "Dashboard", current_url, "Server Error",
@@ -87,20 +60,19 @@ class TestAuthenticatedPages:
         except Exception as e:
             report_issue(
                 issues_collector, "MEDIUM", "Dashboard test failed",
-                "Dashboard", driver.current_url, "Test Error",
+                "Dashboard", page.final_url, "Test Error",
                 str(e)
             )
 
-    def test_tools_page(self, driver, base_url, test_user, issues_collector):
+    def test_tools_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test tools/herramientas page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/herramientas"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Tools Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Tools Page",
                     "Tools Page", url, "Server Error",
@@ -114,16 +86,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_participation_page(self, driver, base_url, test_user, issues_collector):
+    def test_participation_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test participation page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/participa"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Participation Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Participation Page",
                     "Participation Page", url, "Server Error",
@@ -137,16 +108,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_proposals_page(self, driver, base_url, test_user, issues_collector):
+    def test_proposals_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test proposals page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/propuestas"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Proposals Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Proposals Page",
                     "Proposals Page", url, "Server Error",
@@ -160,16 +130,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_votes_page(self, driver, base_url, test_user, issues_collector):
+    def test_votes_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test votes/votaciones page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/votos"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Votes Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Votes Page",
                     "Votes Page", url, "Server Error",
@@ -183,16 +152,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_militant_page(self, driver, base_url, test_user, issues_collector):
+    def test_militant_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test militant/militante page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/militante"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Militant Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Militant Page",
                     "Militant Page", url, "Server Error",
@@ -206,16 +174,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_census_page(self, driver, base_url, test_user, issues_collector):
+    def test_census_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test census page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/censo"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Census Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Census Page",
                     "Census Page", url, "Server Error",
@@ -229,16 +196,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_collaboration_authenticated(self, driver, base_url, test_user, issues_collector):
+    def test_collaboration_authenticated(self, base_url, test_user, page_fetcher, issues_collector):
         """Test collaboration page when authenticated"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/colabora"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Collaboration Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Authenticated Collaboration",
                     "Collaboration Page", url, "Server Error",
@@ -252,16 +218,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_microcredit_authenticated(self, driver, base_url, test_user, issues_collector):
+    def test_microcredit_authenticated(self, base_url, test_user, page_fetcher, issues_collector):
         """Test microcredit page when authenticated"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/microcreditos"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Microcredit Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Authenticated Microcredit",
                     "Microcredit Page", url, "Server Error",
@@ -275,16 +240,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_impulsa_authenticated(self, driver, base_url, test_user, issues_collector):
+    def test_impulsa_authenticated(self, base_url, test_user, page_fetcher, issues_collector):
         """Test impulsa page when authenticated"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/impulsa"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Impulsa Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Authenticated Impulsa",
                     "Impulsa Page", url, "Server Error",
@@ -298,16 +262,15 @@ class TestAuthenticatedPages:
                 str(e)
             )
 
-    def test_user_verification_page(self, driver, base_url, test_user, issues_collector):
+    def test_user_verification_page(self, base_url, test_user, page_fetcher, issues_collector):
         """Test user verification/SMS verification page"""
-        self.login(driver, base_url, test_user)
-
         url = f"{base_url}/es/verificacion"
-        driver.get(url)
-        time.sleep(2)
+        page = fetch_signed_in(page_fetcher, url, test_user, issues_collector, "Verification Page")
+        if page is None:
+            return
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Verification Page",
                     "Verification Page", url, "Server Error",
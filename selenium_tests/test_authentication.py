@@ -7,25 +7,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from conftest import report_issue
-import time
 
 
 class TestAuthentication:
     """Test authentication flows"""
 
-    def test_login_page_loads(self, driver, base_url, issues_collector):
+    def test_login_page_loads(self, driver, base_url, waits, page_state, issues_collector):
         """Test that login page loads correctly"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Check page title
-            assert "error" not in driver.title.lower(), "Error page displayed"
+            assert "error" not in page_state.title.lower(), "Error page displayed"
 
             # Check for login form
-            email_field = driver.find_elements(By.ID, "user_email")
-            password_field = driver.find_elements(By.ID, "user_password")
+            email_field = waits.selector(By.ID, "user_email")
+            password_field = waits.selector(By.ID, "user_password")
 
             if not email_field:
                 report_issue(
@@ -42,7 +41,7 @@ class TestAuthentication:
                 )
 
             # Check for 500 errors
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Login Page",
                     "Login Page", url, "Server Error",
@@ -56,11 +55,11 @@ class TestAuthentication:
                 str(e)
             )
 
-    def test_login_with_valid_credentials(self, driver, base_url, test_user, issues_collector):
+    def test_login_with_valid_credentials(self, driver, base_url, test_user, waits, page_state, issues_collector):
         """Test login with valid credentials"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Find and fill email
@@ -71,20 +70,19 @@ class TestAuthentication:
             email_field.send_keys(test_user["email"])
 
             # Find and fill password
-            password_field = driver.find_element(By.ID, "user_password")
+            password_field = waits.require(By.ID, "user_password")
             password_field.clear()
             password_field.send_keys(test_user["password"])
 
             # Submit form
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
+            submit_button = waits.require(By.NAME, "commit")
+            waits.submit(submit_button)
 
             # Check if login was successful
-            current_url = driver.current_url
+            current_url = page_state.url
 
             # Check for error messages
-            error_messages = driver.find_elements(By.CSS_SELECTOR, ".alert-danger, .alert-error, .error")
+            error_messages = waits.probe(By.CSS_SELECTOR, ".alert-danger, .alert-error, .error")
             if error_messages:
                 for error in error_messages:
                     if error.is_displayed():
@@ -95,7 +93,7 @@ class TestAuthentication:
                         )
 
             # Check for 500 error
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error after login attempt",
                     "Login Page", url, "Server Error",
@@ -115,11 +113,11 @@ class TestAuthentication:
                 str(e)
             )
 
-    def test_login_with_invalid_credentials(self, driver, base_url, issues_collector):
+    def test_login_with_invalid_credentials(self, driver, base_url, waits, page_state, issues_collector):
         """Test login with invalid credentials shows appropriate error"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             email_field = WebDriverWait(driver, 10).until(
@@ -128,16 +126,15 @@ class TestAuthentication:
             email_field.clear()
             email_field.send_keys("invalid@example.com")
 
-            password_field = driver.find_element(By.ID, "user_password")
+            password_field = waits.require(By.ID, "user_password")
             password_field.clear()
             password_field.send_keys("wrongpassword")
 
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
+            submit_button = waits.require(By.NAME, "commit")
+            waits.submit(submit_button)
 
             # Should show error message, not 500 error
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on invalid login",
                     "Login Page", url, "Server Error",
@@ -151,15 +148,15 @@ class TestAuthentication:
                 str(e)
             )
 
-    def test_registration_page_loads(self, driver, base_url, issues_collector):
+    def test_registration_page_loads(self, driver, base_url, waits, page_state, issues_collector):
         """Test that registration page loads correctly"""
         url = f"{base_url}/es/users/sign_up"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Check for 500 error
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Registration Page",
                     "Registration Page", url, "Server Error",
@@ -170,7 +167,7 @@ class TestAuthentication:
             # Check for registration form elements
             required_fields = ["user_email", "user_password", "user_first_name", "user_last_name"]
             for field_id in required_fields:
-                field = driver.find_elements(By.ID, field_id)
+                field = waits.selector(By.ID, field_id)
                 if not field:
                     report_issue(
                         issues_collector, "HIGH", f"Registration field missing: {field_id}",
@@ -185,14 +182,14 @@ class TestAuthentication:
                 str(e)
             )
 
-    def test_password_recovery_page_loads(self, driver, base_url, issues_collector):
+    def test_password_recovery_page_loads(self, driver, base_url, waits, page_state, issues_collector):
         """Test that password recovery page loads correctly"""
         url = f"{base_url}/es/users/password/new"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Password Recovery Page",
                     "Password Recovery Page", url, "Server Error",
@@ -201,7 +198,7 @@ class TestAuthentication:
                 return
 
             # Check for email field
-            email_field = driver.find_elements(By.ID, "user_email")
+            email_field = waits.selector(By.ID, "user_email")
             if not email_field:
                 report_issue(
                     issues_collector, "HIGH", "Email field missing on password recovery",
@@ -216,12 +213,12 @@ class TestAuthentication:
                 str(e)
             )
 
-    def test_logout_functionality(self, driver, base_url, test_user, issues_collector):
+    def test_logout_functionality(self, driver, base_url, test_user, waits, page_state, issues_collector):
         """Test logout functionality after login"""
         # First login
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             email_field = WebDriverWait(driver, 10).until(
@@ -230,26 +227,25 @@ class TestAuthentication:
             email_field.clear()
             email_field.send_keys(test_user["email"])
 
-            password_field = driver.find_element(By.ID, "user_password")
+            password_field = waits.require(By.ID, "user_password")
             password_field.clear()
             password_field.send_keys(test_user["password"])
 
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
+            submit_button = waits.require(By.NAME, "commit")
+            waits.submit(submit_button)
 
             # Try to find logout link
-            logout_link = driver.find_elements(By.CSS_SELECTOR, "a[href*='sign_out']")
+            logout_link = waits.selector(By.CSS_SELECTOR, "a[href*='sign_out']")
             if not logout_link:
                 report_issue(
                     issues_collector, "MEDIUM", "Logout link not found",
-                    "Dashboard", driver.current_url, "Missing Element",
+                    "Dashboard", page_state.url, "Missing Element",
                     "Could not find logout link after successful login"
                 )
 
         except Exception as e:
             report_issue(
                 issues_collector, "MEDIUM", "Logout test failed",
-                "Dashboard", driver.current_url, "Test Error",
+                "Dashboard", page_state.url, "Test Error",
                 str(e)
             )
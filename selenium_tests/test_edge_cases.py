@@ -3,16 +3,14 @@ Edge Cases Tests - Test unusual inputs and error scenarios
 """
 import pytest
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from conftest import report_issue
-import time
 
 
+@pytest.mark.resources("lean")
 class TestEdgeCases:
     """Test edge cases and unusual scenarios"""
 
-    def test_empty_parameters(self, driver, base_url, issues_collector):
+    def test_empty_parameters(self, driver, base_url, waits, page_state, issues_collector):
         """Test pages with empty/missing parameters"""
         urls_with_params = [
             f"{base_url}/es/microcreditos/",
@@ -22,16 +20,16 @@ class TestEdgeCases:
 
         for url in urls_with_params:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 on empty parameter",
                     "Edge Cases", url, "Server Error",
                     f"Server error when accessing URL with empty parameter"
                 )
 
-    def test_nonexistent_ids(self, driver, base_url, issues_collector):
+    def test_nonexistent_ids(self, driver, base_url, waits, page_state, issues_collector):
         """Test accessing resources with non-existent IDs"""
         urls = [
             f"{base_url}/es/microcreditos/999999999",
@@ -41,26 +39,26 @@ class TestEdgeCases:
 
         for url in urls:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 on non-existent ID",
                     "Edge Cases", url, "Server Error",
                     "Server error instead of 404 for non-existent resource"
                 )
 
-    def test_invalid_id_formats(self, driver, base_url, issues_collector):
+    def test_invalid_id_formats(self, driver, base_url, waits, page_state, issues_collector):
         """Test accessing resources with invalid ID formats"""
         invalid_ids = ["abc", "-1", "1.5", "null", "undefined", "' OR 1=1 --"]
 
         for invalid_id in invalid_ids:
             url = f"{base_url}/es/microcreditos/{invalid_id}"
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
-                page_source = driver.page_source.lower()
+            if page_state.server_error:
+                page_source = page_state.lower_text
                 # Check if database errors are exposed
                 if "activerecord" in page_source or "postgresql" in page_source:
                     report_issue(
@@ -75,16 +73,16 @@ class TestEdgeCases:
                         f"Server error with invalid ID format: {invalid_id}"
                     )
 
-    def test_very_long_urls(self, driver, base_url, issues_collector):
+    def test_very_long_urls(self, driver, base_url, waits, page_state, issues_collector):
         """Test handling of very long URLs"""
         long_path = "a" * 5000
         url = f"{base_url}/es/{long_path}"
 
         try:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 on very long URL",
                     "Edge Cases", url[:100] + "...", "Server Error",
@@ -95,7 +93,7 @@ class TestEdgeCases:
             # Very long URLs might cause browser/network issues
             pass
 
-    def test_special_characters_in_url(self, driver, base_url, issues_collector):
+    def test_special_characters_in_url(self, driver, base_url, waits, page_state, issues_collector):
         """Test special characters in URL paths"""
         special_paths = [
             "test<script>alert('xss')</script>",
@@ -109,9 +107,9 @@ class TestEdgeCases:
 
             try:
                 driver.get(url)
-                time.sleep(2)
+                waits.settle()
 
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "MEDIUM", "500 on special characters in URL",
                         "Edge Cases", url, "Server Error",
@@ -119,7 +117,7 @@ class TestEdgeCases:
                     )
 
                 # Check for path traversal
-                page_source = driver.page_source.lower()
+                page_source = page_state.lower_text
                 if "root:" in page_source or "/etc/passwd" in page_source:
                     report_issue(
                         issues_collector, "CRITICAL", "Path traversal vulnerability",
@@ -130,11 +128,11 @@ class TestEdgeCases:
             except Exception:
                 pass
 
-    def test_unicode_in_forms(self, driver, base_url, issues_collector):
+    def test_unicode_in_forms(self, driver, base_url, waits, page_state, issues_collector):
         """Test Unicode characters in form inputs"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         unicode_tests = [
             ("Japanese", "テスト@example.com"),
@@ -145,19 +143,18 @@ class TestEdgeCases:
 
         try:
             for test_name, email in unicode_tests:
-                email_field = driver.find_element(By.ID, "user_email")
+                email_field = waits.require(By.ID, "user_email")
                 email_field.clear()
                 email_field.send_keys(email)
 
-                password_field = driver.find_element(By.ID, "user_password")
+                password_field = waits.require(By.ID, "user_password")
                 password_field.clear()
                 password_field.send_keys("testpassword")
 
-                submit_button = driver.find_element(By.NAME, "commit")
-                submit_button.click()
-                time.sleep(2)
+                submit_button = waits.require(By.NAME, "commit")
+                waits.submit(submit_button)
 
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "MEDIUM", f"500 on {test_name} Unicode",
                         "Edge Cases", url, "Server Error",
@@ -166,7 +163,7 @@ class TestEdgeCases:
 
                 # Go back to login page for next test
                 driver.get(url)
-                time.sleep(1)
+                waits.settle()
 
         except Exception as e:
             report_issue(
@@ -175,20 +172,21 @@ class TestEdgeCases:
                 str(e)
             )
 
-    def test_concurrent_form_submissions(self, driver, base_url, issues_collector):
+    def test_concurrent_form_submissions(self, driver, base_url, waits, page_state, issues_collector):
         """Test rapid consecutive form submissions"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            email_field = driver.find_element(By.ID, "user_email")
+            email_field = waits.require(By.ID, "user_email")
             email_field.send_keys("test@example.com")
 
-            password_field = driver.find_element(By.ID, "user_password")
+            password_field = waits.require(By.ID, "user_password")
             password_field.send_keys("wrongpassword")
 
-            submit_button = driver.find_element(By.NAME, "commit")
+            submit_button = waits.require(By.NAME, "commit")
+            login_page = driver.find_element(By.TAG_NAME, "html")
 
             # Rapid clicks
             for _ in range(5):
@@ -197,9 +195,10 @@ class TestEdgeCases:
                 except Exception:
                     pass
 
-            time.sleep(3)
+            waits.page_replaced(login_page)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 on rapid form submission",
                     "Edge Cases", url, "Server Error",
@@ -209,25 +208,11 @@ class TestEdgeCases:
         except Exception as e:
             pass  # Rapid clicking might cause expected errors
 
-    def test_session_timeout_behavior(self, driver, base_url, test_user, issues_collector):
+    def test_session_timeout_behavior(self, driver, base_url, test_user, auth_cache, waits, page_state, issues_collector):
         """Test behavior when session expires"""
-        # Login first
-        login_url = f"{base_url}/es/users/sign_in"
-        driver.get(login_url)
-        time.sleep(2)
-
         try:
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "user_email"))
-            )
-            email_field.send_keys(test_user["email"])
-
-            password_field = driver.find_element(By.ID, "user_password")
-            password_field.send_keys(test_user["password"])
-
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
+            # Start from a signed-in page
+            auth_cache.get(driver, f"{base_url}/es", test_user)
 
             # Clear cookies to simulate session expiry
             driver.delete_all_cookies()
@@ -235,9 +220,9 @@ class TestEdgeCases:
             # Try to access protected page
             protected_url = f"{base_url}/es/users/edit"
             driver.get(protected_url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 on expired session",
                     "Edge Cases", protected_url, "Server Error",
@@ -251,7 +236,7 @@ class TestEdgeCases:
                 str(e)
             )
 
-    def test_direct_action_urls(self, driver, base_url, issues_collector):
+    def test_direct_action_urls(self, driver, base_url, waits, page_state, issues_collector):
         """Test direct access to action URLs"""
         action_urls = [
             f"{base_url}/es/users/sign_out",
@@ -261,16 +246,16 @@ class TestEdgeCases:
 
         for url in action_urls:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 on direct action URL",
                     "Edge Cases", url, "Server Error",
                     "Server error when accessing action URL directly"
                 )
 
-    def test_double_encoding(self, driver, base_url, issues_collector):
+    def test_double_encoding(self, driver, base_url, waits, page_state, issues_collector):
         """Test double URL encoding handling"""
         # Double encoded ../ = %252e%252e%252f
         encoded_paths = [
@@ -283,9 +268,9 @@ class TestEdgeCases:
 
             try:
                 driver.get(url)
-                time.sleep(2)
+                waits.settle()
 
-                if "500" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "MEDIUM", "500 on double-encoded URL",
                         "Edge Cases", url, "Server Error",
@@ -295,15 +280,15 @@ class TestEdgeCases:
             except Exception:
                 pass
 
-    def test_null_byte_injection(self, driver, base_url, issues_collector):
+    def test_null_byte_injection(self, driver, base_url, waits, page_state, issues_collector):
         """Test null byte injection handling"""
         url = f"{base_url}/es/test%00.html"
 
         try:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 on null byte in URL",
                     "Edge Cases", url, "Server Error",
@@ -313,16 +298,16 @@ class TestEdgeCases:
         except Exception:
             pass
 
-    def test_http_method_override(self, driver, base_url, issues_collector):
+    def test_http_method_override(self, driver, base_url, waits, page_state, issues_collector):
         """Test HTTP method override handling via _method parameter"""
         # This is more of an API test but can be done via form
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Try to inject _method parameter
-            email_field = driver.find_element(By.ID, "user_email")
+            email_field = waits.require(By.ID, "user_email")
             email_field.send_keys("test@example.com")
 
             # Execute JavaScript to add hidden _method field
@@ -337,11 +322,10 @@ class TestEdgeCases:
                 }
             """)
 
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(2)
+            submit_button = waits.require(By.NAME, "commit")
+            waits.submit(submit_button)
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 on method override injection",
                     "Edge Cases", url, "Server Error",
@@ -351,7 +335,7 @@ class TestEdgeCases:
         except Exception as e:
             pass
 
-    def test_missing_required_cookies(self, driver, base_url, issues_collector):
+    def test_missing_required_cookies(self, driver, base_url, waits, page_state, issues_collector):
         """Test behavior without cookies"""
         url = f"{base_url}/es"
 
@@ -360,9 +344,9 @@ class TestEdgeCases:
 
         try:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 without cookies",
                     "Edge Cases", url, "Server Error",
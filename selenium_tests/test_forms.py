@@ -3,15 +3,13 @@ Form Tests - Test form submissions and validations
 """
 import pytest
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from conftest import report_issue
-import time
 import random
 import string
 
 
+@pytest.mark.resources("lean")
 class TestForms:
     """Test form submissions and validations"""
 
@@ -20,21 +18,20 @@ class TestForms:
         random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=10))
         return f"test_{random_str}@example.com"
 
-    def test_registration_form_validation(self, driver, base_url, issues_collector):
+    def test_registration_form_validation(self, driver, base_url, waits, page_state, issues_collector):
         """Test registration form validation errors"""
         url = f"{base_url}/es/users/sign_up"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Try to submit empty form
-            submit_button = driver.find_elements(By.NAME, "commit")
+            submit_button = waits.probe(By.NAME, "commit")
             if submit_button:
-                submit_button[0].click()
-                time.sleep(2)
+                waits.submit(submit_button[0])
 
                 # Check for validation errors (not 500)
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "HIGH", "500 Error on empty registration form",
                         "Registration Form", url, "Validation Error",
@@ -48,11 +45,11 @@ class TestForms:
                 str(e)
             )
 
-    def test_registration_form_submission(self, driver, base_url, issues_collector):
+    def test_registration_form_submission(self, driver, base_url, waits, page_state, issues_collector):
         """Test registration form with valid data"""
         url = f"{base_url}/es/users/sign_up"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Fill in required fields
@@ -65,13 +62,13 @@ class TestForms:
             }
 
             for field_id, value in fields_to_fill.items():
-                field = driver.find_elements(By.ID, field_id)
+                field = waits.probe(By.ID, field_id)
                 if field:
                     field[0].clear()
                     field[0].send_keys(value)
 
             # Try to find document fields
-            doc_type = driver.find_elements(By.ID, "user_document_type")
+            doc_type = waits.probe(By.ID, "user_document_type")
             if doc_type:
                 try:
                     select = Select(doc_type[0])
@@ -79,18 +76,17 @@ class TestForms:
                 except Exception:
                     pass
 
-            doc_vatid = driver.find_elements(By.ID, "user_document_vatid")
+            doc_vatid = waits.probe(By.ID, "user_document_vatid")
             if doc_vatid:
                 doc_vatid[0].clear()
                 doc_vatid[0].send_keys("X1234567L")
 
             # Submit form
-            submit_button = driver.find_elements(By.NAME, "commit")
+            submit_button = waits.probe(By.NAME, "commit")
             if submit_button:
-                submit_button[0].click()
-                time.sleep(3)
+                waits.submit(submit_button[0])
 
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "CRITICAL", "500 Error on registration submission",
                         "Registration Form", url, "Server Error",
@@ -104,20 +100,19 @@ class TestForms:
                 str(e)
             )
 
-    def test_login_form_validation(self, driver, base_url, issues_collector):
+    def test_login_form_validation(self, driver, base_url, waits, page_state, issues_collector):
         """Test login form validation"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Submit empty form
-            submit_button = driver.find_elements(By.NAME, "commit")
+            submit_button = waits.probe(By.NAME, "commit")
             if submit_button:
-                submit_button[0].click()
-                time.sleep(2)
+                waits.submit(submit_button[0])
 
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "HIGH", "500 Error on empty login form",
                         "Login Form", url, "Validation Error",
@@ -131,24 +126,23 @@ class TestForms:
                 str(e)
             )
 
-    def test_password_recovery_form(self, driver, base_url, issues_collector):
+    def test_password_recovery_form(self, driver, base_url, waits, page_state, issues_collector):
         """Test password recovery form submission"""
         url = f"{base_url}/es/users/password/new"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            email_field = driver.find_elements(By.ID, "user_email")
+            email_field = waits.probe(By.ID, "user_email")
             if email_field:
                 email_field[0].clear()
                 email_field[0].send_keys("test@example.com")
 
-                submit_button = driver.find_elements(By.NAME, "commit")
+                submit_button = waits.probe(By.NAME, "commit")
                 if submit_button:
-                    submit_button[0].click()
-                    time.sleep(3)
+                    waits.submit(submit_button[0])
 
-                    if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                    if page_state.server_error:
                         report_issue(
                             issues_collector, "HIGH", "500 Error on password recovery",
                             "Password Recovery", url, "Server Error",
@@ -162,14 +156,14 @@ class TestForms:
                 str(e)
             )
 
-    def test_collaboration_form_loads(self, driver, base_url, issues_collector):
+    def test_collaboration_form_loads(self, driver, base_url, waits, page_state, issues_collector):
         """Test collaboration form loads properly"""
         url = f"{base_url}/es/colabora"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on collaboration form",
                     "Collaboration Form", url, "Server Error",
@@ -178,7 +172,7 @@ class TestForms:
                 return
 
             # Check for form elements
-            form = driver.find_elements(By.TAG_NAME, "form")
+            form = waits.selector(By.TAG_NAME, "form")
             if not form:
                 report_issue(
                     issues_collector, "HIGH", "No form on collaboration page",
@@ -193,14 +187,14 @@ class TestForms:
                 str(e)
             )
 
-    def test_single_collaboration_form(self, driver, base_url, issues_collector):
+    def test_single_collaboration_form(self, driver, base_url, waits, page_state, issues_collector):
         """Test single collaboration form"""
         url = f"{base_url}/es/colabora/puntual"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on single collaboration form",
                     "Single Collaboration Form", url, "Server Error",
@@ -209,7 +203,7 @@ class TestForms:
                 return
 
             # Check for amount selection
-            amount_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name*='amount'], input[type='radio'][name*='collaboration']")
+            amount_inputs = waits.selector(By.CSS_SELECTOR, "input[name*='amount'], input[type='radio'][name*='collaboration']")
             if not amount_inputs:
                 report_issue(
                     issues_collector, "MEDIUM", "No amount selection on single collaboration",
@@ -224,15 +218,15 @@ class TestForms:
                 str(e)
             )
 
-    def test_microcredit_form_loads(self, driver, base_url, issues_collector):
+    def test_microcredit_form_loads(self, driver, base_url, waits, page_state, issues_collector):
         """Test microcredit form loads properly"""
         # First check if there are active microcredits
         url = f"{base_url}/es/microcreditos"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on microcredit page",
                     "Microcredit Form", url, "Server Error",
@@ -241,8 +235,8 @@ class TestForms:
                 return
 
             # Look for form or "no active campaigns" message
-            forms = driver.find_elements(By.TAG_NAME, "form")
-            no_campaigns = "no hay" in driver.page_source.lower() or "no active" in driver.page_source.lower()
+            forms = waits.probe(By.TAG_NAME, "form")
+            no_campaigns = "no hay" in page_state.lower_text or "no active" in page_state.lower_text
 
             if not forms and not no_campaigns:
                 report_issue(
@@ -258,18 +252,18 @@ class TestForms:
                 str(e)
             )
 
-    def test_contact_form_if_exists(self, driver, base_url, issues_collector):
+    def test_contact_form_if_exists(self, driver, base_url, waits, page_state, issues_collector):
         """Test contact form if it exists"""
         url = f"{base_url}/es/contacto"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # 404 is acceptable if page doesn't exist
-            if "404" in driver.page_source or "not found" in driver.page_source.lower():
+            if page_state.status == 404:
                 return  # Page doesn't exist, that's OK
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on contact page",
                     "Contact Form", url, "Server Error",
@@ -283,34 +277,15 @@ class TestForms:
                 str(e)
             )
 
-    def test_profile_update_form(self, driver, base_url, test_user, issues_collector):
+    def test_profile_update_form(self, driver, base_url, test_user, auth_cache, waits, page_state, issues_collector):
         """Test profile update form"""
-        # Login first
-        login_url = f"{base_url}/es/users/sign_in"
-        driver.get(login_url)
-        time.sleep(2)
-
         try:
-            email_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "user_email"))
-            )
-            email_field.clear()
-            email_field.send_keys(test_user["email"])
-
-            password_field = driver.find_element(By.ID, "user_password")
-            password_field.clear()
-            password_field.send_keys(test_user["password"])
-
-            submit_button = driver.find_element(By.NAME, "commit")
-            submit_button.click()
-            time.sleep(3)
-
-            # Go to profile edit
+            # Go to profile edit as a signed-in user
             url = f"{base_url}/es/users/edit"
-            driver.get(url)
-            time.sleep(2)
+            auth_cache.get(driver, url, test_user)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on profile edit page",
                     "Profile Update Form", url, "Server Error",
@@ -319,7 +294,7 @@ class TestForms:
                 return
 
             # Check for form
-            form = driver.find_elements(By.TAG_NAME, "form")
+            form = waits.selector(By.TAG_NAME, "form")
             if not form:
                 report_issue(
                     issues_collector, "HIGH", "No form on profile edit page",
@@ -334,37 +309,36 @@ class TestForms:
                 str(e)
             )
 
-    def test_xss_in_forms(self, driver, base_url, issues_collector):
+    def test_xss_in_forms(self, driver, base_url, waits, page_state, issues_collector):
         """Test for XSS vulnerabilities in forms"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         xss_payload = "<script>alert('XSS')</script>"
 
         try:
-            email_field = driver.find_elements(By.ID, "user_email")
+            email_field = waits.probe(By.ID, "user_email")
             if email_field:
                 email_field[0].clear()
                 email_field[0].send_keys(xss_payload)
 
-                password_field = driver.find_element(By.ID, "user_password")
+                password_field = waits.require(By.ID, "user_password")
                 password_field.clear()
                 password_field.send_keys("test")
 
-                submit_button = driver.find_element(By.NAME, "commit")
-                submit_button.click()
-                time.sleep(2)
+                submit_button = waits.require(By.NAME, "commit")
+                waits.submit(submit_button)
 
                 # Check if script tag is rendered as-is (XSS vulnerability)
-                if "<script>alert('XSS')</script>" in driver.page_source:
+                if "<script>alert('XSS')</script>" in page_state.text:
                     report_issue(
                         issues_collector, "CRITICAL", "Potential XSS vulnerability",
                         "Login Form", url, "Security Issue",
                         "Script tag not properly escaped in form input"
                     )
 
-                if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                if page_state.server_error:
                     report_issue(
                         issues_collector, "MEDIUM", "500 Error on XSS test input",
                         "Login Form", url, "Server Error",
@@ -378,30 +352,29 @@ class TestForms:
                 str(e)
             )
 
-    def test_sql_injection_protection(self, driver, base_url, issues_collector):
+    def test_sql_injection_protection(self, driver, base_url, waits, page_state, issues_collector):
         """Test for SQL injection protection"""
         url = f"{base_url}/es/users/sign_in"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         sql_payload = "' OR '1'='1"
 
         try:
-            email_field = driver.find_elements(By.ID, "user_email")
+            email_field = waits.probe(By.ID, "user_email")
             if email_field:
                 email_field[0].clear()
                 email_field[0].send_keys(sql_payload)
 
-                password_field = driver.find_element(By.ID, "user_password")
+                password_field = waits.require(By.ID, "user_password")
                 password_field.clear()
                 password_field.send_keys(sql_payload)
 
-                submit_button = driver.find_element(By.NAME, "commit")
-                submit_button.click()
-                time.sleep(2)
+                submit_button = waits.require(By.NAME, "commit")
+                waits.submit(submit_button)
 
                 # Check for database errors (SQL injection might cause these)
-                page_source = driver.page_source.lower()
+                page_source = page_state.lower_text
                 sql_errors = ["sql", "syntax error", "postgresql", "pg::", "activerecord"]
                 for error in sql_errors:
                     if error in page_source:
@@ -412,7 +385,7 @@ class TestForms:
                         )
                         break
 
-                if "500" in driver.page_source and any(e in page_source for e in sql_errors):
+                if page_state.server_error and any(e in page_source for e in sql_errors):
                     report_issue(
                         issues_collector, "HIGH", "SQL error exposed on injection attempt",
                         "Login Form", url, "Security Issue",
@@ -0,0 +1,193 @@
+"""
+Load Tests - Drive the page catalogs with concurrent virtual users (set LOAD_TEST=1 to run)
+"""
+import os
+
+import pytest
+from conftest import report_issue
+from loadgen import (
+    AdaptiveEngine, CapacitySearch, LoadEngine, LoginBenchmark, OpenLoopEngine, Route, ScenarioRunner,
+    VoteBenchmark, VoteConfig, catalog_routes, load_scenarios,
+)
+from loadgen.vote import ELECTION_ID
+from page_catalog import CAPACITY_PAGES
+
+pytestmark = [
+    pytest.mark.load,
+    pytest.mark.skipif(os.environ.get("LOAD_TEST", "0") != "1", reason="load tests only run with LOAD_TEST=1"),
+]
+
+# Pages whose tail latency is checked under open-loop (fixed arrival rate) load
+TAIL_LATENCY_PAGES = ["/es", "/es/colabora", "/health"]
+
+# Share of started journeys that must reach the last step of their scenario
+MIN_COMPLETION = float(os.environ.get("LOAD_MIN_COMPLETION", "0.95"))
+
+# Share of vote token requests allowed to fail
+MAX_VOTE_ERROR_RATE = float(os.environ.get("LOAD_MAX_VOTE_ERROR_RATE", "0.01"))
+
+# Throughput (req/s) every capacity-searched page must sustain
+MIN_CAPACITY = float(os.environ.get("LOAD_MIN_CAPACITY", "10"))
+
+
+def _report_load_issues(report, routes, base_url, perf_budgets, issues_collector, page, percentile=95):
+    """Report failing routes, and routes whose ``percentile`` latency breaks their budget"""
+    for route in routes:
+        stats = report.routes.get(route.name)
+        url = f"{base_url}{route.path}"
+        if stats is None or not stats.count:
+            report_issue(
+                issues_collector, "HIGH", f"No responses under load: {route.path}",
+                page, url, "Performance Issue",
+                f"No request to {route.name} completed during the load run"
+            )
+            continue
+
+        if stats.failures:
+            report_issue(
+                issues_collector, "HIGH", f"Failures under load: {route.path}",
+                page, url, "Performance Issue",
+                f"{stats.failures} of {stats.count} requests failed "
+                f"(statuses: {dict(stats.statuses)}, errors: {dict(stats.errors)})"
+            )
+
+        latency = stats.latency.value_at_percentile(percentile)
+        verdict = perf_budgets.budget_for(url).check("response_time", latency)
+        if verdict in ("warn", "fail"):
+            report_issue(
+                issues_collector, "MEDIUM", f"Slow under load: {route.path}",
+                page, url, "Performance Issue",
+                f"p{percentile:g} response time was {latency:.0f}ms "
+                f"(p99.9 {stats.latency.value_at_percentile(99.9):.0f}ms) with {report.config.describe()} "
+                f"({verdict} of the response_time budget)"
+            )
+
+
+class TestLoad:
+    """Load the page catalogs over HTTP and check failures and tail latency"""
+
+    def test_public_pages_under_load(self, base_url, perf_budgets, record_load_report, issues_collector):
+        """Public pages keep answering under concurrent load"""
+        routes = catalog_routes(["public"])
+        report = LoadEngine(base_url, routes).run()
+        record_load_report(report)
+        _report_load_issues(report, routes, base_url, perf_budgets, issues_collector, "Load")
+
+    def test_authenticated_pages_under_load(self, base_url, test_user, auth_cache, perf_budgets, record_load_report,
+                                            issues_collector):
+        """Signed-in pages keep answering under concurrent load"""
+        routes = catalog_routes(["authenticated"], user=test_user)
+        report = LoadEngine(base_url, routes, auth_cache=auth_cache).run()
+        record_load_report(report)
+        _report_load_issues(report, routes, base_url, perf_budgets, issues_collector, "Load (Authenticated)")
+
+    def test_admin_pages_under_load(self, base_url, admin_user, auth_cache, perf_budgets, record_load_report,
+                                    issues_collector):
+        """Admin pages keep answering under concurrent load"""
+        routes = catalog_routes(["admin"], admin=admin_user)
+        report = LoadEngine(base_url, routes, auth_cache=auth_cache).run()
+        record_load_report(report)
+        _report_load_issues(report, routes, base_url, perf_budgets, issues_collector, "Load (Admin)")
+
+    def test_tail_latency_open_loop(self, base_url, perf_budgets, record_load_report, issues_collector):
+        """p99 of key pages at a fixed arrival rate, counting time queued behind slow responses"""
+        routes = [Route(path) for path in TAIL_LATENCY_PAGES]
+        report = OpenLoopEngine(base_url, routes).run()
+        record_load_report(report)
+        _report_load_issues(report, routes, base_url, perf_budgets, issues_collector, "Load (Open Loop)",
+                            percentile=99)
+
+    def test_public_pages_adaptive(self, base_url, record_load_report, issues_collector):
+        """AIMD-controlled load finds a concurrency at which public pages stay within latency and error targets"""
+        routes = catalog_routes(["public"])
+        report = AdaptiveEngine(base_url, routes).run()
+        record_load_report(report)
+
+        if report.safe_point() is None:
+            backoffs = sorted({reason for entry in report.history for reason in entry["backoff"]})
+            report_issue(
+                issues_collector, "HIGH", "No safe throughput under adaptive load",
+                "Load (Adaptive)", base_url, "Performance Issue",
+                f"Every window exceeded the targets even at {report.config.minimum} request(s) in flight "
+                f"(backoff on: {', '.join(backoffs)})"
+            )
+
+    def test_capacity_of_engine_pages(self, base_url, record_load_report, issues_collector):
+        """Each engine page sustains at least MIN_CAPACITY req/s before its knee"""
+        routes = [Route(path) for path in CAPACITY_PAGES]
+        report = CapacitySearch(base_url, routes).run()
+        record_load_report(report)
+
+        for capacity in report.routes:
+            best, knee = capacity.max_sustainable, capacity.knee
+            throughput = best.throughput if best else 0.0
+            if throughput < MIN_CAPACITY:
+                report_issue(
+                    issues_collector, "HIGH" if best is None else "MEDIUM",
+                    f"Low capacity: {capacity.route.path}", "Load (Capacity)",
+                    f"{base_url}{capacity.route.path}", "Performance Issue",
+                    f"Sustained {throughput:.1f} req/s (minimum {MIN_CAPACITY:g})"
+                    + (f"; tipped over at {knee.rate:g} req/s: {'; '.join(knee.reasons)}" if knee else "")
+                )
+
+    def test_user_journeys(self, base_url, user_pool, record_load_report, issues_collector):
+        """Concurrent virtual users complete the journeys of the scenario file, each as its own account"""
+        scenarios = load_scenarios()
+        report = ScenarioRunner(base_url, scenarios, users=user_pool.users).run()
+        record_load_report(report)
+
+        for scenario in scenarios:
+            completion = report.completion_rate(scenario)
+            if report.started_journeys[scenario.name] and completion < MIN_COMPLETION:
+                drops = ", ".join(f"{reason} ({n})" for reason, n in report.drop_reasons[scenario.name].most_common(3))
+                report_issue(
+                    issues_collector, "HIGH", f"Journey funnel breaks under load: {scenario.name}",
+                    "Load (Scenarios)", f"{base_url}{scenario.steps[0].path}", "Performance Issue",
+                    f"{completion:.1%} of {report.started_journeys[scenario.name]} journeys completed "
+                    f"(minimum {MIN_COMPLETION:.0%}); dropped at {drops}"
+                )
+
+    @pytest.mark.skipif(not ELECTION_ID, reason="set LOAD_ELECTION_ID to an open election to benchmark voting")
+    def test_vote_flow_throughput(self, base_url, user_pool, record_load_report, issues_collector):
+        """Signed-in voters get one distinct vote token each, at election-day concurrency"""
+        config = VoteConfig(vus=min(len(user_pool), VoteConfig(election_id=ELECTION_ID).vus))
+        voters = user_pool.take(config.vus)
+        try:
+            report = VoteBenchmark(base_url, voters, config).run()
+        finally:
+            for user in voters:
+                user_pool.release(user)
+        record_load_report(report)
+
+        url = f"{base_url}/es/vote/create_token/{ELECTION_ID}"
+        duplicates = report.duplicates()
+        if duplicates:
+            report_issue(
+                issues_collector, "CRITICAL", "Vote token voter id shared between accounts",
+                "Load (Votes)", url, "Data Integrity",
+                f"{len(duplicates)} voter ids were issued to more than one account, e.g. "
+                + "; ".join(f"{voter}: {', '.join(sorted(emails))}" for voter, emails in list(duplicates.items())[:3])
+            )
+        if report.error_rate() > MAX_VOTE_ERROR_RATE or report.sign_in_failures:
+            report_issue(
+                issues_collector, "HIGH", "Vote token requests failing under load",
+                "Load (Votes)", url, "Performance Issue",
+                f"{report.error_rate():.1%} of {report.token_requests()} token requests failed "
+                f"(rejected: {dict(report.rejected)}, sign-in failures: {dict(report.sign_in_failures)}); "
+                f"{report.token_throughput():.1f} tokens/s"
+            )
+
+    def test_login_throughput(self, base_url, user_pool, record_load_report, issues_collector):
+        """Sign-in keeps answering correctly as concurrency rises, and where it saturates is reported"""
+        report = LoginBenchmark(base_url, user_pool.users).run()
+        record_load_report(report)
+
+        url = f"{base_url}/es/users/sign_in"
+        for stage in report.stages:
+            if stage.errors:
+                report_issue(
+                    issues_collector, "HIGH", f"Sign-in errors at {stage.concurrency} concurrent logins",
+                    "Load (Login)", url, "Performance Issue",
+                    f"{sum(stage.errors.values())} of {stage.attempts} sign-ins went wrong ({dict(stage.errors)}); "
+                    f"p95 {stage.latency.value_at_percentile(95) or 0:.0f}ms"
+                )
@@ -6,35 +6,23 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from conftest import report_issue
-import time
-import requests
+from dom_snapshot import snapshot
+from link_checker import link_hrefs
 
 
 class TestNavigation:
     """Test navigation and links throughout the site"""
 
-    def test_main_navigation_links(self, driver, base_url, issues_collector):
+    def test_main_navigation_links(self, driver, base_url, waits, link_checker, issues_collector):
         """Test main navigation links work"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            # Find all navigation links
-            nav_links = driver.find_elements(By.CSS_SELECTOR, "nav a, .navbar a, .nav a, header a")
-
-            broken_links = []
-            for link in nav_links[:20]:  # Test first 20 links
-                href = link.get_attribute("href")
-                if href and href.startswith(("http", "/")):
-                    try:
-                        if href.startswith("/"):
-                            href = f"{base_url}{href}"
-                        response = requests.head(href, timeout=10, allow_redirects=True)
-                        if response.status_code >= 400:
-                            broken_links.append((href, response.status_code))
-                    except requests.RequestException:
-                        pass
+            # Check every navigation link; links seen on earlier pages come from the cache
+            nav_links = link_hrefs(driver, "nav a, .navbar a, .nav a, header a")
+            broken_links = link_checker.broken(nav_links)
 
             if broken_links:
                 for href, status in broken_links:
@@ -51,27 +39,15 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_footer_links(self, driver, base_url, issues_collector):
+    def test_footer_links(self, driver, base_url, waits, link_checker, issues_collector):
         """Test footer links work"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            footer_links = driver.find_elements(By.CSS_SELECTOR, "footer a")
-
-            broken_links = []
-            for link in footer_links[:15]:  # Test first 15 footer links
-                href = link.get_attribute("href")
-                if href and href.startswith(("http", "/")):
-                    try:
-                        if href.startswith("/"):
-                            href = f"{base_url}{href}"
-                        response = requests.head(href, timeout=10, allow_redirects=True)
-                        if response.status_code >= 400:
-                            broken_links.append((href, response.status_code))
-                    except requests.RequestException:
-                        pass
+            footer_links = link_hrefs(driver, "footer a")
+            broken_links = link_checker.broken(footer_links)
 
             if broken_links:
                 for href, status in broken_links:
@@ -88,30 +64,22 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_breadcrumb_navigation(self, driver, base_url, issues_collector):
+    def test_breadcrumb_navigation(self, driver, base_url, waits, link_checker, issues_collector):
         """Test breadcrumb navigation if present"""
         # Test on a page likely to have breadcrumbs
         url = f"{base_url}/es/colabora"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            breadcrumbs = driver.find_elements(By.CSS_SELECTOR, ".breadcrumb a, nav[aria-label='breadcrumb'] a")
+            breadcrumbs = link_hrefs(driver, ".breadcrumb a, nav[aria-label='breadcrumb'] a")
 
-            if breadcrumbs:
-                for crumb in breadcrumbs:
-                    href = crumb.get_attribute("href")
-                    if href:
-                        try:
-                            response = requests.head(href, timeout=10, allow_redirects=True)
-                            if response.status_code >= 500:
-                                report_issue(
-                                    issues_collector, "MEDIUM", "Breadcrumb link returns 500",
-                                    "Breadcrumb Navigation", href, "Server Error",
-                                    f"Breadcrumb link returns {response.status_code}"
-                                )
-                        except requests.RequestException:
-                            pass
+            for href, status in link_checker.broken(breadcrumbs, min_status=500):
+                report_issue(
+                    issues_collector, "MEDIUM", "Breadcrumb link returns 500",
+                    "Breadcrumb Navigation", href, "Server Error",
+                    f"Breadcrumb link returns {status}"
+                )
 
         except Exception as e:
             report_issue(
@@ -120,23 +88,23 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_language_switcher(self, driver, base_url, issues_collector):
+    def test_language_switcher(self, driver, base_url, waits, page_state, issues_collector):
         """Test language switcher works"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Find language switcher links
-            lang_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='/ca'], a[href*='/eu'], a[href*='/en']")
+            lang_links = waits.probe(By.CSS_SELECTOR, "a[href*='/ca'], a[href*='/eu'], a[href*='/en']")
 
             for link in lang_links[:4]:  # Test language links
                 href = link.get_attribute("href")
                 if href:
                     driver.get(href)
-                    time.sleep(2)
+                    waits.settle()
 
-                    if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                    if page_state.server_error:
                         report_issue(
                             issues_collector, "HIGH", "500 Error on language switch",
                             "Language Switcher", href, "Server Error",
@@ -150,7 +118,7 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_mobile_menu(self, driver, base_url, issues_collector):
+    def test_mobile_menu(self, driver, base_url, waits, issues_collector):
         """Test mobile menu functionality"""
         url = f"{base_url}/es"
 
@@ -158,17 +126,16 @@ class TestNavigation:
             # Set mobile viewport
             driver.set_window_size(375, 812)
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
             # Look for mobile menu toggle
-            menu_toggle = driver.find_elements(By.CSS_SELECTOR, ".navbar-toggle, .navbar-toggler, [data-toggle='collapse'], button[aria-label*='menu']")
+            menu_toggle = waits.probe(By.CSS_SELECTOR, ".navbar-toggle, .navbar-toggler, [data-toggle='collapse'], button[aria-label*='menu']")
 
             if menu_toggle and menu_toggle[0].is_displayed():
                 menu_toggle[0].click()
-                time.sleep(1)
 
                 # Check if menu expanded
-                mobile_menu = driver.find_elements(By.CSS_SELECTOR, ".navbar-collapse.in, .navbar-collapse.show, .mobile-menu.open")
+                mobile_menu = waits.selector(By.CSS_SELECTOR, ".navbar-collapse.in, .navbar-collapse.show, .mobile-menu.open", timeout=2)
                 if not mobile_menu:
                     report_issue(
                         issues_collector, "MEDIUM", "Mobile menu not expanding",
@@ -187,25 +154,25 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_back_button_behavior(self, driver, base_url, issues_collector):
+    def test_back_button_behavior(self, driver, base_url, waits, page_state, issues_collector):
         """Test back button works correctly"""
         try:
             # Navigate through pages
             driver.get(f"{base_url}/es")
-            time.sleep(2)
-            first_url = driver.current_url
+            waits.settle()
+            first_url = page_state.url
 
             driver.get(f"{base_url}/es/colabora")
-            time.sleep(2)
+            waits.settle()
 
             # Go back
             driver.back()
-            time.sleep(2)
+            waits.settle()
 
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page_state.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 Error on back navigation",
-                    "Back Navigation", driver.current_url, "Server Error",
+                    "Back Navigation", page_state.url, "Server Error",
                     "Error when using browser back button"
                 )
 
@@ -216,7 +183,7 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_pagination_if_present(self, driver, base_url, issues_collector):
+    def test_pagination_if_present(self, driver, base_url, waits, page_state, issues_collector):
         """Test pagination links if present"""
         # Test on pages likely to have pagination
         test_urls = [
@@ -226,22 +193,22 @@ class TestNavigation:
 
         for url in test_urls:
             driver.get(url)
-            time.sleep(2)
+            waits.settle()
 
             try:
-                if "500" in driver.page_source:
+                if page_state.server_error:
                     continue
 
                 # Find pagination
-                pagination = driver.find_elements(By.CSS_SELECTOR, ".pagination a, nav[aria-label='pagination'] a, .page-link")
+                pagination = waits.probe(By.CSS_SELECTOR, ".pagination a, nav[aria-label='pagination'] a, .page-link")
 
                 for page_link in pagination[:5]:  # Test first 5 pagination links
                     href = page_link.get_attribute("href")
                     if href:
                         driver.get(href)
-                        time.sleep(2)
+                        waits.settle()
 
-                        if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+                        if page_state.server_error:
                             report_issue(
                                 issues_collector, "MEDIUM", "500 Error on pagination",
                                 "Pagination", href, "Server Error",
@@ -255,15 +222,15 @@ class TestNavigation:
                     str(e)
                 )
 
-    def test_anchor_links(self, driver, base_url, issues_collector):
+    def test_anchor_links(self, driver, base_url, waits, issues_collector):
         """Test anchor links work correctly"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             # Find anchor links
-            anchor_links = driver.find_elements(By.CSS_SELECTOR, "a[href*='#']")
+            anchor_links = waits.probe(By.CSS_SELECTOR, "a[href*='#']")
 
             for link in anchor_links[:10]:  # Test first 10 anchor links
                 href = link.get_attribute("href")
@@ -271,9 +238,9 @@ class TestNavigation:
                     anchor = href.split("#")[-1]
                     if anchor:
                         # Check if target element exists
-                        target = driver.find_elements(By.ID, anchor)
+                        target = waits.probe(By.ID, anchor)
                         if not target:
-                            target = driver.find_elements(By.CSS_SELECTOR, f"[name='{anchor}']")
+                            target = waits.probe(By.CSS_SELECTOR, f"[name='{anchor}']")
 
                         # Only report if anchor seems intentional (not just "#")
                         if not target and anchor and anchor != "":
@@ -290,20 +257,22 @@ class TestNavigation:
                 str(e)
             )
 
-    def test_external_links(self, driver, base_url, issues_collector):
+    def test_external_links(self, driver, base_url, waits, issues_collector):
         """Test external links have proper attributes"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            # Find external links
-            external_links = driver.find_elements(By.CSS_SELECTOR, "a[href^='http']:not([href*='localhost'])")
+            # Every external link's attributes in one round trip
+            external_links = snapshot(
+                driver, "a[href^='http']:not([href*='localhost'])", attributes=["href", "target", "rel"]
+            )
 
-            for link in external_links[:10]:
-                href = link.get_attribute("href")
-                target = link.get_attribute("target")
-                rel = link.get_attribute("rel")
+            for link in external_links:
+                href = link.attr("href")
+                target = link.attr("target")
+                rel = link.attr("rel")
 
                 # External links should ideally open in new tab
                 if target != "_blank":
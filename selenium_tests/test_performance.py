@@ -4,38 +4,48 @@ Performance Tests - Test page load times and performance issues
 import pytest
 from selenium.webdriver.common.by import By
 from conftest import report_issue
+from dom_snapshot import snapshot
+from page_metrics import LoadNotMeasured
 import time
 import requests
 
 
+# Page timings and test_image_loading need every resource the browser would load
+@pytest.mark.resources("full")
 class TestPerformance:
     """Test page performance metrics"""
 
-    def test_page_load_time_home(self, driver, base_url, issues_collector):
+    def test_page_load_time_home(self, base_url, page_metrics, benchmark, perf_budgets, issues_collector):
         """Test home page load time"""
         url = f"{base_url}/es"
 
         try:
-            start_time = time.time()
-            driver.get(url)
-
-            # Wait for page to be complete
-            driver.execute_script("return document.readyState") == "complete"
-            load_time = time.time() - start_time
-
-            if load_time > 10:
+            # Browser-measured time from navigation start to the end of the load event
+            result = benchmark.run(url, lambda: page_metrics.load_seconds(url),
+                                   warmup_measure=lambda: page_metrics.load_seconds(url, record=False))
+            budget = perf_budgets.budget_for(url)
+            # Budgets given as a single number have no warn level
+            warn = budget.limit("load", "warn")
+
+            if result.exceeds(budget.limit("load") / 1000):
                 report_issue(
                     issues_collector, "HIGH", "Slow page load: Home",
                     "Performance", url, "Performance Issue",
-                    f"Home page took {load_time:.2f} seconds to load"
+                    f"Home page took {result.p50:.2f} seconds to load ({result.summary()})"
                 )
-            elif load_time > 5:
+            elif warn is not None and result.exceeds(warn / 1000):
                 report_issue(
                     issues_collector, "MEDIUM", "Moderate page load time: Home",
                     "Performance", url, "Performance Issue",
-                    f"Home page took {load_time:.2f} seconds to load"
+                    f"Home page took {result.p50:.2f} seconds to load ({result.summary()})"
                 )
 
+        except LoadNotMeasured as e:
+            report_issue(
+                issues_collector, "HIGH", "Page load not measured: Home",
+                "Performance", url, "Performance Issue",
+                str(e)
+            )
         except Exception as e:
             report_issue(
                 issues_collector, "MEDIUM", "Page load time test failed",
@@ -43,23 +53,27 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_page_load_time_collaboration(self, driver, base_url, issues_collector):
+    def test_page_load_time_collaboration(self, base_url, page_metrics, benchmark, perf_budgets, issues_collector):
         """Test collaboration page load time"""
         url = f"{base_url}/es/colabora"
 
         try:
-            start_time = time.time()
-            driver.get(url)
-            driver.execute_script("return document.readyState") == "complete"
-            load_time = time.time() - start_time
+            result = benchmark.run(url, lambda: page_metrics.load_seconds(url),
+                                   warmup_measure=lambda: page_metrics.load_seconds(url, record=False))
 
-            if load_time > 10:
+            if result.exceeds(perf_budgets.budget_for(url).limit("load") / 1000):
                 report_issue(
                     issues_collector, "HIGH", "Slow page load: Collaboration",
                     "Performance", url, "Performance Issue",
-                    f"Collaboration page took {load_time:.2f} seconds to load"
+                    f"Collaboration page took {result.p50:.2f} seconds to load ({result.summary()})"
                 )
 
+        except LoadNotMeasured as e:
+            report_issue(
+                issues_collector, "HIGH", "Page load not measured: Collaboration",
+                "Performance", url, "Performance Issue",
+                str(e)
+            )
         except Exception as e:
             report_issue(
                 issues_collector, "MEDIUM", "Collaboration load time test failed",
@@ -67,23 +81,27 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_page_load_time_login(self, driver, base_url, issues_collector):
+    def test_page_load_time_login(self, base_url, page_metrics, benchmark, perf_budgets, issues_collector):
         """Test login page load time"""
         url = f"{base_url}/es/users/sign_in"
 
         try:
-            start_time = time.time()
-            driver.get(url)
-            driver.execute_script("return document.readyState") == "complete"
-            load_time = time.time() - start_time
+            result = benchmark.run(url, lambda: page_metrics.load_seconds(url),
+                                   warmup_measure=lambda: page_metrics.load_seconds(url, record=False))
 
-            if load_time > 10:
+            if result.exceeds(perf_budgets.budget_for(url).limit("load") / 1000):
                 report_issue(
                     issues_collector, "HIGH", "Slow page load: Login",
                     "Performance", url, "Performance Issue",
-                    f"Login page took {load_time:.2f} seconds to load"
+                    f"Login page took {result.p50:.2f} seconds to load ({result.summary()})"
                 )
 
+        except LoadNotMeasured as e:
+            report_issue(
+                issues_collector, "HIGH", "Page load not measured: Login",
+                "Performance", url, "Performance Issue",
+                str(e)
+            )
         except Exception as e:
             report_issue(
                 issues_collector, "MEDIUM", "Login load time test failed",
@@ -91,56 +109,61 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_api_response_time(self, base_url, issues_collector):
+    def test_api_response_time(self, base_url, benchmark, perf_budgets, issues_collector):
         """Test API/AJAX endpoint response times"""
         endpoints = [
             "/health",
             "/es",
             "/es/colabora",
         ]
-
-        for endpoint in endpoints:
-            url = f"{base_url}{endpoint}"
-            try:
-                start_time = time.time()
-                response = requests.get(url, timeout=30)
-                response_time = time.time() - start_time
-
-                if response_time > 5:
+        with requests.Session() as session:
+            def timed_get(url):
+                start_time = time.monotonic()
+                session.get(url, timeout=30)
+                return time.monotonic() - start_time
+
+            for endpoint in endpoints:
+                url = f"{base_url}{endpoint}"
+                try:
+                    result = benchmark.run(url, lambda: timed_get(url))
+                    budget = perf_budgets.budget_for(url)
+                    warn = budget.limit("response_time", "warn")
+
+                    if result.exceeds(budget.limit("response_time") / 1000):
+                        report_issue(
+                            issues_collector, "HIGH", f"Slow response: {endpoint}",
+                            "Performance", url, "Performance Issue",
+                            f"Endpoint took {result.p50:.2f} seconds ({result.summary()})"
+                        )
+                    elif warn is not None and result.exceeds(warn / 1000):
+                        report_issue(
+                            issues_collector, "MEDIUM", f"Moderate response time: {endpoint}",
+                            "Performance", url, "Performance Issue",
+                            f"Endpoint took {result.p50:.2f} seconds ({result.summary()})"
+                        )
+
+                except requests.Timeout:
                     report_issue(
-                        issues_collector, "HIGH", f"Slow response: {endpoint}",
+                        issues_collector, "CRITICAL", f"Timeout: {endpoint}",
                         "Performance", url, "Performance Issue",
-                        f"Endpoint took {response_time:.2f} seconds"
+                        "Request timed out after 30 seconds"
                     )
-                elif response_time > 2:
+                except Exception as e:
                     report_issue(
-                        issues_collector, "MEDIUM", f"Moderate response time: {endpoint}",
-                        "Performance", url, "Performance Issue",
-                        f"Endpoint took {response_time:.2f} seconds"
+                        issues_collector, "MEDIUM", f"Response time test failed: {endpoint}",
+                        "Performance", url, "Test Error",
+                        str(e)
                     )
 
-            except requests.Timeout:
-                report_issue(
-                    issues_collector, "CRITICAL", f"Timeout: {endpoint}",
-                    "Performance", url, "Performance Issue",
-                    "Request timed out after 30 seconds"
-                )
-            except Exception as e:
-                report_issue(
-                    issues_collector, "MEDIUM", f"Response time test failed: {endpoint}",
-                    "Performance", url, "Test Error",
-                    str(e)
-                )
-
-    def test_asset_loading(self, driver, base_url, issues_collector):
+    def test_asset_loading(self, driver, base_url, waits, issues_collector):
         """Test that assets (CSS, JS) load correctly"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(3)
+        waits.settle()
 
         try:
             # Check for CSS load failures
-            css_links = driver.find_elements(By.CSS_SELECTOR, "link[rel='stylesheet']")
+            css_links = waits.probe(By.CSS_SELECTOR, "link[rel='stylesheet']")
             for css in css_links:
                 href = css.get_attribute("href")
                 if href:
@@ -156,7 +179,7 @@ class TestPerformance:
                         pass
 
             # Check for JS load failures
-            js_scripts = driver.find_elements(By.CSS_SELECTOR, "script[src]")
+            js_scripts = waits.probe(By.CSS_SELECTOR, "script[src]")
             for script in js_scripts:
                 src = script.get_attribute("src")
                 if src:
@@ -178,23 +201,21 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_image_loading(self, driver, base_url, issues_collector):
+    def test_image_loading(self, driver, base_url, waits, issues_collector):
         """Test that images load correctly"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(3)
+        waits.settle()
 
         try:
-            images = driver.find_elements(By.TAG_NAME, "img")
+            images = snapshot(driver, "img", attributes=["src"], properties=["naturalWidth"])
 
             broken_images = []
             for img in images:
-                src = img.get_attribute("src")
-                if src:
-                    # Check if image is naturally loaded
-                    natural_width = driver.execute_script("return arguments[0].naturalWidth", img)
-                    if natural_width == 0:
-                        broken_images.append(src)
+                src = img.attr("src")
+                # Check if image is naturally loaded
+                if src and img.prop("naturalWidth") == 0:
+                    broken_images.append(src)
 
             if broken_images:
                 report_issue(
@@ -210,11 +231,11 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_console_errors(self, driver, base_url, issues_collector):
+    def test_console_errors(self, driver, base_url, waits, issues_collector):
         """Check for JavaScript console errors"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(3)
+        waits.settle()
 
         try:
             logs = driver.get_log("browser")
@@ -232,16 +253,16 @@ class TestPerformance:
             # Browser logs might not be available in all configurations
             pass
 
-    def test_large_dom_size(self, driver, base_url, issues_collector):
+    def test_large_dom_size(self, driver, base_url, waits, perf_budgets, issues_collector):
         """Test for excessively large DOM"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
             dom_element_count = driver.execute_script("return document.getElementsByTagName('*').length")
 
-            if dom_element_count > 3000:
+            if dom_element_count > perf_budgets.budget_for(url).limit("dom_nodes"):
                 report_issue(
                     issues_collector, "MEDIUM", "Large DOM size",
                     "Performance", url, "Performance Issue",
@@ -255,17 +276,17 @@ class TestPerformance:
                 str(e)
             )
 
-    def test_lazy_loading(self, driver, base_url, issues_collector):
+    def test_lazy_loading(self, driver, base_url, waits, issues_collector):
         """Check if images use lazy loading"""
         url = f"{base_url}/es"
         driver.get(url)
-        time.sleep(2)
+        waits.settle()
 
         try:
-            images = driver.find_elements(By.TAG_NAME, "img")
+            images = snapshot(driver, "img", attributes=["loading"])
 
             if len(images) > 10:
-                lazy_images = [img for img in images if img.get_attribute("loading") == "lazy"]
+                lazy_images = [img for img in images if img.attr("loading") == "lazy"]
 
                 if len(lazy_images) == 0:
                     report_issue(
@@ -2,14 +2,11 @@
 Public Pages Tests - Pages accessible without authentication
 """
 import pytest
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from conftest import report_issue
-import time
 import requests
 
 
+@pytest.mark.http
 class TestPublicPages:
     """Test public pages accessibility and functionality"""
 
@@ -31,13 +28,12 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_root_redirect(self, driver, base_url, issues_collector):
+    def test_root_redirect(self, base_url, page_fetcher, issues_collector):
         """Test root URL redirects correctly"""
-        driver.get(base_url)
-        time.sleep(2)
+        page = page_fetcher.fetch(base_url)
 
         try:
-            current_url = driver.current_url
+            current_url = page.final_url
             # Should redirect to /es or /en or locale-prefixed URL
             if not any(locale in current_url for locale in ["/es", "/en", "/ca", "/eu"]):
                 report_issue(
@@ -47,7 +43,7 @@ class TestPublicPages:
                 )
 
             # Check for errors
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on root URL",
                     "Root URL", base_url, "Server Error",
@@ -61,14 +57,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_spanish_locale(self, driver, base_url, issues_collector):
+    def test_spanish_locale(self, base_url, page_fetcher, issues_collector):
         """Test Spanish locale loads correctly"""
         url = f"{base_url}/es"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "CRITICAL", "500 Error on Spanish locale",
                     "Spanish Home", url, "Server Error",
@@ -77,8 +72,8 @@ class TestPublicPages:
                 return
 
             # Check page loaded properly
-            page_source = driver.page_source.lower()
-            if "error" in driver.title.lower() and "exception" in page_source:
+            page_source = page.text.lower()
+            if "error" in page.title.lower() and "exception" in page_source:
                 report_issue(
                     issues_collector, "HIGH", "Error on Spanish locale page",
                     "Spanish Home", url, "Page Error",
@@ -92,14 +87,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_catalan_locale(self, driver, base_url, issues_collector):
+    def test_catalan_locale(self, base_url, page_fetcher, issues_collector):
         """Test Catalan locale loads correctly"""
         url = f"{base_url}/ca"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Catalan locale",
                     "Catalan Home", url, "Server Error",
@@ -113,14 +107,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_basque_locale(self, driver, base_url, issues_collector):
+    def test_basque_locale(self, base_url, page_fetcher, issues_collector):
         """Test Basque locale loads correctly"""
         url = f"{base_url}/eu"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Basque locale",
                     "Basque Home", url, "Server Error",
@@ -134,15 +127,14 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_404_page(self, driver, base_url, issues_collector):
+    def test_404_page(self, base_url, page_fetcher, issues_collector):
         """Test 404 error page displays correctly"""
         url = f"{base_url}/es/nonexistent-page-12345"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
             # Should show 404, not 500
-            if "500" in driver.page_source or "Internal Server Error" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error instead of 404",
                     "404 Page", url, "Error Handling",
@@ -156,14 +148,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_collaboration_page(self, driver, base_url, issues_collector):
+    def test_collaboration_page(self, base_url, page_fetcher, issues_collector):
         """Test collaboration (donation) page loads"""
         url = f"{base_url}/es/colabora"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Collaboration Page",
                     "Collaboration Page", url, "Server Error",
@@ -171,9 +162,8 @@ class TestPublicPages:
                 )
                 return
 
-            # Check for form elements
-            page_source = driver.page_source
-            if "error" in driver.title.lower():
+            # Check for an error page
+            if "error" in page.title.lower():
                 report_issue(
                     issues_collector, "HIGH", "Error on Collaboration Page",
                     "Collaboration Page", url, "Page Error",
@@ -187,14 +177,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_single_collaboration_page(self, driver, base_url, issues_collector):
+    def test_single_collaboration_page(self, base_url, page_fetcher, issues_collector):
         """Test single collaboration page loads"""
         url = f"{base_url}/es/colabora/puntual"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Single Collaboration Page",
                     "Single Collaboration", url, "Server Error",
@@ -208,14 +197,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_microcredit_page(self, driver, base_url, issues_collector):
+    def test_microcredit_page(self, base_url, page_fetcher, issues_collector):
         """Test microcredit page loads"""
         url = f"{base_url}/es/microcreditos"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Microcredit Page",
                     "Microcredit Page", url, "Server Error",
@@ -229,14 +217,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_impulsa_page(self, driver, base_url, issues_collector):
+    def test_impulsa_page(self, base_url, page_fetcher, issues_collector):
         """Test Impulsa page loads"""
         url = f"{base_url}/es/impulsa"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "HIGH", "500 Error on Impulsa Page",
                     "Impulsa Page", url, "Server Error",
@@ -250,14 +237,13 @@ class TestPublicPages:
                 str(e)
             )
 
-    def test_audio_captcha_endpoint(self, driver, base_url, issues_collector):
+    def test_audio_captcha_endpoint(self, base_url, page_fetcher, issues_collector):
         """Test audio captcha endpoint"""
         url = f"{base_url}/es/audio_captcha"
-        driver.get(url)
-        time.sleep(2)
+        page = page_fetcher.fetch(url)
 
         try:
-            if "500" in driver.page_source:
+            if page.server_error:
                 report_issue(
                     issues_collector, "MEDIUM", "500 Error on Audio Captcha",
                     "Audio Captcha", url, "Server Error",
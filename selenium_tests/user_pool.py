@@ -0,0 +1,166 @@
+"""
+User pool - Many test accounts handed out to concurrent workers without overlap
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+
+from auth_session import AuthCache, AuthenticationError, extract_csrf_token
+
+USERS_FILE = os.environ.get("LOAD_USERS_FILE")
+PROVISION_PASSWORD = os.environ.get("LOAD_PROVISION_PASSWORD", "LoadTest123!")
+
+SIGN_UP_PATH = "/es/users/sign_up"
+REGISTRATION_PATH = "/es/users"
+# Id of the Devise registration form, still in the body when the form is rendered again
+REGISTRATION_FORM = 'id="new_user"'
+
+
+class PoolExhausted(Exception):
+    """Raised when no user became free in time, or the pool is smaller than requested"""
+
+
+def read_users(path):
+    """Credentials from a JSON list of ``{"email", "password"}`` or ``email:password`` lines"""
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [{"email": entry["email"], "password": entry["password"]} for entry in json.loads(text)]
+
+    users = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            email, _, password = line.partition(":")
+            users.append({"email": email, "password": password})
+    return users
+
+
+def register(base_url, user, index, timeout=10):
+    """Create ``user`` through the sign-up (registro) form; returns whether the form was accepted.
+
+    The form also asks for a captcha, so this only succeeds against a local
+    instance whose captcha check lets load-test registrations through and
+    whose users may sign in before confirming their email. A rejected form
+    is rendered again with a 200 at ``REGISTRATION_PATH``; an email that is
+    already taken is redirected like a success, which only signing in tells
+    apart (see ``UserPool.provision``).
+    """
+    with requests.Session() as session:
+        page = session.get(f"{base_url}{SIGN_UP_PATH}", timeout=timeout)
+        response = session.post(f"{base_url}{REGISTRATION_PATH}", data={
+            "authenticity_token": extract_csrf_token(page.text) or "",
+            "user[first_name]": "Load",
+            "user[last_name]": f"User {index}",
+            "user[document_type]": "3",
+            "user[document_vatid]": f"LOAD{index:08d}",
+            "user[born_at(1i)]": "1980",
+            "user[born_at(2i)]": "1",
+            "user[born_at(3i)]": "1",
+            "user[gender]": "O",
+            "user[country]": "DE",
+            "user[province]": "BE",
+            "user[town]": "Berlin",
+            "user[postal_code]": "10115",
+            "user[address]": "Load Test Street 1",
+            "user[email]": user["email"],
+            "user[email_confirmation]": user["email"],
+            "user[password]": user["password"],
+            "user[password_confirmation]": user["password"],
+            "user[terms_of_service]": "1",
+            "user[over_18]": "1",
+        }, timeout=timeout)
+    if response.status_code >= 400:
+        return False
+    path = urlsplit(response.url).path.rstrip("/")
+    return path not in (SIGN_UP_PATH, REGISTRATION_PATH) and REGISTRATION_FORM not in response.text
+
+
+class UserPool:
+    """Test accounts leased to one worker at a time.
+
+    ``acquire`` hands out a user nobody else holds, waiting up to
+    ``timeout`` seconds for one to be released; ``lease`` does the same as
+    a context manager and ``take`` reserves several users at once. Every
+    user keeps its own signed-in HTTP session in the shared ``AuthCache``,
+    so workers never share cookies, carts or rows the way they do with
+    the single ``TEST_USER``.
+    """
+
+    def __init__(self, users, auth_cache=None):
+        if not users:
+            raise ValueError("A user pool needs at least one user")
+        self.users = list(users)
+        self.auth_cache = auth_cache
+        self._free = list(self.users)
+        self._available = threading.Condition()
+
+    @classmethod
+    def from_file(cls, path=USERS_FILE, auth_cache=None):
+        return cls(read_users(path), auth_cache)
+
+    @classmethod
+    def provision(cls, base_url, count, auth_cache=None, prefix="load", password=PROVISION_PASSWORD):
+        """Register ``count`` fresh users through the sign-up form of a local instance.
+
+        Each account is signed in once before the pool is returned, so an
+        account the form did not really create fails here rather than in
+        the load run.
+        """
+        auth_cache = auth_cache or AuthCache(base_url)
+        stamp = int(time.time())
+        users = [{"email": f"{prefix}+{stamp}-{i}@example.com", "password": password} for i in range(count)]
+        for i, user in enumerate(users):
+            if not register(base_url, user, stamp % 10000 * 10000 + i):
+                raise PoolExhausted(f"Registration of {user['email']} was not accepted by {base_url}{SIGN_UP_PATH}")
+            try:
+                auth_cache.session(user)
+            except AuthenticationError as e:
+                raise PoolExhausted(f"Registered {user['email']} but could not sign in: {e}") from e
+        return cls(users, auth_cache)
+
+    def __len__(self):
+        return len(self.users)
+
+    def acquire(self, timeout=None):
+        """Lease a free user; raises ``PoolExhausted`` if none is released within ``timeout`` seconds"""
+        with self._available:
+            if not self._available.wait_for(lambda: self._free, timeout):
+                raise PoolExhausted(f"All {len(self.users)} pooled users are in use")
+            return self._free.pop(0)
+
+    def release(self, user):
+        with self._available:
+            self._free.append(user)
+            self._available.notify()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        user = self.acquire(timeout)
+        try:
+            yield user
+        finally:
+            self.release(user)
+
+    def take(self, count):
+        """Lease ``count`` distinct users at once; the caller releases each of them"""
+        with self._available:
+            if count > len(self._free):
+                raise PoolExhausted(f"{count} users requested but only {len(self._free)} of {len(self.users)} are free")
+            taken, self._free = self._free[:count], self._free[count:]
+            return taken
+
+    def session(self, user):
+        """The user's signed-in ``requests.Session``"""
+        return self.auth_cache.session(user)
+
+    def warm(self, workers=8):
+        """Sign every user in up front, ``workers`` at a time"""
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.auth_cache.session, self.users))
@@ -0,0 +1,231 @@
+"""
+Wait engine - Block only until the page reaches the expected state
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = float(os.environ.get("SELENIUM_WAIT_TIMEOUT", "10"))
+
+# How long presence assertions wait for an element on an already settled page
+PRESENCE_TIMEOUT = float(os.environ.get("SELENIUM_PRESENCE_TIMEOUT", "2"))
+POLL_FREQUENCY = 0.1
+
+# Errors raised while a page is being swapped out; the condition is polled again
+TRANSIENT_ERRORS = (JavascriptException, NoSuchElementException, StaleElementReferenceException)
+
+# Quiet time without network events before the page counts as settled
+NETWORK_QUIET_PERIOD = 0.5
+
+
+class WaitStats:
+    """Time spent waiting, per condition and per test"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, label, condition, seconds, timed_out):
+        self.records.append({
+            "label": label,
+            "condition": condition,
+            "seconds": seconds,
+            "timed_out": timed_out,
+        })
+
+    def total(self, label=None):
+        return sum(r["seconds"] for r in self.records if label is None or r["label"] == label)
+
+    def by_condition(self):
+        """Aggregate count, total, max and timeouts for each wait condition"""
+        summary = {}
+        for r in self.records:
+            entry = summary.setdefault(r["condition"], {"count": 0, "seconds": 0.0, "max": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["seconds"] += r["seconds"]
+            entry["max"] = max(entry["max"], r["seconds"])
+            entry["timeouts"] += int(r["timed_out"])
+        return summary
+
+    def by_label(self, condition=None):
+        """Total seconds waited by each test, optionally for a single condition"""
+        totals = {}
+        for r in self.records:
+            if condition is not None and r["condition"] != condition:
+                continue
+            totals[r["label"]] = totals.get(r["label"], 0.0) + r["seconds"]
+        return totals
+
+
+class Waits:
+    """Event-driven replacements for fixed ``time.sleep`` calls.
+
+    Every wait polls its condition and returns as soon as it holds, or
+    after ``timeout`` seconds. Navigation waits (``settle``, ``submit``,
+    ``url_change``) return False on timeout so the test can still inspect
+    the page; ``selector`` returns None. All time spent is recorded in
+    ``stats`` under ``label``. A submit invalidates ``page_state``, and
+    every page that finishes loading is passed to the ``on_page_loaded``
+    callbacks.
+
+    Element lookups follow a wait policy: presence assertions (``require``,
+    ``selector``) wait explicitly, while optional probes and absence checks
+    (``probe``, ``absent``) return immediately whatever implicit wait the
+    driver is configured with.
+    """
+
+    def __init__(self, driver, network=None, timeout=DEFAULT_TIMEOUT, stats=None, label=None,
+                 presence_timeout=PRESENCE_TIMEOUT, page_state=None):
+        self.driver = driver
+        self.network = network
+        self.page_state = page_state
+        self.on_page_loaded = []
+        self.timeout = timeout
+        self.presence_timeout = presence_timeout
+        self.stats = stats if stats is not None else WaitStats()
+        self.label = label
+
+    def document_ready(self, timeout=None):
+        """Wait for document.readyState to be complete"""
+        return self._until(
+            "document_ready",
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            timeout,
+        )
+
+    def load_complete(self, timeout=None):
+        """Wait for the load event to finish, so Navigation Timing has its final values"""
+        loaded = self._until(
+            "load_complete",
+            lambda d: d.execute_script(
+                "var nav = performance.getEntriesByType('navigation')[0];"
+                "return !nav || nav.loadEventEnd > 0"
+            ),
+            timeout,
+        )
+        if loaded:
+            self._page_loaded()
+        return loaded
+
+    def network_idle(self, timeout=None, quiet_period=NETWORK_QUIET_PERIOD, max_in_flight=0):
+        """Wait until no requests have been in flight for ``quiet_period`` seconds"""
+        if self.network is None:
+            return True
+        return self._until(
+            "network_idle",
+            lambda d: self.network.is_idle(quiet_period, max_in_flight),
+            timeout,
+        )
+
+    def settle(self, timeout=None):
+        """Wait for the current page to finish loading and go network-idle"""
+        settled = self.document_ready(timeout) and self.network_idle(timeout)
+        if settled:
+            self._page_loaded()
+        return settled
+
+    def url_change(self, old_url, timeout=None):
+        """Wait for the browser to leave ``old_url``"""
+        return self._until("url_change", EC.url_changes(old_url), timeout)
+
+    def page_replaced(self, old_root, timeout=None):
+        """Wait for a previously captured <html> element to be replaced by a new document"""
+        return self._until("page_replaced", EC.staleness_of(old_root), timeout)
+
+    def selector(self, by, value, timeout=None):
+        """Wait up to ``presence_timeout`` for an element to be present, returning it or None"""
+        if timeout is None:
+            timeout = self.presence_timeout
+        found = []
+
+        def present(d):
+            elements = d.find_elements(by, value)
+            if elements:
+                found.append(elements[0])
+                return True
+            return False
+
+        with self.implicit_wait_disabled():
+            self._until("selector", present, timeout)
+        return found[0] if found else None
+
+    def require(self, by, value, timeout=None):
+        """Wait for an element that must be present, raising NoSuchElementException if it never appears"""
+        element = self.selector(by, value, timeout)
+        if element is None:
+            raise NoSuchElementException(f"Element not found: {by}={value}")
+        return element
+
+    def probe(self, by, value):
+        """Return the matching elements right away, or an empty list"""
+        with self.implicit_wait_disabled():
+            return self.driver.find_elements(by, value)
+
+    def absent(self, by, value):
+        """Whether no element matches, checked without waiting"""
+        return not self.probe(by, value)
+
+    @contextmanager
+    def implicit_wait_disabled(self):
+        """Temporarily turn off the driver's implicit wait"""
+        previous = getattr(self.driver, "implicit_wait", None)
+        if previous is None:
+            previous = self.driver.timeouts.implicit_wait
+        if not previous:
+            yield
+            return
+
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(previous)
+
+    def record_implicit_wait(self, seconds):
+        """Record time a test spent blocked in implicit waits"""
+        if seconds > 0:
+            self.stats.record(self.label, "implicit_wait", seconds, False)
+
+    def submit(self, element, timeout=None):
+        """Click a submit control and wait for the resulting page to settle.
+
+        Returns False without waiting when the browser blocks submission
+        because the form fails HTML5 constraint validation.
+        """
+        valid = self.driver.execute_script(
+            "return arguments[0].form ? arguments[0].form.checkValidity() : true", element
+        )
+        old_root = self.driver.find_element(By.TAG_NAME, "html")
+        element.click()
+        if self.page_state is not None:
+            self.page_state.invalidate()
+        if not valid:
+            return False
+        return self.page_replaced(old_root, timeout) and self.settle(timeout)
+
+    def _page_loaded(self):
+        for callback in self.on_page_loaded:
+            callback()
+
+    def _until(self, condition, predicate, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        timed_out = False
+        try:
+            WebDriverWait(
+                self.driver, timeout,
+                poll_frequency=POLL_FREQUENCY, ignored_exceptions=TRANSIENT_ERRORS,
+            ).until(predicate)
+        except TimeoutException:
+            timed_out = True
+        self.stats.record(self.label, condition, time.monotonic() - start, timed_out)
+        return not timed_out
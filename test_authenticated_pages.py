@@ -2,36 +2,26 @@
 """
 Test authenticated pages in PlebisHub
 """
-import time
+import os
+import sys
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "selenium_tests"))
+from auth_session import AuthCache, AuthenticationError, is_sign_in_url
+from page_catalog import ADMIN_PAGES, AUTHENTICATED_PAGES
+from waits import Waits
+
 # Test credentials
 EMAIL = "test@example.com"
 PASSWORD = "testpassword123"
 BASE_URL = "http://localhost:3000"
+USER = {"email": EMAIL, "password": PASSWORD}
 
-# Pages to test
-AUTHENTICATED_PAGES = [
-    "/es",  # authenticated home
-    "/es/users/edit",  # profile
-    "/es/colabora",  # collaboration (authenticated)
-    "/es/microcreditos",  # microcredit (authenticated)
-    "/es/impulsa",  # impulsa (authenticated)
-    "/es/financiacion",  # funding
-    "/es/tools/militant_request",  # militant request
-]
-
-ADMIN_PAGES = [
-    "/admin",
-    "/admin/users",
-    "/admin/collaborations",
-    "/admin/microcredits",
-]
+# Signed-in session shared by every page check
+auth_cache = AuthCache(BASE_URL)
 
 def setup_driver():
     """Setup Chrome driver"""
@@ -45,24 +35,12 @@ def setup_driver():
 def login(driver):
     """Login to the application"""
     print(f"Logging in as {EMAIL}...")
-    driver.get(f"{BASE_URL}/es/users/sign_in")
-    time.sleep(2)
-
-    # Fill in login form
-    login_field = driver.find_element(By.ID, "user_login")
-    password_field = driver.find_element(By.ID, "user_password")
-
-    login_field.send_keys(EMAIL)
-    password_field.send_keys(PASSWORD)
 
-    # Submit form
-    submit_button = driver.find_element(By.CSS_SELECTOR, "input[type='submit']")
-    submit_button.click()
-    time.sleep(3)
-
-    # Check if login was successful
-    if "sign_in" in driver.current_url:
-        print("ERROR: Login failed!")
+    # Sign in once over HTTP and hand the session cookies to the browser
+    try:
+        auth_cache.login(driver, USER)
+    except AuthenticationError as e:
+        print(f"ERROR: Login failed! {e}")
         return False
 
     print("Login successful!")
@@ -74,27 +52,25 @@ def test_page(driver, path):
     print(f"\nTesting: {url}")
 
     try:
-        driver.get(url)
-        time.sleep(2)
+        auth_cache.get(driver, url, USER)
+        waits = Waits(driver)
+        waits.settle()
 
         # Check for errors
         page_source = driver.page_source
 
         if "Action Controller: Exception caught" in page_source:
             print(f"  ❌ ERROR: Exception on page")
+
             # Try to extract error message
-            try:
-                error_header = driver.find_element(By.TAG_NAME, "h1")
-                print(f"  Error: {error_header.text}")
-            except:
-                pass
+            error_header = waits.probe(By.TAG_NAME, "h1")
+            if error_header:
+                print(f"  Error: {error_header[0].text}")
 
             # Try to extract error details
-            try:
-                error_code = driver.find_element(By.TAG_NAME, "code")
-                print(f"  Details: {error_code.text[:200]}")
-            except:
-                pass
+            error_code = waits.probe(By.TAG_NAME, "code")
+            if error_code:
+                print(f"  Details: {error_code[0].text[:200]}")
 
             return False
 
@@ -103,7 +79,7 @@ def test_page(driver, path):
             return False
 
         # Check if redirected to login
-        if "/users/sign_in" in driver.current_url:
+        if is_sign_in_url(driver.current_url):
             print(f"  ⚠️  WARNING: Redirected to login (authentication required)")
             return True  # Not an error, just needs auth
 